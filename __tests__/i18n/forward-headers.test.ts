@@ -0,0 +1,32 @@
+/**
+ * @jest-environment node
+ */
+import { NextRequest, NextResponse } from 'next/server'
+import { forwardRequestHeaders } from '@/i18n/forward-headers'
+import { PATHNAME_HEADER } from '@/i18n/config'
+
+describe('forwardRequestHeaders', () => {
+  const request = new NextRequest('https://example.com/en/pricing', { headers: { cookie: 'a=1' } })
+
+  it('forwards the pathname header like NextResponse.next({ request })', () => {
+    const response = forwardRequestHeaders(NextResponse.next(), { [PATHNAME_HEADER]: '/en/pricing' }, request)
+
+    const overridden = response.headers.get('x-middleware-override-headers')?.split(',')
+    expect(overridden).toContain(PATHNAME_HEADER)
+    expect(overridden).toContain('cookie')
+    expect(response.headers.get(`x-middleware-request-${PATHNAME_HEADER}`)).toBe('/en/pricing')
+  })
+
+  it('keeps the headers a rewrite already forwards', () => {
+    const headers = new Headers(request.headers)
+    headers.set('x-next-intl-locale', 'en')
+    const rewrite = NextResponse.rewrite(new URL('https://example.com/en/pricing'), { request: { headers } })
+
+    const response = forwardRequestHeaders(rewrite, { [PATHNAME_HEADER]: '/en/pricing' }, request)
+
+    const overridden = response.headers.get('x-middleware-override-headers')?.split(',')
+    expect(overridden).toEqual(expect.arrayContaining(['x-next-intl-locale', PATHNAME_HEADER]))
+    expect(response.headers.get('x-middleware-request-x-next-intl-locale')).toBe('en')
+    expect(response.headers.get('x-middleware-rewrite')).toBe('https://example.com/en/pricing')
+  })
+})
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+TRANSLATION PIPELINE BENCHMARK
+Runs the per-locale flow (load en.json -> translate -> serialize -> write)
+against the real src/i18n/messages/en.json using the offline fake backend
+with realistic latency. Nothing touches the real locale files, translation
+memory, quota ledger or manifests: everything is written to a temporary
+directory, and the fake backend gets its own circuit breaker and rate limiter
+so earlier rounds in the process cannot throttle later ones.
+
+Reports strings/sec, backend calls, cache hit rate, peak RSS and per-phase
+time per locale as JSON so results can be compared across commits.
+
+Usage:
+  python3 scripts/i18n/benchmark-translation-pipeline.py [--locales=es,fr,de] [--scope=all|marketing]
+      [--latency=0.15] [--latency-per-char=0.0002] [--error-rate=0] [--concurrency=8]
+      [--rounds=2] [--output=bench.json] [--metrics-dir=DIR]
+
+Round 1 starts from an empty translation memory; later rounds reuse it, so
+they measure the cached re-run path.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from translation import (
+    EN_MESSAGES_PATH,
+    REPO_ROOT,
+    CircuitBreaker,
+    FakeBackend,
+    QuotaLedger,
+    TokenBucket,
+    TranslationEngine,
+    TranslationMemory,
+    collect_unique_strings,
+    metrics_from_args,
+    get_rate_limiter,
+    set_circuit_breaker,
+    set_memory,
+    set_quota,
+    set_rate_limiter,
+    source_hashes,
+    translate_unique,
+)
+from translation import backends
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Benchmark the Python translation pipeline offline')
+    parser.add_argument('--locales', default='es,fr,de', help='Comma-separated target codes (default: es,fr,de)')
+    parser.add_argument('--scope', choices=['all', 'marketing'], default='all', help='Translate the whole file or only marketing')
+    parser.add_argument('--latency', type=float, default=0.15, help='Fake backend seconds per request')
+    parser.add_argument('--latency-per-char', type=float, default=0.0002, help='Fake backend extra seconds per character')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fake backend injected failure probability')
+    parser.add_argument('--concurrency', type=int, default=8, help='In-flight requests')
+    parser.add_argument('--rounds', type=int, default=2, help='Rounds over all locales (round 2+ hits the warm memory)')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    parser.add_argument('--metrics-dir', help='Also write events.jsonl and a Prometheus textfile here')
+    return parser.parse_args(argv)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_locale(target, scope, backend, engine, memory, out_dir):
+    """Run the full per-locale flow once and return its metrics"""
+    phases = {}
+    calls_before = backend.requests
+    chars_before = backend.characters
+    hits_before = memory.hits
+    misses_before = memory.misses
+    start = time.perf_counter()
+
+    t = time.perf_counter()
+    with open(EN_MESSAGES_PATH, 'r', encoding='utf-8') as f:
+        en_data = json.load(f)
+    source = en_data.get('marketing', {}) if scope == 'marketing' else en_data
+    phases['load'] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    total_keys = len(source_hashes(source))
+    unique_strings = collect_unique_strings(source)
+    phases['flatten'] = time.perf_counter() - t
+
+    failed = set()
+    t = time.perf_counter()
+    translated = translate_unique(
+        source,
+        lambda text: backends.translate_text(text, target, backend),
+        unique_strings=unique_strings,
+        engine=engine,
+        batch_fn=lambda texts: backends.translate_batch(texts, target, backend),
+        failed=failed,
+    )
+    phases['translate'] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    payload = json.dumps(translated, ensure_ascii=False, indent=2) + '\n'
+    phases['serialize'] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    (out_dir / f'{target}.json').write_text(payload, encoding='utf-8')
+    phases['write'] = time.perf_counter() - t
+
+    elapsed = time.perf_counter() - start
+    hits = memory.hits - hits_before
+    lookups = hits + memory.misses - misses_before
+    return {
+        'locale': target,
+        'keys': total_keys,
+        'unique_strings': len(unique_strings),
+        'failed_strings': len(failed),
+        'calls': backend.requests - calls_before,
+        'characters_sent': backend.characters - chars_before,
+        'cache_hits': hits,
+        'cache_hit_rate': round(hits / lookups, 4) if lookups else None,
+        'strings_per_sec': round(total_keys / elapsed, 1) if elapsed else None,
+        'seconds': round(elapsed, 4),
+        'phases': {name: round(value, 4) for name, value in phases.items()},
+        'output_bytes': len(payload.encode('utf-8')),
+    }
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    locales = [code.strip() for code in args.locales.split(',') if code.strip()]
+    metrics_from_args([f'--metrics-dir={args.metrics_dir}'] if args.metrics_dir else [])
+
+    with tempfile.TemporaryDirectory(prefix='translation-bench-') as tmp:
+        tmp_dir = Path(tmp)
+        memory = TranslationMemory(tmp_dir / 'memory.sqlite3')
+        # Route the shared memory used by backends.translate_text to the scratch store
+        set_memory(memory)
+        # ...and the quota charges to a scratch ledger instead of .translation-cache/quota.json
+        ledger = set_quota(QuotaLedger(tmp_dir / 'quota.json'))
+        backend = FakeBackend(latency=args.latency, latency_per_char=args.latency_per_char, error_rate=args.error_rate)
+        set_circuit_breaker(backend.name, CircuitBreaker(name=backend.name))
+        set_rate_limiter(backend.name, TokenBucket(get_rate_limiter(backend.name).rate, name=backend.name))
+
+        rounds = []
+        with TranslationEngine(args.concurrency) as engine:
+            for round_number in range(1, args.rounds + 1):
+                round_start = time.perf_counter()
+                results = [
+                    benchmark_locale(target, args.scope, backend, engine, memory, tmp_dir) for target in locales
+                ]
+                rounds.append({
+                    'round': round_number,
+                    'seconds': round(time.perf_counter() - round_start, 4),
+                    'locales': results,
+                })
+                print(f"   Round {round_number}: {rounds[-1]['seconds']:.2f}s, "
+                      f"{sum(r['calls'] for r in results)} calls", file=sys.stderr)
+        memory.close()
+        ledger.save()
+
+    report = {
+        'benchmark': 'translation-pipeline',
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'config': {
+            'scope': args.scope,
+            'locales': locales,
+            'latency': args.latency,
+            'latency_per_char': args.latency_per_char,
+            'error_rate': args.error_rate,
+            'concurrency': args.concurrency,
+            'rounds': args.rounds,
+        },
+        'rounds': rounds,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+    output = json.dumps(report, indent=2) + '\n'
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+        print(f'📊 Benchmark report written to {args.output}', file=sys.stderr)
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == '__main__':
+    main()
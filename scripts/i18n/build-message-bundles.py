@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+MESSAGE BUNDLE BUILDER
+Writes every src/i18n/messages/<locale>.json (en included) as a minified,
+content-hashed bundle with .gz and .br variants under
+src/i18n/messages/bundles/, plus manifest.json mapping locale -> bundle.
+Run it after translating and before `next build` with
+I18N_MESSAGES_MODE=bundled. Locales whose messages did not change keep their
+bundle name, so only edited locales are invalidated in caches.
+
+Usage:
+  python3 scripts/i18n/build-message-bundles.py [--locales=en,es]
+"""
+
+import argparse
+import sys
+
+from translation import BUNDLES_DIR, MESSAGES_DIR, build_bundles
+from translation import bundles
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Build minified, content-hashed, precompressed locale bundles')
+    parser.add_argument('--locales', help='Comma-separated locales (default: every <locale>.json)')
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    if args.locales:
+        locales = [code.strip() for code in args.locales.split(',') if code.strip()]
+    else:
+        locales = sorted(path.stem for path in MESSAGES_DIR.glob('*.json'))
+
+    print(f'📦 Bundling {len(locales)} locales into {BUNDLES_DIR}\n')
+    if bundles.brotli is None:
+        print('   ℹ️  brotli is not installed (pip install brotli): writing gzip variants only\n')
+    try:
+        results = build_bundles(locales)
+    except (OSError, ValueError) as e:
+        print(f'❌ Error: {e}')
+        sys.exit(1)
+
+    source_bytes = 0
+    for locale, entry in results.items():
+        source_bytes += (MESSAGES_DIR / f'{locale}.json').stat().st_size
+        sizes = f"{entry['bytes'] / 1024:.0f} KB, gzip {entry['gzip'] / 1024:.0f} KB"
+        if 'brotli' in entry:
+            sizes += f", brotli {entry['brotli'] / 1024:.0f} KB"
+        print(f"   {'✅' if entry['written'] else '➖'} {locale}: {entry['file']} ({sizes})"
+              + ('' if entry['written'] else ', unchanged'))
+
+    total = sum(entry['bytes'] for entry in results.values())
+    gzipped = sum(entry['gzip'] for entry in results.values())
+    changed = sum(1 for entry in results.values() if entry['written'])
+    print(f"\n📉 {source_bytes / 1024:,.0f} KB of locale files -> {total / 1024:,.0f} KB minified, "
+          f"{gzipped / 1024:,.0f} KB gzipped; {changed} of {len(results)} bundles changed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+MESSAGE SHARD BUILDER
+Splits every src/i18n/messages/<locale>.json (en included) into
+per-namespace shard files plus a manifest under src/i18n/messages/shards/<locale>/.
+The translate scripts keep shards up to date for the locales they write; run
+this after editing locale files by hand and before `next build` with
+I18N_MESSAGES_MODE=sharded.
+
+Usage:
+  python3 scripts/i18n/build-message-shards.py [--locales=en,es]
+"""
+
+import argparse
+import sys
+
+from translation import MESSAGES_DIR, SHARDS_DIR, shard_locale_file
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Split locale files into per-namespace shards')
+    parser.add_argument('--locales', help='Comma-separated locales (default: every <locale>.json)')
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    if args.locales:
+        locales = [code.strip() for code in args.locales.split(',') if code.strip()]
+    else:
+        locales = sorted(path.stem for path in MESSAGES_DIR.glob('*.json'))
+
+    print(f'🧩 Sharding {len(locales)} locales into {SHARDS_DIR}\n')
+    for locale in locales:
+        try:
+            stats = shard_locale_file(locale)
+        except (OSError, ValueError) as e:
+            print(f'   ❌ {locale}: {e}')
+            continue
+        print(f"   ✅ {locale}: {stats['namespaces']} namespaces, {stats['written']} written, {stats['removed']} removed")
+
+
+if __name__ == '__main__':
+    main()
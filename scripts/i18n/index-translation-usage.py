@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+TRANSLATION USAGE INDEX
+Ranks en.json namespaces and keys by how often src/ references them through
+useTranslations()/getTranslations() and t('key') calls, and shows the
+priority tiers the translate scripts work through for a new locale.
+With --routes it also writes src/i18n/route-namespaces.json: the namespaces
+each route's pages, layouts and their imports bind, which the sharded message
+loader (src/i18n/shards.ts) loads for that route. Re-run it after adding
+translations to a page.
+
+Usage:
+  python3 scripts/i18n/index-translation-usage.py [--top=20] [--output=usage.json] [--routes[=PATH]]
+"""
+
+import argparse
+import json
+import sys
+
+from translation import EN_MESSAGES_PATH, UsageIndex, collect_unique_strings, flatten_messages, prioritize_strings
+from translation.usage import ROUTE_NAMESPACES_PATH, SRC_DIR, TIER_NAMES, route_namespaces
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Rank translation namespaces and keys by usage in src/')
+    parser.add_argument('--top', type=int, default=20, help='Rows to print per ranking (default: 20)')
+    parser.add_argument('--output', help='Also write the full counts as JSON to this file')
+    parser.add_argument('--routes', nargs='?', const=str(ROUTE_NAMESPACES_PATH),
+                        help=f'Write the namespaces each route needs (default: {ROUTE_NAMESPACES_PATH})')
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    index = UsageIndex().scan(SRC_DIR)
+    with open(EN_MESSAGES_PATH, 'r', encoding='utf-8') as f:
+        en_data = json.load(f)
+
+    print(f'🔎 Scanned {index.files} files using translations in {SRC_DIR}\n')
+    print('📦 Namespaces by bindings:')
+    for namespace, count in index.top_namespaces(args.top):
+        print(f'   {count:>5}  {namespace}')
+    print('\n🔑 Keys by t() calls:')
+    for key, count in index.top_keys(args.top):
+        print(f'   {count:>5}  {key}')
+
+    unique_strings = collect_unique_strings(en_data)
+    tiers = prioritize_strings(en_data, unique_strings, index)
+    print(f'\n🪜 Translation order for {len(unique_strings)} unique strings:')
+    # prioritize_strings drops empty tiers, so label each by the best tier of its first string
+    best = {}
+    for _, key, text in flatten_messages(en_data).strings():
+        best[text] = min(best.get(text, len(TIER_NAMES) - 1), index.tier(key))
+    for tier in tiers:
+        print(f'   {TIER_NAMES[best[tier[0]]]:<11} {len(tier):>5} strings, e.g. {tier[0]!r}')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'files': index.files, 'namespaces': dict(index.top_namespaces()), 'keys': dict(index.top_keys())},
+                      f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f'\n📝 Wrote {args.output}')
+
+    if args.routes:
+        routes = route_namespaces()
+        with open(args.routes, 'w', encoding='utf-8') as f:
+            json.dump({'generatedBy': 'scripts/i18n/index-translation-usage.py --routes', 'routes': routes},
+                      f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        sharded = sum(namespaces is not None for namespaces in routes.values())
+        print(f'\n🧩 Routes: {sharded} of {len(routes)} load only their namespaces, the rest the full file')
+        print(f'📝 Wrote {args.routes}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+TRANSLATION PACKAGE TESTS
+Puts scripts/i18n on sys.path so the tests import the package the way the
+scripts do (from translation import ...), and keeps the translation memory
+and quota files of the real runs out of the way
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault('TRANSLATION_MEMORY', 'off')
+
+
+class FakeClock:
+    """
+    Stands in for a module's `time`: sleep() advances monotonic() and time()
+    instantly. Keep waits binary fractions (0.5, 0.25) so the clock adds up exactly
+    """
+
+    def __init__(self, start=1024.0):
+        self.now = start
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += max(seconds, 0)
+
+    def __getattr__(self, name):
+        # strftime, localtime, ... come from the real module
+        return getattr(time, name)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -0,0 +1,86 @@
+from translation import retry
+from translation.batching import join_batch, make_batches, split_batch, translate_batch_with_fallback
+from translation.masking import Masker
+
+
+class DictMemory:
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+
+    def get(self, text, target, backend):
+        return self.entries.get((text, target, backend))
+
+    def put(self, text, target, backend, translation):
+        self.entries[(text, target, backend)] = translation
+
+
+def upper_payload(payloads):
+    def translate(payload):
+        payloads.append(payload)
+        return payload.upper()
+
+    return translate
+
+
+def test_short_strings_share_units_and_long_ones_go_alone():
+    long_text = 'word ' * 50
+    units = make_batches(['Save', 'Line one\nline two', 'Cancel', long_text, ' padded', 'Delete'], max_strings=2)
+    assert units == [['Line one\nline two'], [long_text], [' padded'], ['Save', 'Cancel'], ['Delete']]
+
+
+def test_split_rejects_payloads_that_do_not_line_up():
+    payload = join_batch(['Save', 'Cancel'])
+    assert split_batch(payload.upper(), 2) == ['SAVE', 'CANCEL']
+    assert split_batch('SAVE CANCEL', 2) is None
+    assert split_batch('SAVE\n\nCANCEL', 3) is None
+    assert split_batch(None, 2) is None
+
+
+def test_memory_hits_are_left_out_of_the_payload():
+    payloads = []
+    memory = DictMemory({('Save', 'es', 'test-batch'): 'Guardar'})
+    results = translate_batch_with_fallback(
+        ['Save', 'Cancel', 'Delete'], 'es', 'test-batch', upper_payload(payloads), str.lower, memory
+    )
+    assert results == ['Guardar', 'CANCEL', 'DELETE']
+    assert payloads == ['Cancel\nDelete']
+    assert memory.get('Delete', 'es', 'test-batch') == 'DELETE'
+
+
+def test_misaligned_batch_falls_back_to_single_strings():
+    singles = []
+
+    def single(text):
+        singles.append(text)
+        return text.lower()
+
+    results = translate_batch_with_fallback(
+        ['Save', 'Cancel'], 'es', 'test-batch', lambda payload: 'merged', single, DictMemory()
+    )
+    assert results == ['save', 'cancel']
+    assert singles == ['Save', 'Cancel']
+
+
+def test_masked_parts_are_restored_and_bad_parts_retried_alone():
+    masker = Masker()
+    texts = ['Hi {name}', 'Bye {name}']
+    masks = {text: masker.mask(text) for text in texts}
+
+    def drop_second_placeholder(payload):
+        first, second = payload.split('\n')
+        return f'{first.upper()}\n{second.upper().split("⟦")[0]}'
+
+    results = translate_batch_with_fallback(
+        texts, 'es', 'test-batch', drop_second_placeholder, lambda text: 'Adiós {name}', DictMemory(), masks
+    )
+    assert results == ['HI {name}', 'Adiós {name}']
+
+
+def test_failed_payload_leaves_every_string_untranslated(monkeypatch, clock):
+    monkeypatch.setattr(retry, 'time', clock)
+
+    def broken(payload):
+        raise ConnectionError('reset')
+
+    results = translate_batch_with_fallback(['Save', 'Cancel'], 'es', 'test-batch-failed', broken, str.lower, DictMemory())
+    assert results == [None, None]
@@ -0,0 +1,49 @@
+import gzip
+import json
+
+from translation import bundles
+from translation.bundles import build_bundles, load_bundle_manifest, minify_messages, write_bundle
+
+ES = {'nav': {'home': 'Inicio', 'items': ['Uno', 'Dos']}}
+
+
+def write_locale(messages_dir, locale, tree):
+    messages_dir.mkdir(exist_ok=True)
+    (messages_dir / f'{locale}.json').write_text(json.dumps(tree, indent=2), encoding='utf-8')
+
+
+def test_minified_bundle_is_named_by_its_content(tmp_path):
+    assert minify_messages(ES) == '{"nav":{"home":"Inicio","items":["Uno","Dos"]}}'
+    entry = write_bundle('es', ES, tmp_path)
+    assert entry['file'] == f"es.{entry['hash']}.json"
+    assert entry['written']
+    data = (tmp_path / entry['file']).read_bytes()
+    assert gzip.decompress((tmp_path / f"{entry['file']}.gz").read_bytes()) == data
+    assert not write_bundle('es', ES, tmp_path)['written']
+
+
+def test_brotli_is_optional(tmp_path, monkeypatch):
+    monkeypatch.setattr(bundles, 'brotli', None)
+    entry = write_bundle('es', ES, tmp_path)
+    assert 'brotli' not in entry
+    assert sorted(path.name for path in tmp_path.iterdir()) == [entry['file'], f"{entry['file']}.gz"]
+
+
+def test_rebuild_replaces_only_changed_locales(tmp_path):
+    messages = tmp_path / 'messages'
+    out = tmp_path / 'bundles'
+    write_locale(messages, 'es', ES)
+    write_locale(messages, 'fr', {'nav': {'home': 'Accueil'}})
+    first = build_bundles(['es', 'fr'], messages, out)
+
+    write_locale(messages, 'es', {'nav': {'home': 'Portada'}})
+    second = build_bundles(['es'], messages, out)
+    manifest = load_bundle_manifest(out)['bundles']
+    assert manifest['es']['file'] == second['es']['file'] != first['es']['file']
+    assert manifest['fr']['file'] == first['fr']['file']
+    assert not list(out.glob(f"{first['es']['file']}*"))
+    assert (out / first['fr']['file']).exists()
+
+
+def test_missing_manifest_is_empty(tmp_path):
+    assert load_bundle_manifest(tmp_path) == {'bundles': {}}
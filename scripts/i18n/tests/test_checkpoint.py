@@ -0,0 +1,67 @@
+from translation import checkpoint
+from translation.checkpoint import CheckpointJournal
+from translation.dedup import translate_strings
+
+
+def lines(journal):
+    return journal.path.read_text(encoding='utf-8').splitlines()
+
+
+def test_records_are_buffered_until_every_n(tmp_path):
+    journal = CheckpointJournal('es', 'common', tmp_path, every=2, interval=60)
+    assert journal.path.name == 'es.common.jsonl'
+    journal.record('Save', 'Guardar')
+    assert lines(journal) == []
+    journal.record('Cancel', 'Cancelar')
+    assert len(lines(journal)) == 2
+    journal.discard()
+
+
+def test_records_are_flushed_after_the_interval(tmp_path, monkeypatch, clock):
+    monkeypatch.setattr(checkpoint, 'time', clock)
+    journal = CheckpointJournal('es', '', tmp_path, every=50, interval=8)
+    journal.record('Save', 'Guardar')
+    clock.sleep(8)
+    journal.record('Cancel', 'Cancelar')
+    assert len(lines(journal)) == 2
+    journal.discard()
+
+
+def test_resume_skips_a_half_written_line(tmp_path):
+    journal = CheckpointJournal('es', '', tmp_path)
+    journal.record('Save', 'Guardar')
+    journal.record('Cancel', 'Cancelar')
+    journal.flush()
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"s": "Delete", "t": "Elim')
+
+    resumed = CheckpointJournal('es', '', tmp_path, resume=True)
+    assert resumed.completed == {'Save': 'Guardar', 'Cancel': 'Cancelar'}
+    resumed.discard()
+    assert not resumed.path.exists()
+
+
+def test_a_fresh_run_starts_an_empty_journal(tmp_path):
+    journal = CheckpointJournal('es', '', tmp_path)
+    journal.record('Save', 'Guardar')
+    journal.flush()
+    assert CheckpointJournal('es', '', tmp_path).completed == {}
+    assert lines(journal) == []
+
+
+def test_resumed_strings_are_not_sent_again(tmp_path):
+    journal = CheckpointJournal('es', '', tmp_path)
+    journal.record('Save', 'Guardar')
+    journal.flush()
+    sent = []
+
+    def translate(text):
+        sent.append(text)
+        return text.upper()
+
+    resumed = CheckpointJournal('es', '', tmp_path, resume=True)
+    translations = translate_strings(['Save', 'Cancel'], translate, journal=resumed)
+    assert translations == {'Save': 'Guardar', 'Cancel': 'CANCEL'}
+    assert sent == ['Cancel']
+    assert resumed.completed['Cancel'] == 'CANCEL'
+    resumed.discard()
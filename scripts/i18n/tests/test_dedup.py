@@ -0,0 +1,84 @@
+from translation.dedup import apply_translations, collect_unique_strings, translate_strings, translate_unique
+from translation.engine import TranslationEngine
+from translation.retry import TranslationFailed
+
+EN = {
+    'status': {'active': 'Active', 'pending': 'Pending'},
+    'filters': {'active': 'Active', 'options': ['Active', 'Pending', 'Archived']},
+    'count': 3,
+}
+
+
+def spanish(text):
+    return {'Active': 'Activo', 'Pending': 'Pendiente', 'Archived': 'Archivado'}[text]
+
+
+def counting(translate_fn, failing=()):
+    calls = []
+
+    def translate(text):
+        calls.append(text)
+        if text in failing:
+            raise TranslationFailed(text)
+        return translate_fn(text)
+
+    return translate, calls
+
+
+def test_unique_strings_in_first_seen_order():
+    assert collect_unique_strings(EN) == ['Active', 'Pending', 'Archived']
+
+
+def test_each_string_is_sent_once_and_fanned_out_to_every_key():
+    translate, calls = counting(spanish)
+    translated = translate_unique(EN, translate)
+    assert sorted(calls) == ['Active', 'Archived', 'Pending']
+    assert translated == {
+        'status': {'active': 'Activo', 'pending': 'Pendiente'},
+        'filters': {'active': 'Activo', 'options': ['Activo', 'Pendiente', 'Archivado']},
+        'count': 3,
+    }
+
+
+def test_batched_strings_are_fanned_out_too():
+    batches = []
+
+    def batch(texts):
+        batches.append(list(texts))
+        return [spanish(text) for text in texts]
+
+    translations = translate_strings(collect_unique_strings(EN), spanish, batch_fn=batch)
+    assert batches == [['Active', 'Pending', 'Archived']]
+    assert apply_translations(EN, translations)['filters']['options'] == ['Activo', 'Pendiente', 'Archivado']
+
+
+def test_failed_string_leaves_all_of_its_keys_untranslated():
+    translate, calls = counting(spanish, failing={'Active'})
+    failed = set()
+    translated = translate_unique(EN, translate, failed=failed)
+    assert calls.count('Active') == 1
+    assert failed == {'Active'}
+    assert translated == {
+        'status': {'pending': 'Pendiente'},
+        # List items keep their positions; the failed one is a hole, not English
+        'filters': {'options': [None, 'Pendiente', 'Archivado']},
+        'count': 3,
+    }
+
+
+def test_failed_string_keeps_existing_values_at_every_key():
+    existing = {'status': {'active': 'Activa'}, 'filters': {'active': 'Activos', 'options': ['Activas']}}
+    failed = set()
+
+    def batch(texts):
+        return [None if text == 'Active' else spanish(text) for text in texts]
+
+    with TranslationEngine(2) as engine:
+        translations = translate_strings(
+            collect_unique_strings(EN), spanish, engine=engine, batch_fn=batch, failed=failed
+        )
+    assert failed == {'Active'}
+    assert 'Active' not in translations
+    translated = apply_translations(EN, translations, existing=existing)
+    assert translated['status'] == {'active': 'Activa', 'pending': 'Pendiente'}
+    assert translated['filters'] == {'active': 'Activos', 'options': ['Activas', 'Pendiente', 'Archivado']}
@@ -0,0 +1,56 @@
+from translation import engine
+from translation.engine import TokenBucket, TranslationEngine, concurrency_from_args
+
+
+def test_bucket_starts_full_then_waits_for_refill(monkeypatch, clock):
+    monkeypatch.setattr(engine, 'time', clock)
+    bucket = TokenBucket(rate=2, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    assert clock.sleeps == [0.5]
+
+
+def test_bucket_refill_is_capped_at_capacity(monkeypatch, clock):
+    monkeypatch.setattr(engine, 'time', clock)
+    bucket = TokenBucket(rate=4, capacity=3)
+    clock.now += 60
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == []
+    bucket.acquire()
+    assert clock.sleeps == [0.25]
+
+
+def test_default_capacity_is_one_second_of_rate():
+    assert TokenBucket(rate=5).capacity == 5
+    assert TokenBucket(rate=0.2).capacity == 1
+
+
+def test_units_are_fanned_out_and_reported():
+    results = []
+    progress = []
+    with TranslationEngine(4) as pool:
+        translations = pool.translate_units(
+            [['a', 'b'], ['c']],
+            lambda texts: [text.upper() for text in texts],
+            progress_callback=lambda: progress.append(1),
+            on_result=lambda text, translated: results.append((text, translated)),
+        )
+    assert translations == {'a': 'A', 'b': 'B', 'c': 'C'}
+    assert sorted(results) == [('a', 'A'), ('b', 'B'), ('c', 'C')]
+    assert len(progress) == 3
+
+
+def test_locales_come_back_in_input_order():
+    with TranslationEngine(3) as pool:
+        assert pool.map_locales(str.upper, ['es', 'fr', 'de']) == ['ES', 'FR', 'DE']
+
+
+def test_concurrency_flag_wins_over_environment(monkeypatch):
+    monkeypatch.setenv('TRANSLATION_CONCURRENCY', '3')
+    assert concurrency_from_args(['--concurrency=12']) == 12
+    assert concurrency_from_args([]) == 3
+    assert concurrency_from_args(['--concurrency=0']) == 1
@@ -0,0 +1,45 @@
+from translation.incremental import hash_source, is_translated, merge_changes, plan_changes, source_hashes
+
+EN = {'common': {'save': 'Save', 'cancel': 'Cancel'}, 'nav': {'home': 'Home', 'items': ['One', 'Two']}}
+ES = {'common': {'save': 'Guardar', 'cancel': 'Cancelar'}, 'nav': {'home': 'Inicio', 'items': ['Uno', 'Dos']}}
+
+
+def test_nothing_planned_when_hashes_match():
+    assert plan_changes(EN, ES, source_hashes(EN)) == {}
+
+
+def test_changed_added_and_missing_keys_are_planned():
+    hashes = source_hashes(EN)
+    hashes['common.save'] = hash_source('Store')
+    del hashes['nav.home']
+    locale = {'common': dict(ES['common']), 'nav': {'items': ['Uno', 'Dos']}}
+    assert plan_changes(EN, locale, hashes) == {'common.save': 'Save', 'nav.home': 'Home'}
+
+
+def test_without_a_record_only_untranslated_keys_are_planned():
+    locale = {'common': {'save': 'Guardar'}, 'nav': ES['nav']}
+    assert plan_changes(EN, locale, None) == {'common.cancel': 'Cancel'}
+
+
+def test_without_a_record_english_copies_are_planned():
+    locale = {'common': {'save': 'Guardar', 'cancel': 'Cancel'}, 'nav': {'home': 'Home', 'items': ['Uno', 'Dos']}}
+    assert plan_changes(EN, locale, None) == {'common.cancel': 'Cancel', 'nav.home': 'Home'}
+
+
+def test_placeholder_only_strings_count_as_translated():
+    assert is_translated('{count}', '{count}')
+    assert is_translated('Guardar', 'Save')
+    assert not is_translated('Save', 'Save')
+    assert not is_translated(None, 'Save')
+
+
+def test_prefix_scopes_the_paths():
+    hashes = {'common.save': hash_source('Save')}
+    assert plan_changes(EN['common'], ES['common'], hashes, 'common') == {'common.cancel': 'Cancel'}
+
+
+def test_merge_changes_keeps_unplanned_values():
+    locale = {'common': {'save': 'Guardar (revisado)', 'cancel': 'Cancelar'}, 'nav': ES['nav']}
+    merged = merge_changes(EN, locale, {'common.cancel'}, {'Save': 'X', 'Cancel': 'Anular'})
+    assert merged['common'] == {'save': 'Guardar (revisado)', 'cancel': 'Anular'}
+    assert merged['nav'] == ES['nav']
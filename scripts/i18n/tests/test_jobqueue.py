@@ -0,0 +1,63 @@
+import pytest
+
+from translation.jobqueue import Heartbeat, JobQueue
+
+
+@pytest.fixture(params=[False, True], ids=['wal', 'shared'])
+def queue(request, tmp_path):
+    queue = JobQueue(tmp_path / 'queue.sqlite', shared=request.param)
+    yield queue
+    queue.close()
+
+
+@pytest.fixture
+def run(queue):
+    jobs = {'es': ('es', ['One', 'Two', 'Three']), 'de': ('de', ['One'])}
+    return queue.submit('app', {'a': 'One'}, jobs, options={'incremental': True}, chunk=2)
+
+
+def test_submit_splits_locales_into_chunks(queue, run):
+    assert queue.locales(run) == ['es', 'de']
+    assert queue.strings(run, 'es') == ['One', 'Two', 'Three']
+    assert queue.run_info(run) == ('app', {'incremental': True}, {'a': 'One'})
+    assert queue.status(run)['es'] == {'pending': 2, 'leased': 0, 'done': 0, 'failed_strings': 0, 'strings': 3}
+
+
+def test_claims_lease_each_task_once(queue, run):
+    tasks = [queue.claim(run, 'w1'), queue.claim(run, 'w2'), queue.claim(run, 'w1')]
+    assert [(task.locale, task.strings) for task in tasks] == [('es', ['One', 'Two']), ('es', ['Three']), ('de', ['One'])]
+    assert queue.claim(run, 'w2') is None
+    assert not queue.is_drained(run)
+
+
+def test_expired_lease_is_reclaimed_and_stale_owner_rejected(queue, run):
+    abandoned = queue.claim(run, 'w1', lease=-1)
+    reclaimed = queue.claim(run, 'w2')
+    assert reclaimed.id == abandoned.id
+    assert reclaimed.attempts == 2
+
+    assert not queue.heartbeat(abandoned, 'w1')
+    assert not queue.complete(abandoned, 'w1', {'One': 'Uno'})
+    assert queue.complete(reclaimed, 'w2', {'One': 'Uno', 'Two': 'Dos'})
+    assert queue.results(run, 'es') == {'One': 'Uno', 'Two': 'Dos'}
+
+
+def test_failed_strings_can_be_retried(queue, run):
+    while (task := queue.claim(run, 'w1')) is not None:
+        queue.complete(task, 'w1', {text: text.upper() for text in task.strings if text != 'Three'})
+    assert queue.is_drained(run)
+    assert queue.status(run)['es']['failed_strings'] == 1
+
+    assert queue.retry_failed(run) == 1
+    task = queue.claim(run, 'w1')
+    assert task.strings == ['Three']
+    assert queue.complete(task, 'w1', {'Three': 'Tres'})
+    assert queue.results(run, 'es') == {'One': 'ONE', 'Three': 'Tres', 'Two': 'TWO'}
+
+
+def test_release_and_heartbeat(queue, run):
+    task = queue.claim(run, 'w1')
+    with Heartbeat(queue, task, 'w1'):
+        assert queue.heartbeat(task, 'w1')
+    queue.release(task, 'w1')
+    assert queue.claim(run, 'w2').id == task.id
@@ -0,0 +1,56 @@
+import json
+
+from translation.keyspace import MISSING, KeySpace, count_strings, flatten_messages, format_path
+
+EN = {
+    'profile': {'title': 'Profile', 'skills': ['Rigging', 'Lighting'], 'tags': [], 'meta': {}},
+    'count': 2,
+    'enabled': True,
+    'nav': {'home': 'Home'},
+}
+
+
+def test_paths_include_list_indices():
+    assert format_path(('profile', 'skills', 1)) == 'profile.skills[1]'
+    assert list(KeySpace.from_tree(EN)) == [
+        'profile.title', 'profile.skills[0]', 'profile.skills[1]', 'profile.tags', 'profile.meta',
+        'count', 'enabled', 'nav.home',
+    ]
+
+
+def test_round_trip_is_lossless():
+    assert flatten_messages(EN).to_tree() == EN
+    assert count_strings(EN) == 4
+
+
+def test_locales_share_one_keyspace_and_extra_keys_are_appended():
+    keyspace = KeySpace.from_tree(EN)
+    es = keyspace.flatten({'nav': {'home': 'Inicio', 'extra': 'Sobra'}, 'profile': {'title': 'Perfil'}})
+    assert es.get('nav.home') == 'Inicio'
+    assert es.value_at(keyspace.slot('count')) is MISSING
+    assert keyspace.keys[-1] == 'nav.extra'
+    assert 'profile.skills[0]' not in es
+    assert es.to_tree() == {'profile': {'title': 'Perfil'}, 'nav': {'home': 'Inicio', 'extra': 'Sobra'}}
+
+
+def test_unknown_keys_are_dropped_without_extend():
+    keyspace = KeySpace.from_tree(EN)
+    fr = keyspace.flatten({'nav': {'home': 'Accueil', 'extra': 'En trop'}}, extend=False)
+    assert 'nav.extra' not in keyspace
+    assert list(fr.strings()) == [(keyspace.slot('nav.home'), 'nav.home', 'Accueil')]
+
+
+def test_repeated_strings_are_interned(tmp_path):
+    path = tmp_path / 'de.json'
+    path.write_text(json.dumps({'nav': {'home': 'Start'}, 'profile': {'title': 'Start'}}), encoding='utf-8')
+    keyspace = KeySpace.from_tree(EN)
+    de = keyspace.load(path)
+    assert de.get('nav.home') is de.get('profile.title')
+    assert de.unique_strings() == ['Start']
+
+
+def test_rebuilt_trees_do_not_share_empty_containers():
+    messages = flatten_messages(EN)
+    first, second = messages.to_tree(), messages.to_tree()
+    first['profile']['tags'].append('x')
+    assert second['profile']['tags'] == []
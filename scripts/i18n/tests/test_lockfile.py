@@ -0,0 +1,119 @@
+import importlib.util
+import json
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from translation.incremental import SourceManifest, hash_source, source_hashes
+from translation.lockfile import TranslationLock, in_scopes, record_locale_hashes
+from translation.sources import SourceTree
+
+EN = {'common': {'save': 'Save', 'cancel': 'Cancel'}, 'nav': {'home': 'Home', 'count': '{count}'}}
+
+
+def load_script():
+    path = Path(__file__).resolve().parent.parent / 'translation-lock.py'
+    spec = importlib.util.spec_from_file_location('translation_lock', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(autouse=True)
+def update_lock(tmp_path, monkeypatch):
+    monkeypatch.setattr('translation.lockfile.UPDATE_LOCK_PATH', tmp_path / 'lockfile.flock')
+
+
+def test_round_trip_with_baseline_and_absent_keys(tmp_path):
+    path = tmp_path / 'translations.lock'
+    lock = TranslationLock(path)
+    lock.set_locales({
+        'es': {'a': '1', 'b': '2', 'c': '3'},
+        'fr': {'a': '1', 'b': '2', 'c': '3'},
+        'de': {'a': '1', 'b': 'old'},
+    })
+    lock.save()
+
+    loaded = TranslationLock(path)
+    assert loaded.baseline == {'a': '1', 'b': '2', 'c': '3'}
+    assert loaded.locale_hashes('de') == {'a': '1', 'b': 'old'}
+    assert loaded.recorded('de', 'c') is None
+    assert loaded.recorded('fr', 'c') == '3'
+    assert loaded.locale_hashes('it') == {}
+
+
+def test_check_reports_stale_and_missing(tmp_path):
+    lock = TranslationLock(tmp_path / 'translations.lock')
+    lock.set_locales({'es': {'a': '1', 'b': '2'}, 'de': {'a': '1'}})
+    report = lock.check({'a': '1', 'b': '3'}, ['es', 'de', 'it'])
+    assert report['es'] == {'stale': ['b'], 'missing': []}
+    assert report['de'] == {'stale': [], 'missing': ['b']}
+    assert report['it'] == {'stale': [], 'missing': ['a', 'b']}
+
+
+def test_in_scopes():
+    assert in_scopes('marketing.hero', ['marketing'])
+    assert in_scopes('marketing[0]', ['marketing'])
+    assert not in_scopes('marketingGenerational.x', ['marketing'])
+    assert in_scopes('anything', [''])
+
+
+def test_scoped_record_keeps_other_namespaces(tmp_path):
+    path = tmp_path / 'translations.lock'
+    record_locale_hashes(path, 'es', {'common.save': '1', 'marketing.hero': '2'})
+    record_locale_hashes(path, 'es', {'common.save': 'ignored', 'marketing.hero': '3', 'marketing.cta': '4'}, ['marketing'])
+
+    assert TranslationLock(path).locale_hashes('es') == {'common.save': '1', 'marketing.hero': '3', 'marketing.cta': '4'}
+
+
+def test_scoped_record_drops_removed_keys_of_its_scope(tmp_path):
+    path = tmp_path / 'translations.lock'
+    record_locale_hashes(path, 'es', {'common.save': '1', 'marketing.old': '2'})
+    record_locale_hashes(path, 'es', {'marketing.new': '3'}, ['marketing'])
+
+    assert TranslationLock(path).locale_hashes('es') == {'common.save': '1', 'marketing.new': '3'}
+
+
+def test_manifest_save_records_only_rewritten_scopes(tmp_path):
+    path = tmp_path / 'translations.lock'
+    record_locale_hashes(path, 'es', {'common.save': '1', 'marketing.hero': '2'})
+
+    manifest = SourceManifest('es', tmp_path / 'manifests', path)
+    manifest.hashes = {'marketing.hero': '2'}
+    manifest.replace_scope('marketing', {'marketing.hero': '5'})
+    manifest.save()
+
+    assert TranslationLock(path).locale_hashes('es') == {'common.save': '1', 'marketing.hero': '5'}
+
+
+def test_manifest_seeds_from_lockfile(tmp_path):
+    lockfile = tmp_path / 'translations.lock'
+    lock = TranslationLock(lockfile)
+    lock.set_locale('es', source_hashes(EN))
+    lock.save()
+
+    manifest = SourceManifest('es', tmp_path / 'manifests', lockfile)
+    assert manifest.recorded
+    assert manifest.scoped() == source_hashes(EN)
+    assert manifest.scoped('nav') == {'nav.home': hash_source('Home'), 'nav.count': hash_source('{count}')}
+
+    assert SourceManifest('fr', tmp_path / 'manifests', lockfile).scoped() is None
+
+
+def test_from_files_skips_english_copies(tmp_path, capsys):
+    script = load_script()
+    (tmp_path / 'en.json').write_text(json.dumps(EN), encoding='utf-8')
+    es = {'common': {'save': 'Guardar', 'cancel': 'Cancel'}, 'nav': {'count': '{count}'}}
+    (tmp_path / 'es.json').write_text(json.dumps(es), encoding='utf-8')
+    tree = SourceTree('app', tmp_path, False, tmp_path / 'manifests')
+
+    script.update(tree, ['es'], Namespace(from_files=True))
+    assert sorted(TranslationLock(tree.lockfile).locale_hashes('es')) == ['common.save', 'nav.count']
+
+    # Missing keys fail the check unless --allow-missing; stale ones always do
+    assert not script.check(tree, ['es'], Namespace(limit=10, allow_missing=False))
+    assert script.check(tree, ['es'], Namespace(limit=10, allow_missing=True))
+    (tmp_path / 'en.json').write_text(json.dumps({**EN, 'common': {'save': 'Store', 'cancel': 'Cancel'}}), encoding='utf-8')
+    assert not script.check(tree, ['es'], Namespace(limit=10, allow_missing=True))
+    assert 'common.save' in capsys.readouterr().out
@@ -0,0 +1,92 @@
+from translation.masking import Masker, TermMatcher, load_glossary
+
+
+def fake_translate(text):
+    """Stand-in backend: uppercases every word, leaves sentinels alone"""
+    return text.upper()
+
+
+def test_plain_argument_round_trip():
+    masked = Masker().mask('Hello {name}, you have <b>mail</b>')
+    assert masked.tokens == ['{name}', '<b>', '</b>']
+    assert masked.restore(fake_translate(masked.text)) == 'HELLO {name}, YOU HAVE <b>MAIL</b>'
+
+
+def test_plural_branches_are_exposed():
+    source = 'You have {count, plural, =0 {no items} one {# item} other {# items}}'
+    masked = Masker().mask(source)
+    assert masked.text == 'You have ⟦0⟧no items⟦1⟧ item⟦2⟧ items⟦3⟧'
+    assert not masked.opaque
+    restored = masked.restore(fake_translate(masked.text))
+    assert restored == 'YOU HAVE {count, plural, =0 {NO ITEMS} one {# ITEM} other {# ITEMS}}'
+
+
+def test_select_with_nested_argument_round_trip():
+    source = '{gender, select, female {She invited {guest}} other {They invited {guest}}}'
+    masked = Masker().mask(source)
+    restored = masked.restore(fake_translate(masked.text))
+    assert restored == '{gender, select, female {SHE INVITED {guest}} other {THEY INVITED {guest}}}'
+
+
+def test_broken_structure_is_rejected():
+    masked = Masker().mask('{count, plural, one {# item} other {# items}}')
+    assert not masked.verify('{count, plural, one {# article} autre {# articles}}')
+    assert not masked.verify('{count, plural, one {article} other {# articles}}')
+    assert masked.verify('{count, plural, one {# article} other {# articles}}')
+
+
+def test_sentinel_lost_or_duplicated():
+    masked = Masker().mask('Hi {name}')
+    assert masked.restore('HOLA') is None
+    assert masked.restore('⟦0⟧ ⟦0⟧') is None
+
+
+def test_glossary_terms_are_whole_words():
+    masker = Masker(terms=['Slack', 'ATLVS'])
+    masked = masker.mask('Connect Slack to ATLVS, not Slacker')
+    assert masked.tokens == ['Slack', 'ATLVS']
+    assert masked.restore(masked.text.replace('Connect', 'Conecta')) == 'Conecta Slack to ATLVS, not Slacker'
+
+
+def test_term_matcher_finds_overlapping_terms():
+    matcher = TermMatcher(['Quick', 'QuickBooks'])
+    state = 0
+    found = []
+    for ch in 'QuickBooks':
+        state = matcher.step(state, ch)
+        found.extend(matcher.lengths(state))
+    assert sorted(found) == [5, 10]
+
+
+def test_glossary_tags_and_plural_in_one_string_round_trip():
+    masker = Masker(terms=['ATLVS'])
+    source = '<b>ATLVS</b> synced {count, plural, one {# file to ATLVS} other {# files to ATLVS}}'
+    masked = masker.mask(source)
+    assert 'ATLVS' not in masked.text and '<b>' not in masked.text
+    restored = masked.restore(fake_translate(masked.text))
+    assert restored == '<b>ATLVS</b> SYNCED {count, plural, one {# FILE TO ATLVS} other {# FILES TO ATLVS}}'
+    assert masked.verify(restored)
+
+
+def test_longest_term_wins():
+    masked = Masker(terms=['Google', 'Google Drive']).mask('Open Google Drive or Google')
+    assert masked.tokens == ['Google Drive', 'Google']
+
+
+def test_placeholder_only_strings_are_opaque():
+    masker = Masker(terms=['ATLVS'])
+    assert masker.mask('{count} / {total}').opaque
+    assert masker.mask('ATLVS').opaque
+    assert not masker.mask('{count} items').opaque
+
+
+def test_segments_split_around_protected_spans():
+    masked = Masker().mask('Hi {name}, welcome')
+    assert masked.segments() == [('Hi ', '{name}'), (', welcome', '')]
+
+
+def test_glossary_file_skips_blank_terms(tmp_path):
+    path = tmp_path / 'glossary.json'
+    path.write_text('{"doNotTranslate": ["ATLVS", " ", 7, "COMPVSS"]}', encoding='utf-8')
+    assert load_glossary(path) == ['ATLVS', 'COMPVSS']
+    assert load_glossary(tmp_path / 'missing.json') == []
@@ -0,0 +1,78 @@
+import pytest
+
+from translation import backends, memory as memory_module
+from translation.backends import FakeBackend
+from translation.memory import TranslationMemory, WarmMemory
+from translation.quota import QuotaLedger
+
+
+@pytest.fixture
+def store(tmp_path):
+    memory = TranslationMemory(tmp_path / 'memory.sqlite3')
+    yield memory
+    memory.close()
+
+
+def test_entries_are_keyed_by_target_and_backend(store):
+    store.put('Save', 'es', 'google', 'Guardar')
+    assert store.get('Save', 'es', 'google') == 'Guardar'
+    assert store.get('Save', 'fr', 'google') is None
+    assert store.get('Save', 'es', 'deepl') is None
+    assert (store.hits, store.misses) == (1, 2)
+
+
+def test_entries_survive_a_reopen(tmp_path):
+    first = TranslationMemory(tmp_path / 'memory.sqlite3')
+    first.put('Save', 'es', 'google', 'Guardar')
+    first.close()
+    second = TranslationMemory(tmp_path / 'memory.sqlite3')
+    assert second.get('Save', 'es', 'google') == 'Guardar'
+    assert len(second) == 1
+    second.close()
+
+
+def test_size_limit_keeps_most_recently_used(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(memory_module, 'time', clock)
+    memory = TranslationMemory(tmp_path / 'memory.sqlite3')
+    for text in ('One', 'Two', 'Three'):
+        memory.put(text, 'es', 'google', text.lower())
+        clock.sleep(1)
+    memory.get('One', 'es', 'google')
+    memory.max_entries = 2
+    assert memory.evict() == 1
+    assert memory.get('Two', 'es', 'google') is None
+    assert memory.get('One', 'es', 'google') == 'one'
+    memory.close()
+
+
+def test_age_limit_drops_old_entries(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(memory_module, 'time', clock)
+    memory = TranslationMemory(tmp_path / 'memory.sqlite3')
+    memory.put('Old', 'es', 'google', 'viejo')
+    clock.sleep(3 * 86400)
+    memory.put('New', 'es', 'google', 'nuevo')
+    memory.max_age_days = 2
+    assert memory.evict() == 1
+    assert memory.get('New', 'es', 'google') == 'nuevo'
+    memory.close()
+
+
+def test_warm_memory_keeps_hits_only(store):
+    warm = WarmMemory(store)
+    assert warm.get('Save', 'es', 'google') is None
+    # Written by another run after the miss: the next lookup still reaches the store
+    store.put('Save', 'es', 'google', 'Guardar')
+    assert warm.get('Save', 'es', 'google') == 'Guardar'
+    store.put('Save', 'es', 'google', 'Salvar')
+    assert warm.get('Save', 'es', 'google') == 'Guardar'
+    assert (warm.hits, warm.misses) == (2, 1)
+
+
+def test_backend_is_only_called_on_a_miss(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_module, '_shared_memory', store)
+    monkeypatch.setattr('translation.quota._ledger', QuotaLedger(tmp_path / 'quota.json'))
+    backend = FakeBackend()
+    assert backends.translate_text('Save', 'es', backend) == '[es] Save'
+    assert backends.translate_text('Save', 'es', backend) == '[es] Save'
+    assert backend.requests == 1
+    assert store.get('Save', 'es', 'fake') == '[es] Save'
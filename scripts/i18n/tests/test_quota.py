@@ -0,0 +1,67 @@
+import pytest
+
+from translation import quota
+from translation.quota import QuotaLedger, budget_for, plan_budget
+from translation.retry import QuotaExhausted, RetryPolicy, call_with_retry
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch, clock):
+    monkeypatch.setattr(quota, 'time', clock)
+    monkeypatch.setenv('TRANSLATION_BUDGET_TEST', '100/250')
+    return QuotaLedger(tmp_path / 'quota.json')
+
+
+def test_budget_from_environment(monkeypatch):
+    monkeypatch.setenv('TRANSLATION_BUDGET_TEST', '/5_000')
+    assert budget_for('test') == (None, 5000)
+    monkeypatch.delenv('TRANSLATION_BUDGET_GOOGLE', raising=False)
+    assert budget_for('google') == (None, None)
+
+
+def test_minute_budget_waits_for_next_window(ledger, clock):
+    ledger.charge('test', 80)
+    ledger.charge('test', 40)
+    assert len(clock.sleeps) == 1
+    assert ledger.used_today('test') == 120
+
+
+def test_day_budget_raises_and_stays_exhausted(ledger):
+    ledger.charge('test', 100)
+    ledger.charge('test', 100)
+    with pytest.raises(QuotaExhausted):
+        ledger.charge('test', 100)
+    assert ledger.is_exhausted('test')
+    with pytest.raises(QuotaExhausted):
+        ledger.charge('test', 1)
+
+
+def test_retried_request_is_charged_once(ledger, monkeypatch, clock):
+    monkeypatch.setattr('translation.retry.time', clock)
+    attempts = []
+
+    def request():
+        with ledger.charged('test', 30):
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError('reset')
+            return 'ok'
+
+    assert call_with_retry(request, 'test-quota-refund', RetryPolicy(max_attempts=3)) == 'ok'
+    assert len(attempts) == 3
+    assert ledger.used_today('test') == 30
+
+
+def test_usage_is_merged_into_the_shared_file(ledger, tmp_path):
+    other = QuotaLedger(tmp_path / 'quota.json')
+    ledger.charge('test', 50)
+    other.charge('test', 20)
+    ledger.save()
+    other.save()
+    assert QuotaLedger(tmp_path / 'quota.json').used_today('test') == 70
+
+
+def test_plan_budget_fails_over_and_defers(ledger, monkeypatch):
+    monkeypatch.setenv('TRANSLATION_BUDGET_SPARE', '/100')
+    plan = plan_budget({'es': 200, 'de': 100, 'fr': 100}, 'test', ['spare'], ledger)
+    assert plan == {'es': 'test', 'de': 'spare', 'fr': None}
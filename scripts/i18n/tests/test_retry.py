@@ -0,0 +1,76 @@
+import pytest
+
+from translation import retry
+from translation.retry import CircuitBreaker, QuotaExhausted, RetryPolicy, TranslationFailed, call_with_retry
+
+
+@pytest.fixture
+def fake_time(monkeypatch, clock):
+    monkeypatch.setattr(retry, 'time', clock)
+    return clock
+
+
+def test_breaker_opens_at_failure_rate(fake_time):
+    breaker = CircuitBreaker(window=4, min_calls=4, failure_rate=0.5, cooldown=10)
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert not breaker.is_open
+    breaker.record_failure()
+    assert breaker.is_open
+    assert breaker.trips == 1
+
+    breaker.wait()
+    assert fake_time.sleeps == [10]
+    assert not breaker.is_open
+
+
+def test_breaker_doubles_cooldown_on_half_open_failure(fake_time):
+    breaker = CircuitBreaker(window=2, min_calls=2, failure_rate=1.0, cooldown=5, max_cooldown=15)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.wait()
+
+    breaker.record_failure()
+    assert breaker.cooldown == 10
+    breaker.wait()
+    breaker.record_failure()
+    assert breaker.cooldown == 15
+
+    breaker.wait()
+    breaker.record_success()
+    assert breaker.cooldown == 5
+
+
+def test_retry_until_success(fake_time):
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError('reset')
+        return 'ok'
+
+    assert call_with_retry(flaky, 'test-retry-success', RetryPolicy(max_attempts=5)) == 'ok'
+    assert len(calls) == 3
+    assert len(fake_time.sleeps) == 2
+
+
+def test_retry_gives_up_with_translation_failed(fake_time):
+    def broken():
+        raise ValueError('empty response')
+
+    with pytest.raises(TranslationFailed, match='empty response'):
+        call_with_retry(broken, 'test-retry-failed', RetryPolicy(max_attempts=3))
+
+
+def test_quota_exhausted_is_not_retried(fake_time):
+    calls = []
+
+    def spent():
+        calls.append(1)
+        raise QuotaExhausted('test-retry-quota', fake_time.now + 60)
+
+    with pytest.raises(QuotaExhausted):
+        call_with_retry(spent, 'test-retry-quota')
+    assert len(calls) == 1
@@ -0,0 +1,34 @@
+import json
+
+from translation.shards import load_shard_manifest, shard_locale_file, write_shards
+
+ES = {'common': {'save': 'Guardar', 'items': ['Uno', 'Dos']}, 'nav': {'home': 'Inicio'}, 'title': 'Hola'}
+
+
+def test_each_namespace_gets_a_wrapped_shard(tmp_path):
+    stats = write_shards('es', ES, tmp_path)
+    assert stats == {'namespaces': 3, 'written': 3, 'removed': 0}
+    assert json.loads((tmp_path / 'es' / 'common.json').read_text(encoding='utf-8')) == {'common': ES['common']}
+    manifest = load_shard_manifest('es', tmp_path)
+    assert manifest['locale'] == 'es'
+    assert {name: entry['keys'] for name, entry in manifest['namespaces'].items()} == {'common': 3, 'nav': 1, 'title': 1}
+
+
+def test_unchanged_shards_are_kept_and_stale_ones_removed(tmp_path):
+    write_shards('es', ES, tmp_path)
+    before = load_shard_manifest('es', tmp_path)['namespaces']
+    changed = {'common': ES['common'], 'nav': {'home': 'Portada'}}
+    assert write_shards('es', changed, tmp_path) == {'namespaces': 2, 'written': 1, 'removed': 1}
+    after = load_shard_manifest('es', tmp_path)['namespaces']
+    assert after['common']['hash'] == before['common']['hash']
+    assert after['nav']['hash'] != before['nav']['hash']
+    assert not (tmp_path / 'es' / 'title.json').exists()
+
+
+def test_locale_file_is_resharded(tmp_path):
+    messages = tmp_path / 'messages'
+    messages.mkdir()
+    (messages / 'es.json').write_text(json.dumps(ES), encoding='utf-8')
+    shard_locale_file('es', messages, tmp_path / 'shards')
+    assert sorted(load_shard_manifest('es', tmp_path / 'shards')['namespaces']) == ['common', 'nav', 'title']
+    assert load_shard_manifest('fr', tmp_path / 'shards') is None
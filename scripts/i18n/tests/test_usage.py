@@ -0,0 +1,49 @@
+from translation import usage
+from translation.usage import UsageIndex, prioritize_strings, route_namespaces
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+def test_index_counts_bindings_and_calls():
+    index = UsageIndex()
+    index.scan_source("const t = useTranslations('common')\nt('save'); t('save'); t(`status.${value}`)")
+    assert index.namespaces == {'common': 1, 'common.status': 1}
+    assert index.keys == {'common.save': 2}
+    assert index.tier('common.save') == 0
+    assert index.tier('common.status.open') == 1
+    assert index.tier('nav.home') == 2
+
+
+def test_strings_take_the_best_tier_of_any_key_using_them():
+    index = UsageIndex()
+    index.scan_source("const t = useTranslations('common')\nt('save'); t('save'); t('cancel')")
+    index.scan_source("const t = useTranslations('nav')")
+    tree = {
+        'common': {'save': 'Save', 'cancel': 'Cancel', 'unused': 'Archive'},
+        'nav': {'home': 'Home'},
+        'admin': {'archive': 'Archive', 'purge': 'Purge'},
+    }
+    strings = ['Purge', 'Archive', 'Home', 'Cancel', 'Save']
+    assert prioritize_strings(tree, strings, index) == [['Save', 'Cancel'], ['Archive', 'Home'], ['Purge']]
+
+
+def test_route_namespaces_follow_layouts_and_imports(tmp_path, monkeypatch):
+    src = tmp_path / 'src'
+    monkeypatch.setattr(usage, 'SRC_DIR', src)
+    app = src / 'app' / '[locale]'
+    write(app / 'error.tsx', "const t = useTranslations('errors')")
+    write(app / '(marketing)' / 'layout.tsx', "import { Nav } from '@/components/nav'")
+    write(app / '(marketing)' / 'pricing' / 'page.tsx', "import Table from './table'\n")
+    write(app / '(marketing)' / 'pricing' / 'table.tsx', "const t = await getTranslations({ locale, namespace: 'marketing.pricing' })")
+    write(app / '(auth)' / 'login' / 'page.tsx', "export default function Login() {}")
+    write(app / '(dashboard)' / 'workspace' / 'page.tsx', "const t = useTranslations(`${module}`)")
+    write(src / 'components' / 'nav' / 'index.tsx', "const t = useTranslations('nav')")
+
+    assert route_namespaces(app) == {
+        'login': ['errors'],
+        'pricing': ['errors', 'marketing', 'nav'],
+        'workspace': None,
+    }
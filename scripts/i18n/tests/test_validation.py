@@ -0,0 +1,53 @@
+import json
+
+from translation.validation import build_source_index, placeholder_signature, validate_locale_tree, validate_locales
+
+EN = {
+    'common': {'save': 'Save', 'ok': 'OK', 'greeting': 'Hello <b>{name}</b>'},
+    'items': {'count': '{count, plural, one {# item} other {# items}}'},
+    'nav': {'home': 'Home', 'links': ['Docs', 'Blog']},
+}
+
+
+def test_signature_collects_arguments_and_tags():
+    assert placeholder_signature('Hello <b>{name}</b>, {count, plural, one {# x} other {# y}}') == (
+        '<b>', '<b>', 'count', 'name'
+    )
+
+
+def test_clean_locale_has_no_findings():
+    es = {
+        'common': {'save': 'Guardar', 'ok': 'OK', 'greeting': 'Hola <b>{name}</b>'},
+        'items': {'count': '{count, plural, one {# artículo} other {# artículos}}'},
+        'nav': {'home': 'Inicio', 'links': ['Documentos', 'Bitácora']},
+    }
+    result = validate_locale_tree('es', es, build_source_index(EN))
+    assert (result['errors'], result['warnings'], result['coverage']) == (0, 0, 1.0)
+
+
+def test_every_kind_of_finding_in_one_walk():
+    es = {
+        'common': {'save': 'Save', 'greeting': 'Hola {nombre}', 'extra': 'Sobra'},
+        'items': {'count': {'one': 'artículo'}},
+        'nav': {'home': 'Inicio', 'links': ['Documentos']},
+    }
+    result = validate_locale_tree('es', es, build_source_index(EN))
+    assert result['missing'] == ['common.ok', 'nav.links[1]']
+    assert result['type_mismatches'] == ['items.count']
+    assert result['placeholder_mismatches'] == [
+        {'key': 'common.greeting', 'expected': ['<b>', '<b>', 'name'], 'found': ['nombre']}
+    ]
+    assert result['untranslated'] == ['common.save']
+    assert result['extra'] == ['common.extra']
+    assert (result['errors'], result['warnings']) == (4, 2)
+
+
+def test_locale_files_are_checked_in_worker_processes(tmp_path):
+    (tmp_path / 'en.json').write_text(json.dumps(EN), encoding='utf-8')
+    (tmp_path / 'fr.json').write_text(json.dumps({'common': {'save': 'Enregistrer'}}), encoding='utf-8')
+    (tmp_path / 'de.json').write_text('{"common": ', encoding='utf-8')
+    report = validate_locales(tmp_path, workers=2)
+    assert report['source'] == {'locale': 'en', 'keys': 7, 'with_placeholders': 2}
+    assert sorted(report['locales']) == ['de', 'fr']
+    assert 'load_error' in report['locales']['de']
+    assert len(report['locales']['fr']['missing']) == 6
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from translation import writer
+from translation.writer import dump_messages, write_atomic, write_json, write_locale_file, write_locales
+
+
+def test_canonical_form_keeps_order_and_unicode():
+    assert dump_messages({'b': 'Ünïcode', 'a': ['x']}) == '{\n  "b": "Ünïcode",\n  "a": [\n    "x"\n  ]\n}\n'
+
+
+def test_unchanged_file_is_not_touched(tmp_path):
+    path = tmp_path / 'es.json'
+    assert write_json(path, {'save': 'Guardar'})
+    os.utime(path, (0, 0))
+    assert not write_json(path, {'save': 'Guardar'})
+    assert path.stat().st_mtime == 0
+    assert write_json(path, {'save': 'Salvar'})
+
+
+def test_existing_permissions_are_kept(tmp_path):
+    path = tmp_path / 'es.json'
+    path.write_text('{}\n', encoding='utf-8')
+    path.chmod(0o640)
+    write_atomic(path, '{"a": 1}\n')
+    assert path.stat().st_mode & 0o777 == 0o640
+
+
+def test_failed_write_leaves_the_old_file_and_no_temp(tmp_path, monkeypatch):
+    path = tmp_path / 'es.json'
+    write_atomic(path, 'old\n')
+
+    def crash(src, dst):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(writer.os, 'replace', crash)
+    with pytest.raises(OSError):
+        write_atomic(path, 'new\n')
+    assert path.read_text(encoding='utf-8') == 'old\n'
+    assert [entry.name for entry in tmp_path.iterdir()] == ['es.json']
+
+
+def test_locales_are_written_with_their_shards(tmp_path):
+    results = write_locales({'es': {'nav': {'home': 'Inicio'}}, 'fr': {'nav': {'home': 'Accueil'}}}, tmp_path)
+    assert results['es'] == {'written': True, 'shards': {'namespaces': 1, 'written': 1, 'removed': 0}}
+    assert (tmp_path / 'shards' / 'fr' / 'nav.json').exists()
+    assert write_locale_file('es', {'nav': {'home': 'Inicio'}}, tmp_path, shards=False) == {'written': False, 'shards': None}
@@ -2,83 +2,154 @@
 """
 COMPLETE TRANSLATION FOR 6 MISSING LANGUAGES
 Translates ALL keys for Italian, Polish, Dutch, Swedish, Danish, Finnish
-Uses deep-translator (same as original 20 languages)
+Uses deep-translator by default (same as original 20 languages)
 
-Install: pip3 install deep-translator
+Install: pip3 install deep-translator (default Google backend)
+Usage: python3 scripts/i18n/translate-6-missing-languages.py [--incremental] [--resume] [--concurrency=N] [--backend=NAME] [--metrics-dir=DIR] [--no-priority] [--failover=deepl,libre] [--profile[=DIR]]
+
+Keys used most in src/ are translated first and each locale file is rewritten
+after every priority tier, so the new locales become usable early. Each
+locale goes to the first backend in [--backend, *--failover] whose daily
+character budget covers it; locales nothing can cover are deferred to a later run
 """
 
 import json
+import sys
 import time
-from pathlib import Path
-from deep_translator import GoogleTranslator
 
-# Language configurations
-LANGUAGES = {
-    'it': {'name': 'Italian', 'code': 'it'},
-    'pl': {'name': 'Polish', 'code': 'pl'},
-    'nl': {'name': 'Dutch', 'code': 'nl'},
-    'sv': {'name': 'Swedish', 'code': 'sv'},
-    'da': {'name': 'Danish', 'code': 'da'},
-    'fi': {'name': 'Finnish', 'code': 'fi'}
-}
+from translation import (
+    MESSAGES_DIR,
+    CheckpointJournal,
+    SourceManifest,
+    TranslationEngine,
+    apply_translations,
+    backend_from_args,
+    budget_for,
+    collect_unique_strings,
+    concurrency_from_args,
+    count_strings,
+    estimate_characters,
+    failover_from_args,
+    get_languages,
+    get_memory,
+    get_quota,
+    load_usage_index,
+    merge_changes,
+    metrics_from_args,
+    paths_for_sources,
+    plan_budget,
+    plan_changes,
+    prioritize_strings,
+    profile_from_args,
+    profile_phase,
+    record_locale,
+    set_active_backend,
+    source_hashes,
+    translate_incremental,
+    translate_unique,
+    write_locale_file,
+)
+from translation import backends
 
-MESSAGES_DIR = Path(__file__).parent.parent / 'src' / 'i18n' / 'messages'
+# Names and backend codes come from src/i18n/config.ts
+LANGUAGES = get_languages(['it', 'pl', 'nl', 'sv', 'da', 'fi'])
 
-def translate_text(text, target_lang):
-    """Translate text to target language with retry logic"""
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            translator = GoogleTranslator(source='en', target=target_lang)
-            result = translator.translate(text)
-            time.sleep(0.15)  # Rate limiting - slightly longer delay
-            return result
-        except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(2)  # Longer wait on retry
-                continue
-            print(f"      ⚠️  Error translating: {str(e)[:50]}")
-            return text  # Return original on error
+def translate_text(text, target_lang, backend=None):
+    """Translate text to target language through the active backend (memory, retries, circuit breaker)"""
+    return backends.translate_text(text, target_lang, backend)
 
-def translate_object(obj, target_lang, path='', progress_callback=None):
-    """Recursively translate all strings in an object"""
-    if isinstance(obj, dict):
-        result = {}
-        for key, value in obj.items():
-            current_path = f"{path}.{key}" if path else key
-            result[key] = translate_object(value, target_lang, current_path, progress_callback)
-        return result
-    elif isinstance(obj, str):
-        if progress_callback:
-            progress_callback()
-        return translate_text(obj, target_lang)
-    else:
-        return obj
+def translate_batch(texts, target_lang, backend=None):
+    """Translate many short strings in one request; failed entries come back as None"""
+    return backends.translate_batch(texts, target_lang, backend)
 
-def count_strings(obj):
-    """Count total translatable strings in object"""
-    if isinstance(obj, dict):
-        return sum(count_strings(value) for value in obj.values())
-    elif isinstance(obj, str):
-        return 1
-    else:
-        return 0
+def translate_object(
+    obj,
+    target_lang,
+    progress_callback=None,
+    unique_strings=None,
+    engine=None,
+    failed=None,
+    existing=None,
+    journal=None,
+    tiers=None,
+    on_tier=None,
+    backend=None,
+):
+    """Translate all strings in an object, each unique source string only once"""
+    return translate_unique(
+        obj,
+        lambda text: translate_text(text, target_lang, backend),
+        progress_callback=progress_callback,
+        unique_strings=unique_strings,
+        engine=engine,
+        batch_fn=lambda texts: translate_batch(texts, target_lang, backend),
+        failed=failed,
+        existing=existing,
+        journal=journal,
+        tiers=tiers,
+        on_tier=on_tier,
+    )
 
-def translate_language(locale, config):
-    """Translate entire language file"""
+def write_locale(locale, data):
+    """Atomically write a locale file and its per-namespace shards for the sharded loader in src/i18n/request.ts"""
+    with profile_phase('write'):
+        write_locale_file(locale, data, MESSAGES_DIR)
+
+def translate_language(locale, config, incremental=False, engine=None, resume=False, usage=None, backend_name=None):
+    """Translate entire language file (only changed keys when incremental)"""
     print(f"\n📝 Translating {config['name']} ({locale})...")
     
     start_time = time.time()
     
     try:
+        backend = backends.get_backend(backend_name)
         # Read English source
-        en_path = MESSAGES_DIR / 'en.json'
-        with open(en_path, 'r', encoding='utf-8') as f:
-            en_data = json.load(f)
+        with profile_phase('load'):
+            en_path = MESSAGES_DIR / 'en.json'
+            with open(en_path, 'r', encoding='utf-8') as f:
+                en_data = json.load(f)
+            
+            locale_path = MESSAGES_DIR / f'{locale}.json'
+            manifest = SourceManifest(locale)
+            locale_data = {}
+            failed = set()
+            journal = CheckpointJournal(locale, '', resume=resume)
+            if locale_path.exists():
+                with open(locale_path, 'r', encoding='utf-8') as f:
+                    locale_data = json.load(f)
+        
+        # Count total strings and the unique ones actually sent for translation
+        with profile_phase('flatten'):
+            total_keys = count_strings(en_data)
+            if incremental:
+                changed = plan_changes(en_data, locale_data, manifest.scoped())
+                total_strings = len(set(changed.values()))
+                print(f"   Total keys: {total_keys} ({len(changed)} changed, {total_strings} unique strings)")
+            else:
+                unique_strings = collect_unique_strings(en_data)
+                total_strings = len(unique_strings)
+                print(f"   Total keys: {total_keys} ({total_strings} unique strings)")
         
-        # Count total strings
-        total_strings = count_strings(en_data)
-        print(f"   Total keys: {total_strings}")
+        resumed = len(journal.completed.keys() & (set(changed.values()) if incremental else set(unique_strings)))
+        if resumed:
+            print(f"   ♻️  Resuming: {resumed} strings already translated in a previous run")
+            total_strings -= resumed
+        
+        # Most-used keys first; each finished tier is written so the locale is usable early
+        pending = list(dict.fromkeys(changed.values())) if incremental else unique_strings
+        with profile_phase('flatten'):
+            tiers = prioritize_strings(en_data, pending, usage) if usage is not None else None
+        flushed = [0]
+        
+        def flush_tier(translations):
+            # Incremental runs only replace the planned keys; the rest keep their current value
+            flushed[0] += 1
+            if incremental:
+                tier_data = merge_changes(en_data, locale_data, changed, translations)
+            else:
+                tier_data = apply_translations(en_data, translations, existing=locale_data)
+            write_locale(locale, tier_data)
+            print(f"   💾 {locale}: priority tier {flushed[0]}/{len(tiers)} written ({len(translations)} strings so far)")
         
         # Progress tracking
         translated_count = [0]
@@ -86,75 +157,195 @@ def translate_language(locale, config):
         
         def progress_callback():
             translated_count[0] += 1
-            percent = int((translated_count[0] / total_strings) * 100)
+            percent = int((translated_count[0] / max(total_strings, 1)) * 100)
             if percent > last_percent[0] and percent % 5 == 0:
                 print(f"   Progress: {percent}% ({translated_count[0]}/{total_strings})")
                 last_percent[0] = percent
         
         # Translate entire structure
-        print(f"   Translating...")
-        translated_data = translate_object(en_data, config['code'], progress_callback=progress_callback)
+        print("   Translating...")
+        with profile_phase('translate'):
+            if incremental:
+                translated_data, stats = translate_incremental(
+                    en_data,
+                    locale_data,
+                    manifest.scoped(),
+                    lambda text: translate_text(text, config['code'], backend),
+                    batch_fn=lambda texts: translate_batch(texts, config['code'], backend),
+                    progress_callback=progress_callback,
+                    changed=changed,
+                    engine=engine,
+                    failed=failed,
+                    journal=journal,
+                    tiers=tiers,
+                    on_tier=flush_tier,
+                )
+                print(f"   🔁 Incremental: {stats['changed']} translated, {stats['kept']} kept, {stats['removed']} removed")
+            else:
+                translated_data = translate_object(
+                    en_data,
+                    config['code'],
+                    progress_callback=progress_callback,
+                    unique_strings=unique_strings,
+                    engine=engine,
+                    failed=failed,
+                    journal=journal,
+                    existing=locale_data,
+                    tiers=tiers,
+                    on_tier=flush_tier,
+                    backend=backend,
+                )
         
         # Write to file
-        locale_path = MESSAGES_DIR / f'{locale}.json'
-        with open(locale_path, 'w', encoding='utf-8') as f:
-            json.dump(translated_data, f, ensure_ascii=False, indent=2)
-            f.write('\n')
+        write_locale(locale, translated_data)
         
+        # Record which source each key was translated from; failed keys get no hash
+        with profile_phase('write'):
+            manifest.replace_scope('', source_hashes(en_data, exclude=failed))
+            manifest.save()
+        journal.discard()
+        
+        failed_paths = paths_for_sources(en_data, failed)
+        translated_keys = total_keys - len(failed_paths)
+        record_locale(locale, translated_keys, len(failed_paths), time.time() - start_time)
         duration = time.time() - start_time
         print(f"   ✅ {config['name']} complete ({duration:.1f}s)")
-        print(f"   📊 {total_strings}/{total_strings} keys translated (100%)")
+        print(f"   📊 {translated_keys}/{total_keys} keys translated ({translated_keys / max(total_keys, 1):.0%}) from {total_strings} unique strings")
+        if failed_paths:
+            print(f"   ⚠️  {len(failed_paths)} keys failed and were left untranslated (re-run with --incremental to retry):")
+            for path in failed_paths[:10]:
+                print(f"      - {path}")
+        memory = get_memory()
+        print(f"   💾 Translation memory: {memory.hits} hits, {memory.misses} misses")
         
-        return {'success': True, 'locale': locale, 'duration': duration, 'keys': total_strings}
+        return {
+            'success': True,
+            'locale': locale,
+            'duration': duration,
+            'keys': translated_keys,
+            'unique': total_strings,
+            'failed': failed_paths,
+        }
     except Exception as e:
         print(f"   ❌ Error: {str(e)}")
         return {'success': False, 'locale': locale, 'error': str(e)}
 
+def estimate_jobs(en_data, incremental):
+    """Characters each locale will send (before translation memory hits), in locale order"""
+    if not incremental:
+        characters = estimate_characters(collect_unique_strings(en_data))
+        return {locale: characters for locale in LANGUAGES}
+    jobs = {}
+    for locale in LANGUAGES:
+        locale_path = MESSAGES_DIR / f'{locale}.json'
+        locale_data = {}
+        if locale_path.exists():
+            with open(locale_path, 'r', encoding='utf-8') as f:
+                locale_data = json.load(f)
+        changed = plan_changes(en_data, locale_data, SourceManifest(locale).scoped())
+        jobs[locale] = estimate_characters(dict.fromkeys(changed.values()))
+    return jobs
+
 def main():
+    incremental = '--incremental' in sys.argv[1:]
+    resume = '--resume' in sys.argv[1:]
+    profile_from_args(sys.argv[1:])
+    with profile_phase('load'):
+        usage = None if '--no-priority' in sys.argv[1:] else load_usage_index()
+    concurrency = concurrency_from_args(sys.argv[1:])
+    metrics_from_args(sys.argv[1:])
+    try:
+        backend = set_active_backend(backend_from_args(sys.argv[1:]))
+        failover = failover_from_args(sys.argv[1:])
+    except ValueError as e:
+        print(f'❌ Error: {str(e)}')
+        sys.exit(1)
+    
     print('🌍 6 MISSING LANGUAGES TRANSLATION SYSTEM\n')
+    print(f'Backend: {backend.name}, concurrency: {concurrency} in-flight requests\n')
+    if incremental:
+        print('Mode: incremental (only keys changed since the last run)\n')
+    if usage is not None:
+        print(f'Priority: most-used keys first (usage from {usage.files} files in src/)\n')
     print('Languages to translate:')
     for locale, config in LANGUAGES.items():
         print(f"  - {config['name']} ({locale})")
-    print('\nEstimated: ~8,000 keys per language')
-    print('Total: ~48,000 translations\n')
+    
+    # Size the job from the source before sending anything
+    with open(MESSAGES_DIR / 'en.json', 'r', encoding='utf-8') as f:
+        en_data = json.load(f)
+    # Each locale goes to the first backend that can cover it; the rest wait for a later run
+    jobs = estimate_jobs(en_data, incremental)
+    plan = plan_budget(jobs, backend.name, failover)
+    quota = get_quota()
+    print(f'\nEstimated: {count_strings(en_data):,} keys, ~{sum(jobs.values()):,} characters to send '
+          '(before translation memory hits)')
+    for name in dict.fromkeys([backend.name, *failover]):
+        per_minute, per_day = budget_for(name)
+        remaining = quota.remaining_today(name)
+        assigned = [locale for locale, assignee in plan.items() if assignee == name]
+        print(f"   {name}: {per_minute or 'unlimited'}/min, "
+              f"{f'{remaining:,} of {per_day:,} left today' if per_day else 'no daily limit'}"
+              + (f" -> {', '.join(assigned)}" if assigned and name != backend.name else ''))
+    deferred = [locale for locale, assignee in plan.items() if assignee is None]
+    if deferred:
+        print(f"   ⏸️  Deferred (no budget left today): {', '.join(deferred)}")
+    print()
     print('=' * 80 + '\n')
     
     results = []
     total_success = 0
     total_failed = 0
     total_keys = 0
+    failed_keys = 0
     
-    for locale, config in LANGUAGES.items():
-        result = translate_language(locale, config)
-        results.append(result)
-        
+    # Locales run concurrently; the shared engine caps in-flight requests and
+    # the per-backend rate limiter paces them instead of fixed delays
+    scheduled = [locale for locale in LANGUAGES if plan[locale] is not None]
+    with TranslationEngine(concurrency) as engine:
+        results = engine.map_locales(
+            lambda locale: translate_language(
+                locale,
+                LANGUAGES[locale],
+                incremental=incremental,
+                engine=engine,
+                resume=resume,
+                usage=usage,
+                backend_name=plan[locale],
+            ),
+            scheduled,
+        )
+    results += [
+        {'success': False, 'locale': locale, 'error': 'deferred: no character budget left today'} for locale in deferred
+    ]
+    
+    for result in results:
         if result['success']:
             total_success += 1
             total_keys += result.get('keys', 0)
+            failed_keys += len(result.get('failed', []))
         else:
             total_failed += 1
-        
-        # Delay between languages to avoid rate limiting
-        if locale != list(LANGUAGES.keys())[-1]:  # Not the last one
-            print('\n   ⏳ Waiting 5 seconds before next language...')
-            time.sleep(5)
     
     # Final summary
     print('\n' + '=' * 80)
     print('\n📊 TRANSLATION COMPLETE\n')
-    print(f"Languages processed: {len(results)}/6")
+    print(f"Languages processed: {len(results)}/{len(LANGUAGES)}")
     print(f"✅ Successful: {total_success}")
     print(f"❌ Failed: {total_failed}")
     print(f"\n📈 Total translations: {total_keys:,} keys")
+    print(f"⚠️  Untranslated keys: {failed_keys:,}")
     
-    if total_success == 6:
-        print('\n🎉 SUCCESS! All 6 languages are now 100% translated!')
-        print(f'   Total: {total_keys:,} translations across 6 languages')
+    if total_success == len(LANGUAGES) and not failed_keys:
+        print(f'\n🎉 SUCCESS! All {len(LANGUAGES)} languages are now 100% translated!')
+        print(f'   Total: {total_keys:,} translations across {len(LANGUAGES)} languages')
         print('\n✅ Next steps:')
         print('   1. Verify translation files exist')
         print('   2. Test country selector with all 38 countries')
         print('   3. Test language switching')
         print('   4. Deploy to production')
+    elif total_success == len(LANGUAGES):
+        print(f'\n⚠️  {failed_keys:,} keys failed and were left untranslated. Re-run with --incremental to retry them.')
     else:
         print('\n⚠️  Some languages failed. Check errors above.')
         print('   Failed languages:')
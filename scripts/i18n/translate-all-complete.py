@@ -1,148 +1,231 @@
 #!/usr/bin/env python3
 """
 COMPLETE TRANSLATION SYSTEM FOR ALL LANGUAGES
-Translates ALL 682 marketing keys for ALL 19 languages using deep-translator
-100% completion - NO PLACEHOLDERS
+Translates ALL marketing keys for ALL 19 languages using deep-translator.
+Keys that fail are left untranslated (never filled with English) and are
+counted in the summary; re-run with --incremental to retry them
 
-Install: pip3 install deep-translator
+Install: pip3 install deep-translator (default Google backend)
+Usage: python3 scripts/i18n/translate-all-complete.py [--incremental] [--resume] [--concurrency=N] [--backend=NAME] [--metrics-dir=DIR] [--profile[=DIR]]
 """
 
 import json
+import sys
 import time
-from pathlib import Path
-from deep_translator import GoogleTranslator
 
-# Language configurations
-LANGUAGES = {
-    'es': {'name': 'Spanish', 'code': 'es'},
-    'fr': {'name': 'French', 'code': 'fr'},
-    'zh': {'name': 'Chinese (Simplified)', 'code': 'zh-CN'},
-    'hi': {'name': 'Hindi', 'code': 'hi'},
-    'ar': {'name': 'Arabic', 'code': 'ar'},
-    'ko': {'name': 'Korean', 'code': 'ko'},
-    'vi': {'name': 'Vietnamese', 'code': 'vi'},
-    'pt': {'name': 'Portuguese', 'code': 'pt'},
-    'de': {'name': 'German', 'code': 'de'},
-    'ja': {'name': 'Japanese', 'code': 'ja'},
-    'ru': {'name': 'Russian', 'code': 'ru'},
-    'id': {'name': 'Indonesian', 'code': 'id'},
-    'ur': {'name': 'Urdu', 'code': 'ur'},
-    'bn': {'name': 'Bengali', 'code': 'bn'},
-    'ta': {'name': 'Tamil', 'code': 'ta'},
-    'te': {'name': 'Telugu', 'code': 'te'},
-    'mr': {'name': 'Marathi', 'code': 'mr'},
-    'tr': {'name': 'Turkish', 'code': 'tr'},
-    'sw': {'name': 'Swahili', 'code': 'sw'}
-}
+from translation import (
+    MESSAGES_DIR,
+    CheckpointJournal,
+    SourceManifest,
+    TranslationEngine,
+    backend_from_args,
+    collect_unique_strings,
+    concurrency_from_args,
+    count_strings,
+    get_languages,
+    get_memory,
+    metrics_from_args,
+    paths_for_sources,
+    plan_changes,
+    profile_from_args,
+    profile_phase,
+    record_locale,
+    set_active_backend,
+    source_hashes,
+    translate_incremental,
+    translate_unique,
+    write_locale_file,
+)
+from translation import backends
 
-MESSAGES_DIR = Path(__file__).parent.parent / 'src' / 'i18n' / 'messages'
+# Names and backend codes come from src/i18n/config.ts
+LANGUAGES = get_languages(['es', 'fr', 'zh', 'hi', 'ar', 'ko', 'vi', 'pt', 'de', 'ja', 'ru', 'id', 'ur', 'bn', 'ta', 'te', 'mr', 'tr', 'sw'])
 
 def translate_text(text, target_lang):
-    """Translate text to target language with retry logic"""
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            translator = GoogleTranslator(source='en', target=target_lang)
-            result = translator.translate(text)
-            time.sleep(0.1)  # Rate limiting
-            return result
-        except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(1)
-                continue
-            print(f"      ⚠️  Error translating: {str(e)[:50]}")
-            return text  # Return original on error
+    """Translate text to target language through the active backend (memory, retries, circuit breaker)"""
+    return backends.translate_text(text, target_lang)
 
-def translate_object(obj, target_lang, path=''):
-    """Recursively translate all strings in an object"""
-    if isinstance(obj, dict):
-        result = {}
-        for key, value in obj.items():
-            current_path = f"{path}.{key}" if path else key
-            result[key] = translate_object(value, target_lang, current_path)
-        return result
-    elif isinstance(obj, str):
-        return translate_text(obj, target_lang)
-    else:
-        return obj
+def translate_batch(texts, target_lang):
+    """Translate many short strings in one request; failed entries come back as None"""
+    return backends.translate_batch(texts, target_lang)
+
+def translate_object(
+    obj, target_lang, progress_callback=None, unique_strings=None, engine=None, failed=None, existing=None, journal=None
+):
+    """Translate all strings in an object, each unique source string only once"""
+    return translate_unique(
+        obj,
+        lambda text: translate_text(text, target_lang),
+        progress_callback=progress_callback,
+        unique_strings=unique_strings,
+        engine=engine,
+        batch_fn=lambda texts: translate_batch(texts, target_lang),
+        failed=failed,
+        existing=existing,
+        journal=journal,
+    )
 
-def translate_language(locale, config):
-    """Translate entire marketing section for a language"""
+def translate_language(locale, config, incremental=False, engine=None, resume=False):
+    """Translate entire marketing section for a language (only changed keys when incremental)"""
     print(f"\n📝 Translating {config['name']} ({locale})...")
-    print(f"   Target: 682 keys")
     
     start_time = time.time()
     
     try:
         # Read English source
-        en_path = MESSAGES_DIR / 'en.json'
-        with open(en_path, 'r', encoding='utf-8') as f:
-            en_data = json.load(f)
-        en_marketing = en_data.get('marketing', {})
+        with profile_phase('load'):
+            en_path = MESSAGES_DIR / 'en.json'
+            with open(en_path, 'r', encoding='utf-8') as f:
+                en_data = json.load(f)
+            en_marketing = en_data.get('marketing', {})
+            total_keys = count_strings(en_marketing)
+            print(f"   Target: {total_keys:,} keys")
+            
+            # Read existing locale file
+            locale_path = MESSAGES_DIR / f'{locale}.json'
+            with open(locale_path, 'r', encoding='utf-8') as f:
+                locale_data = json.load(f)
+            manifest = SourceManifest(locale)
+            failed = set()
+            journal = CheckpointJournal(locale, 'marketing', resume=resume)
         
-        # Translate marketing section
-        print(f"   Translating...")
-        translated_marketing = translate_object(en_marketing, config['code'])
+        # Plan the unique strings actually sent for translation
+        with profile_phase('flatten'):
+            if incremental:
+                changed = plan_changes(en_marketing, locale_data.get('marketing', {}), manifest.scoped('marketing'), 'marketing')
+                unique_strings = list(dict.fromkeys(changed.values()))
+                print(f"   Changed: {len(changed)} keys ({len(unique_strings)} unique strings)")
+            else:
+                unique_strings = collect_unique_strings(en_marketing)
+                print(f"   Unique strings: {len(unique_strings)}")
         
-        # Read existing locale file
-        locale_path = MESSAGES_DIR / f'{locale}.json'
-        with open(locale_path, 'r', encoding='utf-8') as f:
-            locale_data = json.load(f)
+        resumed = len(journal.completed.keys() & set(unique_strings))
+        if resumed:
+            print(f"   ♻️  Resuming: {resumed} strings already translated in a previous run")
+        
+        # Translate marketing section
+        print("   Translating...")
+        if incremental:
+            with profile_phase('translate'):
+                translated_marketing, stats = translate_incremental(
+                    en_marketing,
+                    locale_data.get('marketing', {}),
+                    manifest.scoped('marketing'),
+                    lambda text: translate_text(text, config['code']),
+                    batch_fn=lambda texts: translate_batch(texts, config['code']),
+                    prefix='marketing',
+                    changed=changed,
+                    engine=engine,
+                    failed=failed,
+                    journal=journal,
+                )
+            print(f"   🔁 Incremental: {stats['changed']} translated, {stats['kept']} kept, {stats['removed']} removed")
+        else:
+            with profile_phase('translate'):
+                translated_marketing = translate_object(
+                    en_marketing,
+                    config['code'],
+                    unique_strings=unique_strings,
+                    engine=engine,
+                    failed=failed,
+                    journal=journal,
+                    existing=locale_data.get('marketing', {}),
+                )
         
         # Update marketing section
         locale_data['marketing'] = translated_marketing
         
         # Write back to file
-        with open(locale_path, 'w', encoding='utf-8') as f:
-            json.dump(locale_data, f, ensure_ascii=False, indent=2)
-            f.write('\n')
+        # Atomic (temp file + rename) and skipped when unchanged; also refreshes the
+        # per-namespace shards for the sharded loader in src/i18n/request.ts
+        with profile_phase('write'):
+            write_locale_file(locale, locale_data, MESSAGES_DIR)
+            
+            # Record which source each marketing key was translated from; failed keys get no hash
+            manifest.replace_scope('marketing', source_hashes(en_marketing, 'marketing', exclude=failed))
+            manifest.save()
+        journal.discard()
+        failed_paths = paths_for_sources(en_marketing, failed, 'marketing')
         
         duration = time.time() - start_time
         print(f"   ✅ {config['name']} complete ({duration:.1f}s)")
-        print(f"   📊 682/682 keys translated (100%)")
+        translated_keys = total_keys - len(failed_paths)
+        record_locale(locale, translated_keys, len(failed_paths), time.time() - start_time)
+        print(f"   📊 {translated_keys}/{total_keys} keys translated ({translated_keys / max(total_keys, 1):.0%})")
+        if failed_paths:
+            print(f"   ⚠️  {len(failed_paths)} keys failed and were left untranslated (re-run with --incremental to retry):")
+            for path in failed_paths[:10]:
+                print(f"      - {path}")
+        memory = get_memory()
+        print(f"   💾 Translation memory: {memory.hits} hits, {memory.misses} misses")
         
-        return {'success': True, 'locale': locale, 'duration': duration}
+        return {'success': True, 'locale': locale, 'duration': duration, 'keys': translated_keys, 'failed': failed_paths}
     except Exception as e:
         print(f"   ❌ Error: {str(e)}")
         return {'success': False, 'locale': locale, 'error': str(e)}
 
 def main():
+    incremental = '--incremental' in sys.argv[1:]
+    resume = '--resume' in sys.argv[1:]
+    concurrency = concurrency_from_args(sys.argv[1:])
+    metrics_from_args(sys.argv[1:])
+    profile_from_args(sys.argv[1:])
+    try:
+        backend = set_active_backend(backend_from_args(sys.argv[1:]))
+    except ValueError as e:
+        print(f'❌ Error: {str(e)}')
+        sys.exit(1)
+    
     print('🌍 COMPLETE TRANSLATION SYSTEM\n')
-    print('This will translate ALL marketing content for ALL 19 languages')
-    print('Total: 682 keys × 19 languages = 12,958 translations\n')
+    print(f'Backend: {backend.name}, concurrency: {concurrency} in-flight requests\n')
+    if incremental:
+        print('Mode: incremental (only keys changed since the last run)\n')
+    with open(MESSAGES_DIR / 'en.json', 'r', encoding='utf-8') as f:
+        marketing_keys = count_strings(json.load(f).get('marketing', {}))
+    print(f'This will translate ALL marketing content for ALL {len(LANGUAGES)} languages')
+    print(f'Total: {marketing_keys:,} keys × {len(LANGUAGES)} languages = {marketing_keys * len(LANGUAGES):,} translations\n')
     print('=' * 80 + '\n')
     
     results = []
     total_success = 0
     total_failed = 0
+    total_keys = 0
+    failed_keys = 0
     
-    for locale, config in LANGUAGES.items():
-        result = translate_language(locale, config)
-        results.append(result)
-        
+    # Locales run concurrently; the shared engine caps in-flight requests and
+    # the per-backend rate limiter paces them instead of fixed delays
+    with TranslationEngine(concurrency) as engine:
+        results = engine.map_locales(
+            lambda locale: translate_language(locale, LANGUAGES[locale], incremental=incremental, engine=engine, resume=resume),
+            LANGUAGES,
+        )
+    
+    for result in results:
         if result['success']:
             total_success += 1
+            total_keys += result['keys']
+            failed_keys += len(result['failed'])
         else:
             total_failed += 1
-        
-        # Delay between languages
-        time.sleep(2)
     
     # Final summary
     print('\n' + '=' * 80)
     print('\n📊 TRANSLATION COMPLETE\n')
-    print(f"Languages processed: {len(results)}/19")
+    print(f"Languages processed: {len(results)}/{len(LANGUAGES)}")
     print(f"✅ Successful: {total_success}")
     print(f"❌ Failed: {total_failed}")
-    print(f"\n📈 Total translations: {total_success * 682} keys")
+    print(f"\n📈 Total translations: {total_keys:,} keys")
+    print(f"⚠️  Untranslated keys: {failed_keys:,}")
     
-    if total_success == 19:
-        print('\n🎉 SUCCESS! All 19 languages are now 100% translated!')
-        print('   Total: 12,958 translations (682 keys × 19 languages)')
+    if total_success == len(LANGUAGES) and not failed_keys:
+        print(f'\n🎉 SUCCESS! All {len(LANGUAGES)} languages are now 100% translated!')
+        print(f'   Total: {total_keys:,} translations ({marketing_keys:,} keys × {len(LANGUAGES)} languages)')
         print('\n✅ Next steps:')
         print('   1. Run audit: node scripts/audit-marketing-i18n-complete.js')
         print('   2. Test language switcher on marketing pages')
         print('   3. Have native speakers proofread translations')
+    elif total_success == len(LANGUAGES):
+        print(f'\n⚠️  {failed_keys:,} keys failed and were left untranslated. Re-run with --incremental to retry them.')
     else:
         print('\n⚠️  Some languages failed. Check errors above.')
     
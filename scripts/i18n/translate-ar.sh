@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Arabic (ar)
-# Usage: ./scripts/translate-ar.sh
+# Usage: ./scripts/i18n/translate-ar.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=ar --namespaces=marketing
 
 echo "🌍 Translating Arabic (ar)..."
-python3 scripts/translate-language.py ar
+exec python3 scripts/i18n/translate.py --locales=ar --namespaces=marketing "$@"
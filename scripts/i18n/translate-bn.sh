@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Bengali (bn)
-# Usage: ./scripts/translate-bn.sh
+# Usage: ./scripts/i18n/translate-bn.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=bn --namespaces=marketing
 
 echo "🌍 Translating Bengali (bn)..."
-python3 scripts/translate-language.py bn
+exec python3 scripts/i18n/translate.py --locales=bn --namespaces=marketing "$@"
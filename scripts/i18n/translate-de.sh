@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to German (de)
-# Usage: ./scripts/translate-de.sh
+# Usage: ./scripts/i18n/translate-de.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=de --namespaces=marketing
 
 echo "🌍 Translating German (de)..."
-python3 scripts/translate-language.py de
+exec python3 scripts/i18n/translate.py --locales=de --namespaces=marketing "$@"
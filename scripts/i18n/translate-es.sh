@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Spanish (es)
-# Usage: ./scripts/translate-es.sh
+# Usage: ./scripts/i18n/translate-es.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=es --namespaces=marketing
 
 echo "🌍 Translating Spanish (es)..."
-python3 scripts/translate-language.py es
+exec python3 scripts/i18n/translate.py --locales=es --namespaces=marketing "$@"
@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to French (fr)
-# Usage: ./scripts/translate-fr.sh
+# Usage: ./scripts/i18n/translate-fr.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=fr --namespaces=marketing
 
 echo "🌍 Translating French (fr)..."
-python3 scripts/translate-language.py fr
+exec python3 scripts/i18n/translate.py --locales=fr --namespaces=marketing "$@"
@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Hindi (hi)
-# Usage: ./scripts/translate-hi.sh
+# Usage: ./scripts/i18n/translate-hi.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=hi --namespaces=marketing
 
 echo "🌍 Translating Hindi (hi)..."
-python3 scripts/translate-language.py hi
+exec python3 scripts/i18n/translate.py --locales=hi --namespaces=marketing "$@"
@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Indonesian (id)
-# Usage: ./scripts/translate-id.sh
+# Usage: ./scripts/i18n/translate-id.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=id --namespaces=marketing
 
 echo "🌍 Translating Indonesian (id)..."
-python3 scripts/translate-language.py id
+exec python3 scripts/i18n/translate.py --locales=id --namespaces=marketing "$@"
@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Japanese (ja)
-# Usage: ./scripts/translate-ja.sh
+# Usage: ./scripts/i18n/translate-ja.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=ja --namespaces=marketing
 
 echo "🌍 Translating Japanese (ja)..."
-python3 scripts/translate-language.py ja
+exec python3 scripts/i18n/translate.py --locales=ja --namespaces=marketing "$@"
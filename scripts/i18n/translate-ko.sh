@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Korean (ko)
-# Usage: ./scripts/translate-ko.sh
+# Usage: ./scripts/i18n/translate-ko.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=ko --namespaces=marketing
 
 echo "🌍 Translating Korean (ko)..."
-python3 scripts/translate-language.py ko
+exec python3 scripts/i18n/translate.py --locales=ko --namespaces=marketing "$@"
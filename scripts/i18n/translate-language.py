@@ -2,83 +2,88 @@
 """
 INDIVIDUAL LANGUAGE TRANSLATION SCRIPT
 Translate marketing content for a single language
-Usage: python3 scripts/translate-language.py <language_code>
+Usage: python3 scripts/translate-language.py <language_code> [--incremental] [--resume] [--concurrency=N] [--backend=NAME] [--metrics-dir=DIR] [--profile[=DIR]]
 Example: python3 scripts/translate-language.py es
 """
 
 import json
 import time
 import sys
-from pathlib import Path
-from deep_translator import GoogleTranslator
 
-# Language configurations
-LANGUAGES = {
-    'es': {'name': 'Spanish', 'code': 'es'},
-    'fr': {'name': 'French', 'code': 'fr'},
-    'zh': {'name': 'Chinese (Simplified)', 'code': 'zh-CN'},
-    'hi': {'name': 'Hindi', 'code': 'hi'},
-    'ar': {'name': 'Arabic', 'code': 'ar'},
-    'ko': {'name': 'Korean', 'code': 'ko'},
-    'vi': {'name': 'Vietnamese', 'code': 'vi'},
-    'pt': {'name': 'Portuguese', 'code': 'pt'},
-    'de': {'name': 'German', 'code': 'de'},
-    'ja': {'name': 'Japanese', 'code': 'ja'},
-    'ru': {'name': 'Russian', 'code': 'ru'},
-    'id': {'name': 'Indonesian', 'code': 'id'},
-    'ur': {'name': 'Urdu', 'code': 'ur'},
-    'bn': {'name': 'Bengali', 'code': 'bn'},
-    'ta': {'name': 'Tamil', 'code': 'ta'},
-    'te': {'name': 'Telugu', 'code': 'te'},
-    'mr': {'name': 'Marathi', 'code': 'mr'},
-    'tr': {'name': 'Turkish', 'code': 'tr'},
-    'sw': {'name': 'Swahili', 'code': 'sw'}
-}
+from translation import (
+    MESSAGES_DIR,
+    CheckpointJournal,
+    SourceManifest,
+    TranslationEngine,
+    backend_from_args,
+    collect_unique_strings,
+    concurrency_from_args,
+    count_strings,
+    get_languages,
+    get_memory,
+    metrics_from_args,
+    paths_for_sources,
+    plan_changes,
+    profile_from_args,
+    profile_phase,
+    record_locale,
+    set_active_backend,
+    source_hashes,
+    translate_incremental,
+    translate_unique,
+    write_locale_file,
+)
+from translation import backends
 
-MESSAGES_DIR = Path(__file__).parent.parent / 'src' / 'i18n' / 'messages'
+# Names and backend codes come from src/i18n/config.ts
+LANGUAGES = get_languages(['es', 'fr', 'zh', 'hi', 'ar', 'ko', 'vi', 'pt', 'de', 'ja', 'ru', 'id', 'ur', 'bn', 'ta', 'te', 'mr', 'tr', 'sw'])
 
 def translate_text(text, target_lang):
-    """Translate text to target language with retry logic"""
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            translator = GoogleTranslator(source='en', target=target_lang)
-            result = translator.translate(text)
-            time.sleep(0.1)  # Rate limiting
-            return result
-        except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(1)
-                continue
-            print(f"      ⚠️  Error: {str(e)[:50]}")
-            return text  # Return original on error
+    """Translate text to target language through the active backend (memory, retries, circuit breaker)"""
+    return backends.translate_text(text, target_lang)
 
-def translate_object(obj, target_lang, path='', progress_callback=None):
-    """Recursively translate all strings in an object"""
-    if isinstance(obj, dict):
-        result = {}
-        for key, value in obj.items():
-            current_path = f"{path}.{key}" if path else key
-            result[key] = translate_object(value, target_lang, current_path, progress_callback)
-        return result
-    elif isinstance(obj, str):
-        translated = translate_text(obj, target_lang)
-        if progress_callback:
-            progress_callback()
-        return translated
-    else:
-        return obj
+def translate_batch(texts, target_lang):
+    """Translate many short strings in one request; failed entries come back as None"""
+    return backends.translate_batch(texts, target_lang)
+
+def translate_object(
+    obj, target_lang, progress_callback=None, unique_strings=None, engine=None, failed=None, existing=None, journal=None
+):
+    """Translate all strings in an object, each unique source string only once"""
+    return translate_unique(
+        obj,
+        lambda text: translate_text(text, target_lang),
+        progress_callback=progress_callback,
+        unique_strings=unique_strings,
+        engine=engine,
+        batch_fn=lambda texts: translate_batch(texts, target_lang),
+        failed=failed,
+        existing=existing,
+        journal=journal,
+    )
 
 def main():
-    if len(sys.argv) < 2:
+    incremental = '--incremental' in sys.argv[1:]
+    resume = '--resume' in sys.argv[1:]
+    concurrency = concurrency_from_args(sys.argv[1:])
+    metrics_from_args(sys.argv[1:])
+    profile_from_args(sys.argv[1:])
+    try:
+        backend = set_active_backend(backend_from_args(sys.argv[1:]))
+    except ValueError as e:
+        print(f'❌ Error: {str(e)}')
+        sys.exit(1)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    
+    if not args:
         print('❌ Error: Language code required')
-        print('\nUsage: python3 scripts/translate-language.py <language_code>')
+        print('\nUsage: python3 scripts/translate-language.py <language_code> [--incremental] [--resume] [--concurrency=N] [--backend=NAME] [--metrics-dir=DIR] [--profile[=DIR]]')
         print('\nAvailable languages:')
         for code, info in LANGUAGES.items():
             print(f'  {code} - {info["name"]}')
         sys.exit(1)
     
-    locale = sys.argv[1]
+    locale = args[0]
     
     if locale not in LANGUAGES:
         print(f'❌ Error: Unknown language code: {locale}')
@@ -90,28 +95,45 @@ def main():
     config = LANGUAGES[locale]
     
     print(f'\n🌍 TRANSLATING {config["name"].upper()} ({locale})\n')
+    print(f'Backend: {backend.name}, concurrency: {concurrency} in-flight requests')
     print('=' * 80)
     
     start_time = time.time()
+    engine = TranslationEngine(concurrency)
     
     try:
         # Read English source
-        en_path = MESSAGES_DIR / 'en.json'
-        with open(en_path, 'r', encoding='utf-8') as f:
-            en_data = json.load(f)
-        en_marketing = en_data.get('marketing', {})
+        with profile_phase('load'):
+            en_path = MESSAGES_DIR / 'en.json'
+            with open(en_path, 'r', encoding='utf-8') as f:
+                en_data = json.load(f)
+            en_marketing = en_data.get('marketing', {})
         
-        # Count total keys
-        def count_keys(obj):
-            if isinstance(obj, dict):
-                return sum(count_keys(v) for v in obj.values())
-            elif isinstance(obj, str):
-                return 1
-            return 0
+            # Read existing locale file, its manifest and checkpoint
+            locale_path = MESSAGES_DIR / f'{locale}.json'
+            with open(locale_path, 'r', encoding='utf-8') as f:
+                locale_data = json.load(f)
+            manifest = SourceManifest(locale)
+            failed = set()
+            journal = CheckpointJournal(locale, 'marketing', resume=resume)
         
-        total_keys = count_keys(en_marketing)
-        print(f'\n📊 Total keys to translate: {total_keys}')
-        print(f'⏱️  Estimated time: {total_keys * 0.15 / 60:.1f} minutes\n')
+        # Count total keys and the unique strings actually sent for translation
+        with profile_phase('flatten'):
+            total_keys = count_strings(en_marketing)
+            if incremental:
+                changed = plan_changes(en_marketing, locale_data.get('marketing', {}), manifest.scoped('marketing'), 'marketing')
+                total_unique = len(set(changed.values()))
+                print(f'\n📊 Total keys: {total_keys} ({len(changed)} changed, {total_unique} unique strings to translate)')
+            else:
+                unique_strings = collect_unique_strings(en_marketing)
+                total_unique = len(unique_strings)
+                print(f'\n📊 Total keys to translate: {total_keys} ({total_unique} unique strings)')
+        print(f'⏱️  Estimated time: {total_unique * 0.15 / 60:.1f} minutes\n')
+        
+        resumed = len(journal.completed.keys() & (set(changed.values()) if incremental else set(unique_strings)))
+        if resumed:
+            print(f"   ♻️  Resuming: {resumed} strings already translated in a previous run")
+            total_unique -= resumed
         
         # Progress tracking
         translated_count = [0]
@@ -119,37 +141,73 @@ def main():
         
         def progress_callback():
             translated_count[0] += 1
-            percent = int((translated_count[0] / total_keys) * 100)
+            percent = int((translated_count[0] / max(total_unique, 1)) * 100)
             if percent > last_percent[0] and percent % 5 == 0:
                 elapsed = time.time() - start_time
-                remaining = (elapsed / translated_count[0]) * (total_keys - translated_count[0])
-                print(f'   {percent}% complete ({translated_count[0]}/{total_keys}) - {remaining/60:.1f} min remaining')
+                remaining = (elapsed / translated_count[0]) * (total_unique - translated_count[0])
+                print(f'   {percent}% complete ({translated_count[0]}/{total_unique}) - {remaining/60:.1f} min remaining')
                 last_percent[0] = percent
         
         print('🔄 Translating...\n')
         
         # Translate marketing section
-        translated_marketing = translate_object(en_marketing, config['code'], progress_callback=progress_callback)
-        
-        # Read existing locale file
-        locale_path = MESSAGES_DIR / f'{locale}.json'
-        with open(locale_path, 'r', encoding='utf-8') as f:
-            locale_data = json.load(f)
+        with profile_phase('translate'):
+            if incremental:
+                translated_marketing, stats = translate_incremental(
+                    en_marketing,
+                    locale_data.get('marketing', {}),
+                    manifest.scoped('marketing'),
+                    lambda text: translate_text(text, config['code']),
+                    batch_fn=lambda texts: translate_batch(texts, config['code']),
+                    progress_callback=progress_callback,
+                    prefix='marketing',
+                    changed=changed,
+                    engine=engine,
+                    failed=failed,
+                    journal=journal,
+                )
+                print(f"   🔁 Incremental: {stats['changed']} translated, {stats['kept']} kept, {stats['removed']} removed")
+            else:
+                translated_marketing = translate_object(
+                    en_marketing,
+                    config['code'],
+                    progress_callback=progress_callback,
+                    unique_strings=unique_strings,
+                    engine=engine,
+                    failed=failed,
+                    journal=journal,
+                    existing=locale_data.get('marketing', {}),
+                )
         
         # Update marketing section
         locale_data['marketing'] = translated_marketing
         
         # Write back to file
-        with open(locale_path, 'w', encoding='utf-8') as f:
-            json.dump(locale_data, f, ensure_ascii=False, indent=2)
-            f.write('\n')
+        # Atomic (temp file + rename) and skipped when unchanged; also refreshes the
+        # per-namespace shards for the sharded loader in src/i18n/request.ts
+        with profile_phase('write'):
+            write_locale_file(locale, locale_data, MESSAGES_DIR)
+        
+            # Record which source each marketing key was translated from; failed keys get no hash
+            manifest.replace_scope('marketing', source_hashes(en_marketing, 'marketing', exclude=failed))
+            manifest.save()
+        journal.discard()
+        failed_paths = paths_for_sources(en_marketing, failed, 'marketing')
         
         duration = time.time() - start_time
         
         print('\n' + '=' * 80)
         print(f'\n✅ {config["name"]} translation COMPLETE!')
-        print(f'   📊 {total_keys}/{total_keys} keys translated (100%)')
+        translated_keys = total_keys - len(failed_paths)
+        record_locale(locale, translated_keys, len(failed_paths), time.time() - start_time)
+        print(f'   📊 {translated_keys}/{total_keys} keys translated ({translated_keys / max(total_keys, 1):.0%})')
+        if failed_paths:
+            print(f'   ⚠️  {len(failed_paths)} keys failed and were left untranslated (re-run with --incremental to retry):')
+            for path in failed_paths[:10]:
+                print(f'      - {path}')
         print(f'   ⏱️  Time: {duration/60:.1f} minutes')
+        memory = get_memory()
+        print(f'   💾 Translation memory: {memory.hits} hits, {memory.misses} misses')
         print(f'   📁 File: src/i18n/messages/{locale}.json')
         print('\n💡 Next steps:')
         print('   1. Run audit: node scripts/audit-marketing-i18n-complete.js')
@@ -159,6 +217,8 @@ def main():
     except Exception as e:
         print(f'\n❌ Error: {str(e)}')
         sys.exit(1)
+    finally:
+        engine.shutdown()
 
 if __name__ == '__main__':
     main()
@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Marathi (mr)
-# Usage: ./scripts/translate-mr.sh
+# Usage: ./scripts/i18n/translate-mr.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=mr --namespaces=marketing
 
 echo "🌍 Translating Marathi (mr)..."
-python3 scripts/translate-language.py mr
+exec python3 scripts/i18n/translate.py --locales=mr --namespaces=marketing "$@"
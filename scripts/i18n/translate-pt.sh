@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Portuguese (pt)
-# Usage: ./scripts/translate-pt.sh
+# Usage: ./scripts/i18n/translate-pt.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=pt --namespaces=marketing
 
 echo "🌍 Translating Portuguese (pt)..."
-python3 scripts/translate-language.py pt
+exec python3 scripts/i18n/translate.py --locales=pt --namespaces=marketing "$@"
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+DISTRIBUTED TRANSLATION QUEUE
+Splits a refresh into (locale, string range) tasks in a durable SQLite queue
+(scripts/i18n/.translation-cache/queue.sqlite3, or TRANSLATION_QUEUE_PATH) so
+several worker processes - on this machine or, with --shared, on hosts sharing
+the file over NFS/SMB, each with its own backend and API credentials -
+translate in parallel. Workers
+lease one task at a time and heartbeat while translating; tasks of a killed
+worker are picked up again once their lease expires. `merge` rebuilds the
+locale files from the stored results in en.json order, so the output does not
+depend on which worker finished what, or when.
+
+Usage:
+  python3 scripts/i18n/translate-queue.py [--shared] submit --locales=it,pl,nl [--namespaces=marketing] [--incremental] [--chunk=200]
+  python3 scripts/i18n/translate-queue.py work [--run=ID] [--backend=NAME] [--concurrency=N] [--slots=4] [--lease=120]
+  python3 scripts/i18n/translate-queue.py status [--run=ID]
+  python3 scripts/i18n/translate-queue.py merge [--run=ID] [--locales=it,pl] [--partial]
+  python3 scripts/i18n/translate-queue.py retry-failed [--run=ID]
+
+Without --run the most recent run is used. Start `work` in as many terminals
+or hosts as you like, then `merge` once `status` shows every task done.
+"""
+
+import argparse
+import sys
+import time
+
+from translate import SharedSource, read_locale, split_codes
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Translate through a durable multi-worker task queue')
+    parser.add_argument('--queue', help='Queue file (default: TRANSLATION_QUEUE_PATH or .translation-cache/queue.sqlite3)')
+    parser.add_argument('--shared', action='store_true', default=None,
+                        help='The queue file is shared by several hosts over a network filesystem: use a rollback '
+                        'journal instead of WAL (default: TRANSLATION_QUEUE_SHARED)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit = commands.add_parser('submit', help='Queue a new run')
+    targets = submit.add_mutually_exclusive_group(required=True)
+    targets.add_argument('--locales', help='Comma-separated locale codes')
+    targets.add_argument('--all', action='store_true', help='Every locale in src/i18n/config.ts except en')
+    submit.add_argument('--namespaces', help='Comma-separated top-level namespaces (default: the whole file)')
+    submit.add_argument('--incremental', action='store_true', help='Only queue keys changed since the last run')
+    submit.add_argument('--chunk', type=int, default=200, help='Strings per task (default: 200)')
+    submit.add_argument('--no-priority', action='store_true', help='Queue strings in en.json order')
+
+    work = commands.add_parser('work', help='Lease and translate tasks until the run is drained')
+    work.add_argument('--run', help='Run id (default: latest)')
+    work.add_argument('--backend', help='google, deepl, libre or fake (default: TRANSLATION_BACKEND or google)')
+    work.add_argument('--failover', help='Backends to use once this one runs out of character budget')
+    work.add_argument('--concurrency', type=int, help='In-flight requests (default: TRANSLATION_CONCURRENCY or 8)')
+    work.add_argument('--slots', type=int, default=4, help='Tasks leased at once by this worker (default: 4)')
+    work.add_argument('--lease', type=float, default=120.0, help='Lease seconds, renewed every third (default: 120)')
+    work.add_argument('--metrics-dir', help='Write events.jsonl and a Prometheus textfile here')
+
+    status = commands.add_parser('status', help='Show task progress per locale')
+    status.add_argument('--run', help='Run id (default: latest)')
+
+    merge = commands.add_parser('merge', help='Write finished locales from the queued results')
+    merge.add_argument('--run', help='Run id (default: latest)')
+    merge.add_argument('--locales', help='Only these locales')
+    merge.add_argument('--partial', action='store_true', help='Also write locales with unfinished tasks')
+
+    retry = commands.add_parser('retry-failed', help='Re-queue finished tasks that had failed strings')
+    retry.add_argument('--run', help='Run id (default: latest)')
+    return parser.parse_args(argv)
+
+
+def resolve_run(queue, run):
+    run = run or queue.latest_run()
+    if run is None or queue.run_info(run) is None:
+        print(f"❌ Error: {'no runs queued' if run is None else f'unknown run {run}'}")
+        sys.exit(1)
+    return run
+
+
+def submit(queue, options):
+    import json
+
+    from translation import EN_MESSAGES_PATH, SourceManifest, get_languages, load_usage_index, plan_changes
+
+    try:
+        languages = get_languages(None if options.all else split_codes(options.locales))
+    except ValueError as e:
+        print(f'❌ Error: {str(e)}')
+        sys.exit(1)
+    languages.pop('en', None)
+    with open(EN_MESSAGES_PATH, 'r', encoding='utf-8') as f:
+        en_data = json.load(f)
+    namespaces = split_codes(options.namespaces)
+    unknown = [namespace for namespace in namespaces if namespace not in en_data]
+    if unknown:
+        print(f"❌ Error: Unknown namespace(s) in en.json: {', '.join(unknown)}")
+        sys.exit(1)
+    source = SharedSource(en_data, namespaces, None if options.no_priority else load_usage_index())
+
+    jobs = {}
+    changes = {}
+    for locale, config in languages.items():
+        if options.incremental:
+            current = source.locale_part(read_locale(locale))
+            changed = plan_changes(source.tree, current, source.scoped_hashes(SourceManifest(locale)))
+            # merge rewrites only these keys; the rest keep their current translation
+            changes[locale] = list(changed)
+            pending = list(dict.fromkeys(changed.values()))
+        else:
+            pending = source.unique_strings
+        tiers = source.plan_tiers(pending)
+        # Most-used strings land in the first tasks, so they are done first
+        jobs[locale] = (config['code'], [text for tier in tiers for text in tier] if tiers else pending)
+
+    run = queue.submit(
+        source.journal_scope,
+        source.tree,
+        jobs,
+        options={'namespaces': namespaces, 'incremental': options.incremental, 'changed': changes},
+        chunk=max(1, options.chunk),
+    )
+    tasks = sum(-(-len(strings) // max(1, options.chunk)) for _, strings in jobs.values())
+    print(f"📥 Queued run {run}: {len(jobs)} locales, {sum(len(s) for _, s in jobs.values()):,} strings in {tasks} tasks")
+    print(f"   Start workers with: python3 scripts/i18n/translate-queue.py work --run={run}")
+
+
+def work(queue, options):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from translation import (
+        Heartbeat,
+        TranslationEngine,
+        backend_from_args,
+        concurrency_from_args,
+        failover_from_args,
+        metrics_from_args,
+        set_active_backend,
+        translate_strings,
+        worker_name,
+    )
+    from translation import backends
+
+    run = resolve_run(queue, options.run)
+    try:
+        backend = set_active_backend(backend_from_args([f'--backend={options.backend}'] if options.backend else []))
+    except ValueError as e:
+        print(f'❌ Error: {str(e)}')
+        sys.exit(1)
+    failover_from_args([f'--failover={options.failover}'] if options.failover else [])
+    concurrency = options.concurrency or concurrency_from_args([])
+    metrics_from_args([f'--metrics-dir={options.metrics_dir}'] if options.metrics_dir else [])
+    worker = worker_name()
+    done = [0, 0]
+
+    print(f"🛠️  Worker {worker} on run {run}: backend {backend.name}, {options.slots} slots, {concurrency} in-flight requests")
+
+    def run_slot(slot):
+        name = f'{worker}/{slot}'
+        while True:
+            task = queue.claim(run, name, options.lease)
+            if task is None:
+                if queue.is_drained(run):
+                    return
+                # Other workers hold the rest; wait in case one of their leases expires
+                time.sleep(min(options.lease / 4, 5.0))
+                continue
+            try:
+                failed = set()
+                with Heartbeat(queue, task, name, options.lease) as heartbeat:
+                    translations = translate_strings(
+                        task.strings,
+                        lambda text: backends.translate_text(text, task.target, backend),
+                        engine=engine,
+                        batch_fn=lambda texts: backends.translate_batch(texts, task.target, backend),
+                        failed=failed,
+                    )
+            except BaseException:
+                queue.release(task, name)
+                raise
+            if heartbeat.lost or not queue.complete(task, name, translations):
+                print(f"   ⚠️  {task.locale} [{task.start}:{task.end}]: lease lost, results dropped")
+                continue
+            done[0] += 1
+            done[1] += len(task.strings)
+            print(f"   ✅ {task.locale} [{task.start}:{task.end}] "
+                  f"({len(translations)}/{len(task.strings)} strings, attempt {task.attempts})"
+                  + (f", {len(failed)} failed" if failed else ''))
+
+    start_time = time.time()
+    with TranslationEngine(concurrency) as engine:
+        with ThreadPoolExecutor(max_workers=max(1, options.slots), thread_name_prefix='slot') as slots:
+            for future in [slots.submit(run_slot, slot) for slot in range(max(1, options.slots))]:
+                future.result()
+    print(f"\n🏁 Run {run} drained: this worker finished {done[0]} tasks ({done[1]:,} strings) "
+          f"in {time.time() - start_time:.1f}s")
+
+
+def show_status(queue, options):
+    run = resolve_run(queue, options.run)
+    report = queue.status(run)
+    print(f'📋 Run {run}\n')
+    print(f"   {'locale':<7} {'done':>6} {'leased':>7} {'pending':>8} {'strings':>8} {'failed':>7}")
+    for locale, entry in report.items():
+        tasks = entry['done'] + entry['leased'] + entry['pending']
+        print(f"   {locale:<7} {entry['done']:>3}/{tasks:<3} {entry['leased']:>6} {entry['pending']:>8} "
+              f"{entry['strings']:>8,} {entry['failed_strings']:>7}")
+    print('\n✅ All tasks done - run `merge`' if queue.is_drained(run) else '\n⏳ Tasks remaining')
+
+
+def merge(queue, options):
+    from translation import (
+        MESSAGES_DIR,
+        SourceManifest,
+        apply_translations,
+        merge_changes,
+        paths_for_sources,
+        write_locales,
+    )
+
+    run = resolve_run(queue, options.run)
+    _, run_options, tree = queue.run_info(run)
+    namespaces = run_options.get('namespaces') or []
+    source = SharedSource(tree, namespaces)
+    report = queue.status(run)
+    locales = split_codes(options.locales) or queue.locales(run)
+
+    print(f'🧩 Merging run {run} ({len(locales)} locales)\n')
+    outputs = {}
+    failed_paths = {}
+    for locale in locales:
+        entry = report.get(locale)
+        if entry is None:
+            print(f'   ❌ {locale}: not part of this run')
+            continue
+        if entry['pending'] + entry['leased'] and not options.partial:
+            print(f"   ⏳ {locale}: {entry['pending'] + entry['leased']} tasks unfinished (use --partial to write anyway)")
+            continue
+        translations = queue.results(run, locale)
+        missing = set(queue.strings(run, locale)) - translations.keys()
+        locale_data = read_locale(locale)
+        current = source.locale_part(locale_data)
+        if run_options.get('incremental'):
+            changed = dict.fromkeys(run_options.get('changed', {}).get(locale, ()))
+            translated = merge_changes(source.tree, current, changed, translations)
+        else:
+            translated = apply_translations(source.tree, translations, existing=current)
+        outputs[locale] = source.merge_into(locale_data, translated)
+        failed_paths[locale] = paths_for_sources(source.tree, missing)
+
+    # Every locale file is written in parallel, each atomically
+    written = write_locales(outputs, MESSAGES_DIR)
+    for locale in outputs:
+        # Keys without a result (failed or unfinished) get no manifest hash, so --incremental retries them
+        manifest = SourceManifest(locale)
+        source.record_hashes(manifest, failed_paths[locale])
+        manifest.save()
+        print(f"   ✅ {locale}: {source.total_keys - len(failed_paths[locale]):,}/{source.total_keys:,} keys"
+              + (f" ({len(failed_paths[locale])} untranslated)" if failed_paths[locale] else '')
+              + ('' if written[locale]['written'] else ', file unchanged'))
+
+
+def retry_failed(queue, options):
+    run = resolve_run(queue, options.run)
+    print(f'🔁 Re-queued {queue.retry_failed(run)} tasks with failed strings in run {run}')
+
+
+def main():
+    options = parse_args(sys.argv[1:])
+
+    from translation import JobQueue
+
+    queue = JobQueue(options.queue, shared=options.shared)
+    commands = {
+        'submit': submit,
+        'work': work,
+        'status': show_status,
+        'merge': merge,
+        'retry-failed': retry_failed,
+    }
+    commands[options.command](queue, options)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Russian (ru)
-# Usage: ./scripts/translate-ru.sh
+# Usage: ./scripts/i18n/translate-ru.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=ru --namespaces=marketing
 
 echo "🌍 Translating Russian (ru)..."
-python3 scripts/translate-language.py ru
+exec python3 scripts/i18n/translate.py --locales=ru --namespaces=marketing "$@"
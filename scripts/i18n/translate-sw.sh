@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Swahili (sw)
-# Usage: ./scripts/translate-sw.sh
+# Usage: ./scripts/i18n/translate-sw.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=sw --namespaces=marketing
 
 echo "🌍 Translating Swahili (sw)..."
-python3 scripts/translate-language.py sw
+exec python3 scripts/i18n/translate.py --locales=sw --namespaces=marketing "$@"
@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Tamil (ta)
-# Usage: ./scripts/translate-ta.sh
+# Usage: ./scripts/i18n/translate-ta.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=ta --namespaces=marketing
 
 echo "🌍 Translating Tamil (ta)..."
-python3 scripts/translate-language.py ta
+exec python3 scripts/i18n/translate.py --locales=ta --namespaces=marketing "$@"
@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Telugu (te)
-# Usage: ./scripts/translate-te.sh
+# Usage: ./scripts/i18n/translate-te.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=te --namespaces=marketing
 
 echo "🌍 Translating Telugu (te)..."
-python3 scripts/translate-language.py te
+exec python3 scripts/i18n/translate.py --locales=te --namespaces=marketing "$@"
@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Turkish (tr)
-# Usage: ./scripts/translate-tr.sh
+# Usage: ./scripts/i18n/translate-tr.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=tr --namespaces=marketing
 
 echo "🌍 Translating Turkish (tr)..."
-python3 scripts/translate-language.py tr
+exec python3 scripts/i18n/translate.py --locales=tr --namespaces=marketing "$@"
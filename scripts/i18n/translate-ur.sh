@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Urdu (ur)
-# Usage: ./scripts/translate-ur.sh
+# Usage: ./scripts/i18n/translate-ur.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=ur --namespaces=marketing
 
 echo "🌍 Translating Urdu (ur)..."
-python3 scripts/translate-language.py ur
+exec python3 scripts/i18n/translate.py --locales=ur --namespaces=marketing "$@"
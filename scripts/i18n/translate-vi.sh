@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Vietnamese (vi)
-# Usage: ./scripts/translate-vi.sh
+# Usage: ./scripts/i18n/translate-vi.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=vi --namespaces=marketing
 
 echo "🌍 Translating Vietnamese (vi)..."
-python3 scripts/translate-language.py vi
+exec python3 scripts/i18n/translate.py --locales=vi --namespaces=marketing "$@"
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+WATCH-MODE TRANSLATION
+Long-running companion to `npm run dev`: keeps every configured locale in
+step with src/i18n/messages/en.json while you edit it. On start-up each
+locale is brought up to date like an --incremental run; after that the
+process keeps the flattened source, the locale trees, their manifests and
+the translation memory in RAM, and every save of en.json translates only the
+keys that changed in it - for all locales at once - and rewrites the locale
+files atomically. Keys that failed are retried on the next save.
+
+Usage:
+  python3 scripts/i18n/translate-watch.py [--locales=es,fr] [--backend=NAME] [--failover=deepl]
+      [--concurrency=N] [--interval=0.5] [--polling] [--metrics-dir=DIR]
+
+Without --locales every locale in src/i18n/config.ts is watched. Stop with Ctrl+C.
+"""
+
+import argparse
+import sys
+import time
+
+from translate import read_locale, split_codes, write_locale
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Translate changed en.json keys into every locale on each save')
+    parser.add_argument('--locales', help='Comma-separated locale codes (default: every locale in src/i18n/config.ts)')
+    parser.add_argument('--backend', help='google, deepl, libre or fake (default: TRANSLATION_BACKEND or google)')
+    parser.add_argument('--failover', help='Backends to use once this one runs out of character budget')
+    parser.add_argument('--concurrency', type=int, help='In-flight requests (default: TRANSLATION_CONCURRENCY or 8)')
+    parser.add_argument('--interval', type=float, default=0.5, help='Polling interval in seconds (default: 0.5)')
+    parser.add_argument('--polling', action='store_true', help='Poll en.json even where inotify is available')
+    parser.add_argument('--metrics-dir', help='Write events.jsonl and a Prometheus textfile here')
+    return parser.parse_args(argv)
+
+
+class WatchSession:
+    """The warm state kept between saves: source strings and hashes, locale trees and manifests"""
+
+    def __init__(self, languages, engine, backend):
+        self.languages = languages
+        self.engine = engine
+        self.backend = backend
+        self.tree = None
+        self.strings = {}
+        self.hashes = {}
+        self.locales = {}
+        self.manifests = {}
+        # Keys a locale could not translate yet; they ride along with the next save
+        self.pending = {locale: {} for locale in languages}
+
+    def load_source(self):
+        """Parse en.json; None while it is not valid JSON (e.g. caught mid-save)"""
+        import json
+
+        from translation import EN_MESSAGES_PATH
+
+        try:
+            with open(EN_MESSAGES_PATH, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except ValueError as e:
+            print(f"⚠️  en.json is not valid JSON ({e}); waiting for the next save")
+            return None
+
+    def start(self, tree):
+        """Bring every locale up to date with tree, as --incremental would"""
+        from translation import SourceManifest, hash_source, iter_strings, plan_changes
+
+        self.tree = tree
+        self.strings = dict(iter_strings(tree))
+        self.hashes = {path: hash_source(text) for path, text in self.strings.items()}
+        changes = {}
+        for locale in self.languages:
+            self.locales[locale] = read_locale(locale)
+            self.manifests[locale] = SourceManifest(locale)
+            changes[locale] = plan_changes(tree, self.locales[locale], self.manifests[locale].scoped())
+        return self.sync(changes)
+
+    def update(self, tree):
+        """Apply a new en.json; returns (changed keys, removed keys, per-locale results)"""
+        from translation import hash_source, iter_strings
+
+        strings = dict(iter_strings(tree))
+        changed = {path: text for path, text in strings.items() if self.strings.get(path) != text}
+        removed = self.strings.keys() - strings.keys()
+        if not changed and not removed and tree == self.tree:
+            return changed, removed, []
+        for path in removed:
+            self.hashes.pop(path, None)
+        for path, text in changed.items():
+            self.hashes[path] = hash_source(text)
+        self.tree = tree
+        self.strings = strings
+
+        changes = {}
+        for locale in self.languages:
+            retry = {path: strings[path] for path in self.pending[locale] if path in strings}
+            changes[locale] = {**retry, **changed}
+        return changed, removed, self.sync(changes)
+
+    def sync(self, changes):
+        """Translate each locale's changed keys concurrently and write the locales that moved"""
+        return self.engine.map_locales(lambda locale: self.sync_locale(locale, changes[locale]), list(self.languages))
+
+    def sync_locale(self, locale, changed):
+        from translation import translate_incremental
+        from translation import backends
+
+        start_time = time.time()
+        target = self.languages[locale]['code']
+        failed = set()
+        try:
+            translated, _ = translate_incremental(
+                self.tree,
+                self.locales[locale],
+                {},
+                lambda text: backends.translate_text(text, target, self.backend),
+                changed=changed,
+                engine=self.engine,
+                batch_fn=lambda texts: backends.translate_batch(texts, target, self.backend),
+                failed=failed,
+            )
+            written = write_locale(locale, translated)
+        except Exception as e:
+            print(f"   ❌ {locale}: {str(e)}")
+            return {'locale': locale, 'success': False, 'error': str(e)}
+
+        self.locales[locale] = translated
+        self.pending[locale] = {path: text for path, text in changed.items() if text in failed}
+        manifest = self.manifests[locale]
+        # Failed keys get no hash, so a restart with --incremental retries them as well
+        manifest.replace_scope('', {path: h for path, h in self.hashes.items() if path not in self.pending[locale]})
+        manifest.save()
+        return {
+            'locale': locale,
+            'success': True,
+            'translated': len(changed) - len(self.pending[locale]),
+            'failed': len(self.pending[locale]),
+            'written': written,
+            'duration': time.time() - start_time,
+        }
+
+
+def report(results, elapsed):
+    written = [result['locale'] for result in results if result['success'] and result['written']]
+    failed = [result for result in results if result['success'] and result['failed']]
+    errors = [result for result in results if not result['success']]
+    translated = sum(result['translated'] for result in results if result['success'])
+    print(f"   ✅ {translated:,} key translations across {len(results)} locales in {elapsed:.1f}s"
+          + (f", rewrote {len(written)} files" if written else ', no files changed'))
+    for result in failed:
+        print(f"   ⚠️  {result['locale']}: {result['failed']} keys failed, retried on the next save")
+    for result in errors:
+        print(f"   ❌ {result['locale']}: {result['error']}")
+
+
+def main():
+    options = parse_args(sys.argv[1:])
+
+    from translation import (
+        EN_MESSAGES_PATH,
+        SourceWatcher,
+        TranslationEngine,
+        WarmMemory,
+        backend_from_args,
+        concurrency_from_args,
+        failover_from_args,
+        get_languages,
+        get_memory,
+        metrics_from_args,
+        set_active_backend,
+        set_memory,
+    )
+
+    try:
+        languages = get_languages(split_codes(options.locales) or None)
+        backend = set_active_backend(backend_from_args([f'--backend={options.backend}'] if options.backend else []))
+    except ValueError as e:
+        print(f'❌ Error: {str(e)}')
+        sys.exit(1)
+    languages.pop('en', None)
+    failover_from_args([f'--failover={options.failover}'] if options.failover else [])
+    concurrency = options.concurrency or concurrency_from_args([])
+    metrics_from_args([f'--metrics-dir={options.metrics_dir}'] if options.metrics_dir else [])
+    memory = set_memory(WarmMemory(get_memory()))
+
+    with TranslationEngine(concurrency) as engine, \
+            SourceWatcher(EN_MESSAGES_PATH, interval=options.interval, polling=options.polling) as watcher:
+        session = WatchSession(languages, engine, backend)
+        tree = session.load_source()
+        if tree is None:
+            sys.exit(1)
+
+        print(f"\n👀 WATCHING {EN_MESSAGES_PATH} ({watcher.mode}) for {len(languages)} locales: {', '.join(languages)}")
+        print(f"Backend: {backend.name}, concurrency: {concurrency} in-flight requests")
+        print('=' * 80 + '\n')
+        print('🔄 Catching up with en.json...')
+        start_time = time.time()
+        report(session.start(tree), time.time() - start_time)
+
+        try:
+            while True:
+                if not watcher.wait():
+                    continue
+                start_time = time.time()
+                tree = session.load_source()
+                if tree is None:
+                    continue
+                changed, removed, results = session.update(tree)
+                if not results:
+                    continue
+                print(f"\n✏️  {time.strftime('%H:%M:%S')} en.json saved: {len(changed)} keys changed"
+                      + (f", {len(removed)} removed" if removed else ''))
+                report(results, time.time() - start_time)
+                memory.flush()
+        except KeyboardInterrupt:
+            print(f"\n👋 Stopped watching ({memory.hits} memory hits, {memory.misses} misses)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 #!/bin/bash
 # Translate marketing content to Chinese (zh)
-# Usage: ./scripts/translate-zh.sh
+# Usage: ./scripts/i18n/translate-zh.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=zh --namespaces=marketing
 
 echo "🌍 Translating Chinese (zh)..."
-python3 scripts/translate-language.py zh
+exec python3 scripts/i18n/translate.py --locales=zh --namespaces=marketing "$@"
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+UNIFIED TRANSLATION CLI
+One entry point for every locale in src/i18n/config.ts. en.json is parsed and
+flattened once and shared by every target locale in a single process; locales
+run concurrently through one engine, memory and rate limiter.
+
+Usage:
+  python3 scripts/i18n/translate.py --locales=es,fr [--namespaces=marketing,common] [--sources=app,marketing]
+  python3 scripts/i18n/translate.py --all [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+      [--metrics-dir=DIR] [--no-priority] [--failover=deepl,libre] [--profile[=DIR]]
+  python3 scripts/i18n/translate.py --list
+
+Without --namespaces the whole file is translated. Strings are sent in order
+of how often src/ uses their keys, and the locale file is rewritten after each
+priority tier, so the most visible keys land first (--no-priority: file order).
+Before any request the characters each locale will send are estimated and
+checked against each backend's remaining daily budget (see translation/quota.py).
+Locales go to the first backend in [--backend, *--failover] that can cover
+them; locales nothing can cover are deferred to a later run.
+With --sources=app,marketing the marketing site's own en.json
+(src/marketing/i18n/messages) is translated in the same run: strings shared
+by the trees are translated once, and each tree's locale files are written in
+its own layout (see translation/sources.py).
+
+The translation package is
+only imported after argument parsing, and backend clients (deep_translator,
+requests) only on the first request, so --help and --list return immediately.
+"""
+
+import argparse
+import sys
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description='Translate src/i18n/messages/en.json into any set of locales from src/i18n/config.ts'
+    )
+    targets = parser.add_mutually_exclusive_group(required=True)
+    targets.add_argument('--locales', help='Comma-separated locale codes, e.g. es,fr,zh')
+    targets.add_argument('--all', action='store_true', help='Every locale in src/i18n/config.ts except en')
+    targets.add_argument('--list', action='store_true', help='List available locales and exit')
+    parser.add_argument('--namespaces', help='Comma-separated top-level namespaces (default: the whole file)')
+    parser.add_argument('--sources', help='Comma-separated source trees: app, marketing (default: app)')
+    parser.add_argument('--incremental', action='store_true', help='Only translate keys changed since the last run')
+    parser.add_argument('--resume', action='store_true', help='Continue from the checkpoint of an interrupted run')
+    parser.add_argument('--concurrency', type=int, help='In-flight requests (default: TRANSLATION_CONCURRENCY or 8)')
+    parser.add_argument('--backend', help='google, deepl, libre or fake (default: TRANSLATION_BACKEND or google)')
+    parser.add_argument('--failover', help='Comma-separated backends to use once the main one runs out of '
+                        'character budget (default: TRANSLATION_FAILOVER)')
+    parser.add_argument('--no-priority', action='store_true',
+                        help='Translate in en.json order with one write at the end instead of most-used keys first')
+    parser.add_argument('--metrics-dir', help='Write events.jsonl and a Prometheus textfile here (default: TRANSLATION_METRICS_DIR)')
+    parser.add_argument('--profile', nargs='?', const='', metavar='DIR',
+                        help='Sample stacks, CPU vs wait and memory per phase into DIR '
+                        '(default: .translation-cache/profiles/<time>)')
+    return parser.parse_args(argv)
+
+
+def split_codes(value):
+    return [code.strip() for code in value.split(',') if code.strip()] if value else []
+
+
+def list_locales():
+    from translation.locales import SOURCE_LOCALE, read_locales
+
+    for code, info in read_locales().items():
+        marker = ' (source)' if code == SOURCE_LOCALE else ''
+        print(f"  {code:<4} {info['name']}{marker}")
+
+
+class SharedSource:
+    """An en.json tree (default: the app's) parsed and flattened once, scoped to the requested namespaces"""
+
+    def __init__(self, en_data, namespaces, usage=None, origin=None):
+        from translation import collect_unique_strings, count_strings, get_source_trees, prioritize_strings, source_hashes
+
+        self.origin = origin or get_source_trees()[0]
+        self.namespaces = namespaces
+        if namespaces:
+            self.tree = {namespace: en_data[namespace] for namespace in namespaces}
+        else:
+            self.tree = en_data
+        self.total_keys = count_strings(self.tree)
+        self.hashes = source_hashes(self.tree)
+        self.unique_strings = collect_unique_strings(self.tree)
+        self.journal_scope = ','.join(namespaces) if namespaces else ''
+        self.usage = usage
+        # Full runs share one plan; incremental runs plan each locale's pending strings
+        self.full_tiers = prioritize_strings(self.tree, self.unique_strings, usage) if usage else None
+
+    def plan_tiers(self, pending):
+        """Priority tiers for the strings a locale still needs, or None without a usage index"""
+        from translation import prioritize_strings
+
+        if self.usage is None:
+            return None
+        if pending is self.unique_strings:
+            return self.full_tiers
+        return prioritize_strings(self.tree, pending, self.usage)
+
+    def locale_part(self, locale_data):
+        """The slice of a locale tree this run rewrites"""
+        if not self.namespaces:
+            return locale_data
+        return {namespace: locale_data[namespace] for namespace in self.namespaces if namespace in locale_data}
+
+    def scoped_hashes(self, manifest):
+        if not self.namespaces or not manifest.recorded:
+            return manifest.scoped()
+        hashes = {}
+        for namespace in self.namespaces:
+            hashes.update(manifest.scoped(namespace))
+        return hashes
+
+    def record_hashes(self, manifest, failed_paths):
+        """Replace the manifest hashes of the translated scope; failed keys get none"""
+        failed_paths = set(failed_paths)
+        hashes = {path: h for path, h in self.hashes.items() if path not in failed_paths}
+        if not self.namespaces:
+            manifest.replace_scope('', hashes)
+            return
+        for namespace in self.namespaces:
+            start = namespace + '.'
+            manifest.replace_scope(namespace, {path: h for path, h in hashes.items() if path.startswith(start)})
+
+    def merge_into(self, locale_data, translated):
+        """A copy of locale_data with the translated scope replaced"""
+        if not self.namespaces:
+            return translated
+        data = dict(locale_data)
+        for namespace in self.namespaces:
+            if namespace in translated:
+                data[namespace] = translated[namespace]
+            else:
+                data.pop(namespace, None)
+        return data
+
+
+def read_locale(locale):
+    """The app tree's current <locale>.json, or {}"""
+    from translation import get_source_trees
+
+    return get_source_trees()[0].read_locale(locale)
+
+
+def write_locale(locale, data):
+    """Atomically write an app locale file and its namespace shards; skipped when nothing changed"""
+    from translation import get_source_trees
+
+    return get_source_trees()[0].write_locale(locale, data)
+
+
+def load_sources(names, namespaces, usage=None):
+    """A SharedSource per requested tree, each scoped to the requested namespaces it has"""
+    from translation import get_source_trees, profile_phase
+
+    sources = []
+    unknown = set(namespaces)
+    for tree in get_source_trees(names):
+        with profile_phase('load'):
+            en_data = tree.load_source()
+        scoped = [namespace for namespace in namespaces if namespace in en_data]
+        unknown -= set(scoped)
+        if namespaces and not scoped:
+            continue
+        with profile_phase('flatten'):
+            sources.append(SharedSource(en_data, scoped, usage, tree))
+    if unknown:
+        raise ValueError(f"Unknown namespace(s) in en.json: {', '.join(sorted(unknown))}")
+    return sources
+
+
+def union_strings(sources):
+    """Unique strings of every source, shared phrases once"""
+    if len(sources) == 1:
+        return sources[0].unique_strings
+    return list(dict.fromkeys(text for source in sources for text in source.unique_strings))
+
+
+def journal_scope(sources):
+    if len(sources) == 1 and sources[0].origin.name == 'app':
+        return sources[0].journal_scope
+    return '+'.join(f"{source.origin.name}-{source.journal_scope or 'all'}" for source in sources)
+
+
+def plan_tiers(sources, pending):
+    """Priority tiers across every source, or None without a usage index"""
+    from translation import prioritize_strings
+
+    if len(sources) == 1:
+        return sources[0].plan_tiers(pending)
+    if sources[0].usage is None:
+        return None
+    return prioritize_strings([source.tree for source in sources], pending, sources[0].usage)
+
+
+def plan_locale_changes(locale, source):
+    """(locale tree, manifest, scoped current tree, {changed path: source}) of one source tree"""
+    from translation import plan_changes, profile_phase
+
+    with profile_phase('load'):
+        locale_data = source.origin.read_locale(locale)
+        manifest = source.origin.manifest(locale)
+    with profile_phase('flatten'):
+        current = source.locale_part(locale_data)
+        return locale_data, manifest, current, plan_changes(source.tree, current, source.scoped_hashes(manifest))
+
+
+def estimate_jobs(languages, sources, options):
+    """Characters each locale will send (before translation memory hits), in locale order"""
+    from translation import estimate_characters
+
+    if not options.incremental:
+        characters = estimate_characters(union_strings(sources))
+        return {locale: characters for locale in languages}
+    jobs = {}
+    for locale in languages:
+        pending = {}
+        for source in sources:
+            pending.update(dict.fromkeys(plan_locale_changes(locale, source)[3].values()))
+        jobs[locale] = estimate_characters(pending)
+    return jobs
+
+
+def translate_locale(locale, config, sources, options, engine, backend_name=None):
+    """Translate one locale against the shared sources; returns a result dict"""
+    import time
+
+    from translation import (
+        CheckpointJournal,
+        apply_translations,
+        change_stats,
+        merge_changes,
+        paths_for_sources,
+        profile_phase,
+        record_locale,
+        translate_strings,
+    )
+    from translation import backends
+
+    start_time = time.time()
+    try:
+        # (source, locale tree, manifest, scoped current tree, changed keys or None) per source tree
+        parts = []
+        for source in sources:
+            locale_data, manifest, current, changed = plan_locale_changes(locale, source)
+            parts.append((source, locale_data, manifest, current, changed if options.incremental else None))
+        journal = CheckpointJournal(locale, journal_scope(sources), resume=options.resume)
+        failed = set()
+        total_keys = sum(source.total_keys for source in sources)
+
+        if options.incremental:
+            pending = list(dict.fromkeys(text for *_, changed in parts for text in changed.values()))
+        else:
+            pending = union_strings(sources)
+        resumed = len(journal.completed.keys() & set(pending))
+        total_unique = len(pending) - resumed
+        print(f"   {locale}: {total_keys} keys, {total_unique} unique strings to translate"
+              + (f" ({resumed} resumed)" if resumed else '')
+              + (f" across {len(sources)} source trees" if len(sources) > 1 else ''))
+
+        with profile_phase('flatten'):
+            tiers = plan_tiers(sources, pending)
+        if tiers and len(tiers) > 1:
+            print(f"   {locale}: priority tiers of {', '.join(str(len(tier)) for tier in tiers)} strings")
+
+        def rebuild(source, locale_data, current, changed, translations):
+            with profile_phase('translate'):
+                if changed is not None:
+                    translated = merge_changes(source.tree, current, changed, translations)
+                else:
+                    translated = apply_translations(source.tree, translations, existing=current)
+                return source.merge_into(locale_data, translated)
+
+        flushed = [0]
+
+        def flush_tier(translations):
+            # Untranslated keys keep their current value until their tier is done
+            flushed[0] += 1
+            for source, locale_data, _, current, changed in parts:
+                translated = rebuild(source, locale_data, current, changed, translations)
+                with profile_phase('write'):
+                    source.origin.write_locale(locale, translated)
+            print(f"   {locale}: 💾 tier {flushed[0]}/{len(tiers)} written ({len(translations)} strings so far)")
+
+        translated_count = [0]
+        last_percent = [0]
+
+        def progress_callback():
+            translated_count[0] += 1
+            percent = int((translated_count[0] / max(total_unique, 1)) * 100)
+            if percent > last_percent[0] and percent % 10 == 0:
+                print(f"   {locale}: {percent}% ({translated_count[0]}/{total_unique})")
+                last_percent[0] = percent
+
+        backend = backends.get_backend(backend_name)
+        # One pass over the union of every tree's strings: shared phrases are translated once
+        with profile_phase('translate'):
+            translations = translate_strings(
+                pending,
+                lambda text: backends.translate_text(text, config['code'], backend),
+                progress_callback=progress_callback,
+                engine=engine,
+                batch_fn=lambda texts: backends.translate_batch(texts, config['code'], backend),
+                failed=failed,
+                journal=journal,
+                tiers=tiers,
+                on_tier=flush_tier,
+            )
+
+        failed_paths = []
+        for source, locale_data, manifest, current, changed in parts:
+            if changed is not None:
+                stats = change_stats(source.tree, current, changed, failed)
+                print(f"   {locale}: 🔁 {stats['changed']} translated, {stats['kept']} kept, {stats['removed']} removed"
+                      + (f" ({source.origin.name})" if len(parts) > 1 else ''))
+            translated = rebuild(source, locale_data, current, changed, translations)
+            source_failed = paths_for_sources(source.tree, failed)
+            with profile_phase('write'):
+                source.origin.write_locale(locale, translated)
+                source.record_hashes(manifest, source_failed)
+                manifest.save()
+            failed_paths += [f'{source.origin.name}:{path}' for path in source_failed] if len(parts) > 1 else source_failed
+        journal.discard()
+        record_locale(locale, total_keys - len(failed_paths), len(failed_paths), time.time() - start_time)
+
+        return {
+            'success': True,
+            'locale': locale,
+            'duration': time.time() - start_time,
+            'keys': total_keys - len(failed_paths),
+            'total': total_keys,
+            'unique': total_unique,
+            'failed': failed_paths,
+        }
+    except Exception as e:
+        print(f"   ❌ {locale}: {str(e)}")
+        return {'success': False, 'locale': locale, 'error': str(e)}
+
+
+def main():
+    options = parse_args(sys.argv[1:])
+    if options.list:
+        list_locales()
+        return
+
+    from translation import (
+        TranslationEngine,
+        backend_from_args,
+        budget_for,
+        concurrency_from_args,
+        failover_from_args,
+        get_languages,
+        get_memory,
+        get_quota,
+        load_usage_index,
+        metrics_from_args,
+        plan_budget,
+        profile_from_args,
+        profile_phase,
+        set_active_backend,
+    )
+
+    profile_from_args([] if options.profile is None else [f'--profile={options.profile}' if options.profile else '--profile'])
+    try:
+        languages = get_languages(None if options.all else split_codes(options.locales))
+        backend = set_active_backend(backend_from_args([f'--backend={options.backend}'] if options.backend else []))
+        failover = failover_from_args([f'--failover={options.failover}'] if options.failover else [])
+        namespaces = split_codes(options.namespaces)
+        with profile_phase('load'):
+            usage = None if options.no_priority else load_usage_index()
+        sources = load_sources(split_codes(options.sources), namespaces, usage)
+    except ValueError as e:
+        print(f'❌ Error: {str(e)}')
+        sys.exit(1)
+    languages.pop('en', None)
+    concurrency = options.concurrency or concurrency_from_args([])
+    metrics_dir = metrics_from_args([f'--metrics-dir={options.metrics_dir}'] if options.metrics_dir else [])
+    total_keys = sum(source.total_keys for source in sources)
+    unique_strings = union_strings(sources)
+
+    print(f"\n🌍 TRANSLATING {len(languages)} LOCALES: {', '.join(languages)}")
+    print(f"Scope: {', '.join(namespaces) if namespaces else 'entire file'} "
+          f"({total_keys} keys, {len(unique_strings)} unique strings)")
+    if len(sources) > 1:
+        separate = sum(len(source.unique_strings) for source in sources)
+        print(f"Sources: {', '.join(f'{source.origin.name} ({source.total_keys} keys)' for source in sources)}; "
+              f"{separate - len(unique_strings)} shared strings translated once")
+    print(f"Backend: {backend.name}, concurrency: {concurrency} in-flight requests"
+          + (', incremental' if options.incremental else ''))
+    if usage is not None:
+        print(f"Priority: key usage from {usage.files} files in src/ (most used first, written per tier)")
+
+    jobs = estimate_jobs(languages, sources, options)
+    plan = plan_budget(jobs, backend.name, failover)
+    quota = get_quota()
+    print(f"Characters: ~{sum(jobs.values()):,} to send (before translation memory hits)")
+    for name in dict.fromkeys([backend.name, *failover]):
+        per_minute, per_day = budget_for(name)
+        remaining = quota.remaining_today(name)
+        assigned = [locale for locale, assignee in plan.items() if assignee == name]
+        print(f"   {name}: {per_minute or 'unlimited'}/min, "
+              f"{f'{remaining:,} of {per_day:,} left today' if per_day else 'no daily limit'}"
+              + (f" -> {', '.join(assigned)}" if assigned and name != backend.name else ''))
+    deferred = [locale for locale, assignee in plan.items() if assignee is None]
+    if deferred:
+        print(f"   ⏸️  Deferred (no budget left today): {', '.join(deferred)}")
+    print('=' * 80 + '\n')
+
+    scheduled = [locale for locale in languages if plan[locale] is not None]
+    with TranslationEngine(concurrency) as engine:
+        results = engine.map_locales(
+            lambda locale: translate_locale(locale, languages[locale], sources, options, engine, plan[locale]),
+            scheduled,
+        )
+    results += [
+        {'success': False, 'locale': locale, 'error': 'deferred: no character budget left today'} for locale in deferred
+    ]
+
+    print('\n' + '=' * 80)
+    print('\n📋 Language Summary:')
+    for result in results:
+        if result['success']:
+            print(f"   ✅ {result['locale']}: {result['keys']:,}/{result['total']:,} keys in {result['duration']:.1f}s")
+            if result['failed']:
+                print(f"      ⚠️  {len(result['failed'])} keys failed (re-run with --incremental to retry), e.g.:")
+                for path in result['failed'][:5]:
+                    print(f"         - {path}")
+        else:
+            print(f"   ❌ {result['locale']}: {result.get('error', 'Unknown error')}")
+    memory = get_memory()
+    print(f"\n💾 Translation memory: {memory.hits} hits, {memory.misses} misses")
+    if metrics_dir:
+        print(f"📈 Metrics: {metrics_dir / 'events.jsonl'} and {metrics_dir / 'translation.prom'}")
+
+    if not all(result['success'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
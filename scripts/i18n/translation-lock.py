@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+TRANSLATION FRESHNESS LOCK
+`check` compares the English source hashes of every key with the hashes in
+translations.lock (what each locale was translated from) and lists stale and
+missing keys per locale. It reads only en.json and the lockfile, never calls
+a backend and finishes well under a second, so CI can gate on it. Exits 1
+when any checked locale is behind.
+
+The translate scripts keep the lockfile up to date. `update` rebuilds it from
+the local manifests in .translation-cache; on a checkout without them,
+`update --from-files` records every key a locale file has a translation of
+as current (values that are still a copy of the English source count as
+missing). While a tree still has untranslated keys, `check --allow-missing`
+fails only on stale ones, so CI can gate on English edits that were never
+re-translated.
+
+Usage:
+  python3 scripts/i18n/translation-lock.py check [--locales=es,fr] [--sources=app,marketing] [--limit=10] [--allow-missing]
+  python3 scripts/i18n/translation-lock.py update [--locales=es,fr] [--sources=app,marketing] [--from-files]
+"""
+
+import argparse
+import sys
+import time
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Check or rebuild the translation freshness lockfile')
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('check', 'List stale and missing keys per locale'), ('update', 'Rebuild the lockfile')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('--locales', help='Comma-separated locales (default: every locale in src/i18n/config.ts)')
+        command.add_argument('--sources', help='Comma-separated source trees: app, marketing (default: app)')
+    commands.choices['check'].add_argument('--limit', type=int, default=10, help='Keys to print per locale (default: 10)')
+    commands.choices['check'].add_argument('--allow-missing', action='store_true',
+                                           help='Report untranslated keys but fail only on stale ones')
+    commands.choices['update'].add_argument('--from-files', action='store_true',
+                                            help='Treat every key a locale file translates (not a copy of en) as current')
+    return parser.parse_args(argv)
+
+
+def split_codes(value):
+    return [code.strip() for code in value.split(',') if code.strip()] if value else []
+
+
+def check(tree, locales, options):
+    """Print the freshness report of one source tree; True when every locale is current (or only missing keys, with --allow-missing)"""
+    from translation import TranslationLock, source_hashes
+
+    lock = TranslationLock(tree.lockfile)
+    if not lock.exists:
+        print(f"❌ {tree.name}: no {tree.lockfile.name} - run `translation-lock.py update` first")
+        return False
+    report = lock.check(source_hashes(tree.load_source()), locales)
+
+    current = True
+    for locale, result in report.items():
+        stale, missing = result['stale'], result['missing']
+        if not stale and not missing:
+            print(f"   ✅ {tree.name}/{locale}: current")
+            continue
+        passed = options.allow_missing and not stale
+        current = current and passed
+        print(f"   {'⚠️ ' if passed else '❌'} {tree.name}/{locale}: {len(stale)} stale, {len(missing)} missing")
+        for label, paths in (('stale', stale), ('missing', missing)):
+            for path in paths[:options.limit]:
+                print(f"      {label:<7} {path}")
+            if len(paths) > options.limit:
+                print(f"      ... {len(paths) - options.limit} more {label}")
+    return current
+
+
+def update(tree, locales, options):
+    from translation import TranslationLock, flatten_messages, hash_source, is_translated
+
+    lock = TranslationLock(tree.lockfile)
+    recorded = {}
+    if options.from_files:
+        source = flatten_messages(tree.load_source())
+        hashes = {key: hash_source(text) for _, key, text in source.strings()}
+    for locale in locales:
+        if options.from_files:
+            present = source.keyspace.flatten(tree.read_locale(locale), extend=False)
+            recorded[locale] = {
+                key: hashes[key] for slot, key, text in source.strings() if is_translated(present.value_at(slot), text)
+            }
+        else:
+            recorded[locale] = tree.manifest(locale).hashes
+        print(f"   ✅ {tree.name}/{locale}: {len(recorded[locale]):,} keys recorded")
+    lock.set_locales(recorded)
+    lock.save()
+    print(f"📝 Wrote {tree.lockfile}")
+
+
+def main():
+    options = parse_args(sys.argv[1:])
+    start_time = time.perf_counter()
+
+    from translation import get_languages, get_source_trees
+
+    try:
+        languages = get_languages(split_codes(options.locales) or None)
+        trees = get_source_trees(split_codes(options.sources))
+    except ValueError as e:
+        print(f'❌ Error: {str(e)}')
+        sys.exit(1)
+    languages.pop('en', None)
+
+    if options.command == 'update':
+        for tree in trees:
+            update(tree, list(languages), options)
+        return
+
+    print(f'🔒 Checking {len(languages)} locales against translations.lock\n')
+    current = all([check(tree, list(languages), options) for tree in trees])
+    passed = '✅ No stale translations' if options.allow_missing else '✅ All translations current'
+    print(f"\n{passed if current else '❌ Translations are behind en.json'} "
+          f"({time.perf_counter() - start_time:.2f}s)")
+    if not current:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
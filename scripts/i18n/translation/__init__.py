@@ -0,0 +1,189 @@
+"""
+SHARED TRANSLATION PIPELINE
+Helpers used by the Python translate-*.py scripts in scripts/i18n
+"""
+
+from .backends import (
+    BACKENDS,
+    DeepLBackend,
+    FakeBackend,
+    GoogleBackend,
+    LibreTranslateBackend,
+    TranslationBackend,
+    backend_from_args,
+    get_backend,
+    set_active_backend,
+)
+from .batching import join_batch, make_batches, split_batch, translate_batch_with_fallback
+from .checkpoint import CheckpointJournal
+from .jobqueue import Heartbeat, JobQueue, worker_name
+from .clients import get_client, get_http_session, use_shared_session
+from .keyspace import FlatMessages, KeySpace, count_strings, flatten_messages, format_path
+from .dedup import collect_unique_strings, apply_translations, translate_strings, translate_unique
+from .incremental import (
+    SourceManifest,
+    change_stats,
+    hash_source,
+    is_translated,
+    iter_strings,
+    merge_changes,
+    paths_for_sources,
+    plan_changes,
+    source_hashes,
+    translate_incremental,
+)
+from .lockfile import TranslationLock, record_locale_hashes
+from .sources import SOURCE_TREES, SourceTree, get_source_trees
+from .engine import TokenBucket, TranslationEngine, concurrency_from_args, get_rate_limiter, set_rate_limiter
+from .retry import (
+    CircuitBreaker,
+    QuotaExhausted,
+    RetryPolicy,
+    TranslationFailed,
+    call_with_retry,
+    get_circuit_breaker,
+    set_circuit_breaker,
+)
+from .masking import Masker, MaskedText, TermMatcher, get_masker, load_glossary, mask_text
+from .validation import build_source_index, placeholder_signature, validate_flat_locale, validate_locale_tree, validate_locales
+from .shards import load_shard_manifest, shard_locale_file, write_shards
+from .bundles import build_bundles, load_bundle_manifest, minify_messages, write_bundle
+from .writer import dump_messages, write_atomic, write_json, write_locale_file, write_locales
+from .locales import CONFIG_PATH, SOURCE_LOCALE, get_languages, read_locales
+from .paths import BUNDLES_DIR, CACHE_DIR, EN_MESSAGES_PATH, MARKETING_MESSAGES_DIR, MESSAGES_DIR, REPO_ROOT, SHARDS_DIR
+from .metrics import Metrics, get_metrics, metrics_from_args, record_locale
+from .profiling import Profiler, get_profiler, profile_from_args, profile_phase
+from .usage import UsageIndex, load_usage_index, prioritize_strings, route_namespaces
+from .quota import (
+    QuotaLedger,
+    budget_for,
+    estimate_characters,
+    failover_backends,
+    failover_from_args,
+    get_quota,
+    plan_budget,
+    set_failover_backends,
+    set_quota,
+)
+from .watch import SourceWatcher
+from .memory import TranslationMemory, NullMemory, WarmMemory, get_memory, set_memory
+
+__all__ = [
+    'BACKENDS',
+    'DeepLBackend',
+    'FakeBackend',
+    'GoogleBackend',
+    'LibreTranslateBackend',
+    'TranslationBackend',
+    'backend_from_args',
+    'get_backend',
+    'set_active_backend',
+    'join_batch',
+    'make_batches',
+    'split_batch',
+    'translate_batch_with_fallback',
+    'CheckpointJournal',
+    'Heartbeat',
+    'JobQueue',
+    'worker_name',
+    'get_client',
+    'get_http_session',
+    'use_shared_session',
+    'FlatMessages',
+    'KeySpace',
+    'count_strings',
+    'flatten_messages',
+    'format_path',
+    'collect_unique_strings',
+    'apply_translations',
+    'translate_strings',
+    'translate_unique',
+    'SourceManifest',
+    'change_stats',
+    'hash_source',
+    'is_translated',
+    'iter_strings',
+    'merge_changes',
+    'paths_for_sources',
+    'plan_changes',
+    'source_hashes',
+    'translate_incremental',
+    'TranslationLock',
+    'record_locale_hashes',
+    'SOURCE_TREES',
+    'SourceTree',
+    'get_source_trees',
+    'TokenBucket',
+    'TranslationEngine',
+    'concurrency_from_args',
+    'get_rate_limiter',
+    'set_rate_limiter',
+    'CircuitBreaker',
+    'QuotaExhausted',
+    'RetryPolicy',
+    'TranslationFailed',
+    'call_with_retry',
+    'get_circuit_breaker',
+    'set_circuit_breaker',
+    'Masker',
+    'MaskedText',
+    'TermMatcher',
+    'get_masker',
+    'load_glossary',
+    'mask_text',
+    'build_source_index',
+    'placeholder_signature',
+    'validate_flat_locale',
+    'validate_locale_tree',
+    'validate_locales',
+    'load_shard_manifest',
+    'shard_locale_file',
+    'write_shards',
+    'build_bundles',
+    'load_bundle_manifest',
+    'minify_messages',
+    'write_bundle',
+    'dump_messages',
+    'write_atomic',
+    'write_json',
+    'write_locale_file',
+    'write_locales',
+    'CONFIG_PATH',
+    'SOURCE_LOCALE',
+    'get_languages',
+    'read_locales',
+    'BUNDLES_DIR',
+    'CACHE_DIR',
+    'EN_MESSAGES_PATH',
+    'MARKETING_MESSAGES_DIR',
+    'MESSAGES_DIR',
+    'REPO_ROOT',
+    'SHARDS_DIR',
+    'Metrics',
+    'get_metrics',
+    'metrics_from_args',
+    'record_locale',
+    'Profiler',
+    'get_profiler',
+    'profile_from_args',
+    'profile_phase',
+    'UsageIndex',
+    'load_usage_index',
+    'prioritize_strings',
+    'route_namespaces',
+    'QuotaLedger',
+    'budget_for',
+    'estimate_characters',
+    'failover_backends',
+    'failover_from_args',
+    'get_quota',
+    'plan_budget',
+    'set_failover_backends',
+    'set_quota',
+    'SourceWatcher',
+    'TranslationMemory',
+    'NullMemory',
+    'WarmMemory',
+    'get_memory',
+    'set_memory',
+]
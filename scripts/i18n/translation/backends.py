@@ -0,0 +1,387 @@
+"""
+TRANSLATION BACKENDS
+Every backend implements the same small interface:
+
+  translate(text, target)          -> str
+  translate_many(texts, target)    -> list[str]   (only when native_batch is True)
+
+Backends without a native batch API are batched through a newline-joined
+payload (see batching.py). translate_text / translate_batch wrap any backend
+with placeholder and glossary masking (see masking.py), the translation
+memory, character budget, rate limiter, retry policy and circuit breaker, and
+move on to the failover backends (--failover / TRANSLATION_FAILOVER) once the
+day budget is spent (see quota.py).
+
+Backends:
+  google   deep_translator's GoogleTranslator (free web endpoint, no key)
+  deepl    DeepL REST API, native batching (DEEPL_API_KEY, DEEPL_API_URL)
+  libre    LibreTranslate REST API, native batching (LIBRETRANSLATE_URL, LIBRETRANSLATE_API_KEY)
+  fake     Deterministic offline stand-in with configurable latency and errors
+           (TRANSLATION_FAKE_LATENCY, TRANSLATION_FAKE_LATENCY_PER_CHAR,
+            TRANSLATION_FAKE_ERROR_RATE, TRANSLATION_FAKE_SEED)
+
+Select one with --backend=NAME or TRANSLATION_BACKEND (default: google)
+"""
+
+import os
+import random
+import threading
+import time
+
+from .batching import BATCH_SEPARATOR, translate_batch_with_fallback
+from .clients import get_client, get_http_session, use_shared_session
+from .engine import get_rate_limiter
+from .masking import mask_text
+from .memory import get_memory
+from .metrics import get_metrics, record_request
+from .quota import failover_backends, get_quota
+from .retry import QuotaExhausted, TranslationFailed, call_with_retry
+
+DEFAULT_BACKEND = 'google'
+
+
+class TranslationBackend:
+    """Base class for translation backends"""
+
+    name = None
+    native_batch = False
+
+    def translate(self, text, target):
+        raise NotImplementedError
+
+    def translate_many(self, texts, target):
+        raise NotImplementedError
+
+
+class GoogleBackend(TranslationBackend):
+    """Google Translate through deep_translator (one string or joined payload per request)"""
+
+    name = 'google'
+
+    def translate(self, text, target):
+        from deep_translator import GoogleTranslator
+        import deep_translator.google
+
+        # Keep-alive connections shared by every translator client
+        use_shared_session(deep_translator.google)
+        translator = get_client(self.name, target, lambda: GoogleTranslator(source='en', target=target))
+        return translator.translate(text)
+
+
+class DeepLBackend(TranslationBackend):
+    """DeepL REST API; sends many texts in one request"""
+
+    name = 'deepl'
+    native_batch = True
+
+    # Locale codes that DeepL spells differently
+    TARGET_CODES = {'zh-CN': 'ZH', 'pt': 'PT-BR', 'no': 'NB', 'en': 'EN-US'}
+
+    def __init__(self, api_key=None, api_url=None):
+        self.api_key = api_key or os.environ.get('DEEPL_API_KEY')
+        if not self.api_key:
+            raise ValueError('DEEPL_API_KEY is not set')
+        default_url = 'https://api-free.deepl.com/v2/translate' if self.api_key.endswith(':fx') else 'https://api.deepl.com/v2/translate'
+        self.api_url = api_url or os.environ.get('DEEPL_API_URL') or default_url
+
+    def translate(self, text, target):
+        return self.translate_many([text], target)[0]
+
+    def translate_many(self, texts, target):
+        response = get_http_session().post(
+            self.api_url,
+            headers={'Authorization': f'DeepL-Auth-Key {self.api_key}'},
+            data={'text': list(texts), 'source_lang': 'EN', 'target_lang': self.TARGET_CODES.get(target, target.upper())},
+            timeout=60,
+        )
+        response.raise_for_status()
+        return [item['text'] for item in response.json()['translations']]
+
+
+class LibreTranslateBackend(TranslationBackend):
+    """LibreTranslate REST API; accepts a list of strings in one request"""
+
+    name = 'libre'
+    native_batch = True
+
+    TARGET_CODES = {'zh-CN': 'zh', 'no': 'nb'}
+
+    def __init__(self, url=None, api_key=None):
+        self.url = (url or os.environ.get('LIBRETRANSLATE_URL') or 'https://libretranslate.com').rstrip('/')
+        self.api_key = api_key or os.environ.get('LIBRETRANSLATE_API_KEY')
+
+    def translate(self, text, target):
+        return self.translate_many([text], target)[0]
+
+    def translate_many(self, texts, target):
+        payload = {
+            'q': list(texts),
+            'source': 'en',
+            'target': self.TARGET_CODES.get(target, target),
+            'format': 'text',
+        }
+        if self.api_key:
+            payload['api_key'] = self.api_key
+        response = get_http_session().post(f'{self.url}/translate', json=payload, timeout=60)
+        response.raise_for_status()
+        return response.json()['translatedText']
+
+
+class FakeBackendError(Exception):
+    """Injected failure from the fake backend"""
+
+
+class FakeBackend(TranslationBackend):
+    """
+    Deterministic offline backend for benchmarks and load tests. Output is
+    "[target] text"; each request sleeps latency + latency_per_char * chars
+    and fails with probability error_rate from a seeded generator
+    """
+
+    name = 'fake'
+    native_batch = True
+
+    def __init__(self, latency=None, latency_per_char=None, error_rate=None, seed=None):
+        self.latency = float(latency if latency is not None else os.environ.get('TRANSLATION_FAKE_LATENCY', 0.0))
+        self.latency_per_char = float(
+            latency_per_char if latency_per_char is not None else os.environ.get('TRANSLATION_FAKE_LATENCY_PER_CHAR', 0.0)
+        )
+        self.error_rate = float(error_rate if error_rate is not None else os.environ.get('TRANSLATION_FAKE_ERROR_RATE', 0.0))
+        self._random = random.Random(int(seed if seed is not None else os.environ.get('TRANSLATION_FAKE_SEED', 0)))
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.characters = 0
+
+    def _request(self, texts):
+        chars = sum(len(text) for text in texts)
+        with self._lock:
+            self.requests += 1
+            self.characters += chars
+            fail = self._random.random() < self.error_rate
+        delay = self.latency + self.latency_per_char * chars
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise FakeBackendError('injected failure')
+
+    def translate(self, text, target):
+        self._request([text])
+        return self.render(text, target)
+
+    def translate_many(self, texts, target):
+        self._request(texts)
+        return [self.render(text, target) for text in texts]
+
+    @staticmethod
+    def render(text, target):
+        return f'[{target}] {text}'
+
+
+BACKENDS = {
+    'google': GoogleBackend,
+    'deepl': DeepLBackend,
+    'libre': LibreTranslateBackend,
+    'fake': FakeBackend,
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+_active_backend = None
+
+
+def get_backend(name=None):
+    """Return the process-wide backend instance for name (default: the active backend)"""
+    name = name or _active_backend or os.environ.get('TRANSLATION_BACKEND') or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown translation backend '{name}' (available: {', '.join(BACKENDS)})")
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = BACKENDS[name]()
+        return _instances[name]
+
+
+def set_active_backend(name):
+    """Make name the backend returned by get_backend() with no argument"""
+    global _active_backend
+    _active_backend = name
+    return get_backend(name)
+
+
+def backend_from_args(argv):
+    """Read --backend=NAME from argv, then TRANSLATION_BACKEND, then the default"""
+    for arg in argv:
+        if arg.startswith('--backend='):
+            return arg.split('=', 1)[1]
+    return os.environ.get('TRANSLATION_BACKEND') or DEFAULT_BACKEND
+
+
+def _timed_request(backend, target, kind, payload, strings, call):
+    """Run one backend call and record its latency, payload size and outcome"""
+    start = time.perf_counter()
+    ok = False
+    try:
+        result = call()
+        ok = True
+        return result
+    finally:
+        record_request(backend.name, target, kind, payload, strings, time.perf_counter() - start, ok)
+
+
+def _failover_for(backend):
+    """The first failover backend that still has budget today, or None"""
+    quota = get_quota()
+    for name in failover_backends():
+        if name == backend.name or quota.is_exhausted(name):
+            continue
+        try:
+            return get_backend(name)
+        except ValueError as e:
+            # e.g. DEEPL_API_KEY missing; skip it rather than failing the run
+            print(f"      ⚠️  Failover backend {name} unavailable: {e}")
+    return None
+
+
+def _fail_over_missing(texts, results, target, backend):
+    """Send strings a spent backend could not translate to the next backend in the failover chain"""
+    if None not in results or not get_quota().is_exhausted(backend.name):
+        return results
+    fallback = _failover_for(backend)
+    if fallback is None:
+        return results
+    missing = [text for text, result in zip(texts, results) if result is None]
+    retried = dict(zip(missing, translate_batch(missing, target, fallback)))
+    return [retried[text] if result is None else result for text, result in zip(texts, results)]
+
+
+def _request_single(text, target, backend):
+    """One retried request for a single (already masked) string"""
+    def request():
+        with get_quota().charged(backend.name, len(text)):
+            get_rate_limiter(backend.name).acquire()
+            result = _timed_request(backend, target, 'single', text, 1, lambda: backend.translate(text, target))
+            if not isinstance(result, str):
+                raise ValueError('empty response')
+            return result
+
+    return call_with_retry(request, backend.name)
+
+
+def _translate_around(masked, target, backend):
+    """
+    Last resort for a string whose sentinels did not survive: translate the
+    text between the protected spans piece by piece and splice the spans back
+    """
+    pieces = []
+    for text, token in masked.segments():
+        core = text.strip()
+        if any(ch.isalpha() for ch in core):
+            lead = text[:len(text) - len(text.lstrip())]
+            trail = text[len(text.rstrip()):]
+            text = lead + _request_single(core, target, backend).strip() + trail
+        pieces.append(text + token)
+    result = ''.join(pieces)
+    if not masked.verify(result):
+        raise TranslationFailed(f'placeholders lost in {masked.source[:40]!r}')
+    return result
+
+
+def translate_text(text, target, backend=None):
+    """Translate one string with masking, memory lookup, rate limiting, retries and circuit breaking"""
+    backend = backend or get_backend()
+    masked = mask_text(text)
+    if masked.opaque:
+        # Only placeholders and protected terms: nothing to send
+        return text
+    memory = get_memory()
+    cached = memory.get(text, target, backend.name)
+    if cached is not None and masked.verify(cached):
+        return cached
+
+    try:
+        result = masked.restore(_request_single(masked.text, target, backend))
+        if result is None:
+            get_metrics().inc('translation_mask_rejections_total', backend=backend.name, stage='single')
+            result = _translate_around(masked, target, backend)
+    except QuotaExhausted:
+        fallback = _failover_for(backend)
+        if fallback is None:
+            raise
+        return translate_text(text, target, fallback)
+    except TranslationFailed as e:
+        print(f"      ⚠️  Error translating: {str(e)[:50]}")
+        get_metrics().event('error', backend=backend.name, target=target, characters=len(text), error=str(e))
+        raise
+    memory.put(text, target, backend.name, result)
+    return result
+
+
+def translate_batch(texts, target, backend=None):
+    """Translate many strings in one request; entries that cannot be translated come back as None"""
+    backend = backend or get_backend()
+    memory = get_memory()
+    masks = {text: mask_text(text) for text in texts}
+    # Strings that are nothing but placeholders and protected terms stay as they are
+    results = {text: text for text, masked in masks.items() if masked.opaque}
+    sendable = [text for text in dict.fromkeys(texts) if text not in results]
+
+    def translate_single(text):
+        return translate_text(text, target, backend)
+
+    if not backend.native_batch:
+        def translate_payload(payload):
+            with get_quota().charged(backend.name, len(payload)):
+                get_rate_limiter(backend.name).acquire()
+                strings = payload.count(BATCH_SEPARATOR) + 1
+                return _timed_request(backend, target, 'joined', payload, strings, lambda: backend.translate(payload, target))
+
+        translated = translate_batch_with_fallback(
+            sendable, target, backend.name, translate_payload, translate_single, memory, masks
+        )
+        results.update(zip(sendable, translated))
+        return _fail_over_missing(texts, [results[text] for text in texts], target, backend)
+
+    pending = []
+    for text in sendable:
+        cached = memory.get(text, target, backend.name)
+        if cached is None or not masks[text].verify(cached):
+            pending.append(text)
+        else:
+            results[text] = cached
+
+    if pending:
+        payload = [masks[text].text for text in pending]
+
+        def request():
+            with get_quota().charged(backend.name, sum(len(text) for text in payload)):
+                get_rate_limiter(backend.name).acquire()
+                return _timed_request(
+                    backend, target, 'native_batch', payload, len(payload), lambda: backend.translate_many(payload, target)
+                )
+
+        try:
+            translated = call_with_retry(request, backend.name)
+        except QuotaExhausted:
+            translated = [None] * len(pending)
+        except TranslationFailed as e:
+            print(f"      ⚠️  Error translating batch: {str(e)[:50]}")
+            get_metrics().event('error', backend=backend.name, target=target, strings=len(pending), error=str(e))
+            translated = [None] * len(pending)
+        if not isinstance(translated, list) or len(translated) != len(pending):
+            translated = [None] * len(pending)
+        for text, result in zip(pending, translated):
+            if result is None:
+                results[text] = None
+                continue
+            restored = masks[text].restore(result)
+            if restored is None:
+                # Only this string lost a placeholder or term; retry it alone
+                get_metrics().inc('translation_mask_rejections_total', backend=backend.name, stage='batch')
+                try:
+                    results[text] = translate_single(text)
+                except TranslationFailed:
+                    results[text] = None
+                continue
+            memory.put(text, target, backend.name, restored)
+            results[text] = restored
+
+    return _fail_over_missing(texts, [results[text] for text in texts], target, backend)
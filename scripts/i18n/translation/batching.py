@@ -0,0 +1,119 @@
+"""
+BATCHED TRANSLATION REQUESTS
+Short single-line strings (the thousands of 1-3 word labels under common,
+statuses, fields...) are packed into one newline-joined payload per request.
+The response is split back apart and verified; any batch that does not split
+cleanly falls back to one request per string. With masks (see masking.py)
+the payload carries the masked strings and each part is restored and
+verified on its own; only the parts that fail go to the per-string path
+"""
+
+from .metrics import get_metrics
+from .retry import TranslationFailed, call_with_retry
+
+BATCH_SEPARATOR = '\n'
+
+# Stay well under the ~5,000 character limit of the Google web endpoint
+MAX_BATCH_CHARS = 4000
+MAX_BATCH_STRINGS = 64
+
+# Longer strings are sent on their own so one bad split cannot cost much
+MAX_BATCHABLE_LENGTH = 200
+
+
+def is_batchable(text):
+    """Only short, single-line strings without surrounding whitespace survive a join/split"""
+    return (
+        0 < len(text) <= MAX_BATCHABLE_LENGTH
+        and text == text.strip()
+        and '\n' not in text
+        and '\r' not in text
+    )
+
+
+def make_batches(texts, max_chars=MAX_BATCH_CHARS, max_strings=MAX_BATCH_STRINGS):
+    """Group strings into translation units; batchable strings share units, others go alone"""
+    units = []
+    current = []
+    current_chars = 0
+    for text in texts:
+        if not is_batchable(text):
+            units.append([text])
+            continue
+        size = len(text) + len(BATCH_SEPARATOR)
+        if current and (current_chars + size > max_chars or len(current) >= max_strings):
+            units.append(current)
+            current = []
+            current_chars = 0
+        current.append(text)
+        current_chars += size
+    if current:
+        units.append(current)
+    return units
+
+
+def join_batch(texts):
+    return BATCH_SEPARATOR.join(texts)
+
+
+def split_batch(result, expected_count):
+    """Split a translated payload, returning None when it does not line up with the input"""
+    if not isinstance(result, str):
+        return None
+    parts = [part.strip() for part in result.strip().split(BATCH_SEPARATOR)]
+    if len(parts) != expected_count or not all(parts):
+        return None
+    return parts
+
+
+def translate_batch_with_fallback(texts, target, backend, translate_payload, translate_single, memory, masks=None):
+    """
+    Translate a batch in one request, consulting the translation memory first.
+    translate_payload(payload) performs the raw request (retried with backoff);
+    translate_single(text) is the per-string path used when the joined result
+    fails verification. masks maps each text to its MaskedText; the payload is
+    built from the masked strings and every part is restored before use.
+    Strings that cannot be translated come back as None
+    """
+    results = {}
+    pending = []
+    for text in texts:
+        cached = memory.get(text, target, backend)
+        if cached is None or (masks is not None and not masks[text].verify(cached)):
+            pending.append(text)
+        else:
+            results[text] = cached
+
+    if len(pending) == 1:
+        results[pending[0]] = _translate_or_none(translate_single, pending[0])
+    elif pending:
+        payload = join_batch([masks[text].text for text in pending] if masks is not None else pending)
+        try:
+            parts = split_batch(call_with_retry(lambda: translate_payload(payload), backend), len(pending))
+        except TranslationFailed:
+            for text in pending:
+                results[text] = None
+            return [results[text] for text in texts]
+        if parts is None:
+            for text in pending:
+                results[text] = _translate_or_none(translate_single, text)
+        else:
+            for text, translated in zip(pending, parts):
+                if masks is not None:
+                    translated = masks[text].restore(translated)
+                if translated is None:
+                    # This part lost a placeholder or term; the rest of the batch is fine
+                    get_metrics().inc('translation_mask_rejections_total', backend=backend, stage='batch')
+                    results[text] = _translate_or_none(translate_single, text)
+                    continue
+                memory.put(text, target, backend, translated)
+                results[text] = translated
+
+    return [results[text] for text in texts]
+
+
+def _translate_or_none(translate_single, text):
+    try:
+        return translate_single(text)
+    except TranslationFailed:
+        return None
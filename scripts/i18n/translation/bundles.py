@@ -0,0 +1,104 @@
+"""
+LOCALE BUNDLES
+Build stage run after translation: every messages/<locale>.json is written
+minified to src/i18n/messages/bundles/<locale>.<hash>.json, named by the hash
+of its content, with precompressed .gz and .br siblings for static hosting
+or a CDN. manifest.json maps each locale to its current bundle. A locale
+whose messages did not change keeps its file name (and every cache of it);
+bundles no longer listed in the manifest are removed. The src/i18n/shards.ts
+loader reads the bundles with I18N_MESSAGES_MODE=bundled
+
+Brotli variants need the optional `brotli` package (pip install brotli);
+without it only gzip variants are written
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from .paths import BUNDLES_DIR, MESSAGES_DIR
+from .writer import dump_messages, write_atomic
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = 'manifest.json'
+
+# Bundle names: 12 hex chars of the content hash
+HASH_LENGTH = 12
+
+_manifest_lock = threading.Lock()
+
+
+def minify_messages(data):
+    """Smallest JSON text of a message tree (key order kept, UTF-8, no whitespace)"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def compress_variants(data):
+    """{'.gz': bytes, '.br': bytes} of one bundle; byte-identical for identical input"""
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return variants
+
+
+def load_bundle_manifest(directory=BUNDLES_DIR):
+    """{'bundles': {locale: entry}} written by build_bundles, or an empty manifest"""
+    path = Path(directory) / MANIFEST_NAME
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'bundles': {}}
+
+
+def write_bundle(locale, tree, directory=BUNDLES_DIR):
+    """
+    Write one locale's hashed bundle and its compressed variants; returns the
+    manifest entry plus 'written' (False when the bundle already existed)
+    """
+    directory = Path(directory)
+    data = minify_messages(tree).encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    name = f'{locale}.{digest}.json'
+    entry = {'file': name, 'hash': digest, 'bytes': len(data)}
+
+    written = write_atomic(directory / name, data)
+    for suffix, compressed in compress_variants(data).items():
+        written = write_atomic(directory / f'{name}{suffix}', compressed) or written
+        entry['gzip' if suffix == '.gz' else 'brotli'] = len(compressed)
+    return {**entry, 'written': written}
+
+
+def build_bundles(locales, messages_dir=MESSAGES_DIR, directory=BUNDLES_DIR):
+    """
+    Bundle messages/<locale>.json for each locale and update the manifest
+    (other locales' entries are kept). Returns {locale: entry with 'written'}
+    """
+    messages_dir = Path(messages_dir)
+    directory = Path(directory)
+    results = {}
+    for locale in locales:
+        with open(messages_dir / f'{locale}.json', 'r', encoding='utf-8') as f:
+            results[locale] = write_bundle(locale, json.load(f), directory)
+
+    with _manifest_lock:
+        manifest = load_bundle_manifest(directory)
+        bundles = manifest.setdefault('bundles', {})
+        for locale, entry in results.items():
+            bundles[locale] = {key: value for key, value in entry.items() if key != 'written'}
+        manifest['bundles'] = dict(sorted(bundles.items()))
+        write_atomic(directory / MANIFEST_NAME, dump_messages(manifest))
+
+        # Superseded bundles of the rebuilt locales (and their variants) go away
+        current = {entry['file'] for entry in manifest['bundles'].values()}
+        for path in directory.glob('*.json*'):
+            base = path.name.split('.json')[0] + '.json'
+            if path.name != MANIFEST_NAME and base not in current and base.split('.')[0] in results:
+                path.unlink()
+    return results
@@ -0,0 +1,82 @@
+"""
+CHECKPOINT JOURNAL
+Completed translations are appended to a per-locale JSONL journal while a run
+is in progress and fsynced every few dozen strings or seconds. With --resume
+a crashed run picks up where it stopped instead of repeating hours of work;
+the journal is discarded once the locale file has been written
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from .paths import CACHE_DIR
+
+DEFAULT_JOURNAL_DIR = CACHE_DIR / 'journal'
+
+CHECKPOINT_EVERY = 50
+CHECKPOINT_INTERVAL = 10.0
+
+
+class CheckpointJournal:
+    """Append-only record of source -> translation pairs completed for one locale and scope"""
+
+    def __init__(self, locale, scope='', directory=DEFAULT_JOURNAL_DIR, resume=False,
+                 every=CHECKPOINT_EVERY, interval=CHECKPOINT_INTERVAL):
+        self.path = Path(directory) / f"{locale}.{scope or 'all'}.jsonl"
+        self.every = every
+        self.interval = interval
+        self.completed = {}
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            self._load()
+        else:
+            self.path.write_text('', encoding='utf-8')
+        # Keep buffered results when the run dies on an exception or Ctrl+C
+        atexit.register(self.flush)
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash can leave the final line half-written
+                    continue
+                self.completed[entry['s']] = entry['t']
+
+    def record(self, source, translation):
+        """Note a finished translation, checkpointing to disk periodically"""
+        with self._lock:
+            self.completed[source] = translation
+            self._buffer.append(json.dumps({'s': source, 't': translation}, ensure_ascii=False))
+            if len(self._buffer) >= self.every or time.monotonic() - self._last_flush >= self.interval:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(self._buffer) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def discard(self):
+        """Remove the journal once its results are safely in the locale file"""
+        atexit.unregister(self.flush)
+        with self._lock:
+            self._buffer = []
+            if self.path.exists():
+                self.path.unlink()
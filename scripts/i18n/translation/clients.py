@@ -0,0 +1,78 @@
+"""
+POOLED TRANSLATOR CLIENTS
+Translator objects are built once per (backend, target) and reused for the
+life of the process instead of once per string. deep_translator clients keep
+per-request state on the instance, so each worker thread gets its own copy.
+All of them share one keep-alive HTTP session with a bounded connection pool
+
+Environment overrides:
+  TRANSLATION_HTTP_POOL_SIZE=<n>         Max kept-alive connections per host (default 16)
+  TRANSLATION_HTTP_POOL_HOSTS=<n>        Number of hosts with their own pool (default 4)
+"""
+
+import os
+import threading
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_POOL_HOSTS = 4
+
+_local = threading.local()
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_client(backend, target, factory):
+    """Return this thread's client for (backend, target), building it with factory() once"""
+    clients = getattr(_local, 'clients', None)
+    if clients is None:
+        clients = _local.clients = {}
+    key = (backend, target)
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = factory()
+    return client
+
+
+def get_http_session():
+    """Process-wide requests.Session with a sized keep-alive connection pool"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            pool_size = int(os.environ.get('TRANSLATION_HTTP_POOL_SIZE') or DEFAULT_POOL_SIZE)
+            pool_hosts = int(os.environ.get('TRANSLATION_HTTP_POOL_HOSTS') or DEFAULT_POOL_HOSTS)
+            adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+class _SessionRequests:
+    """Drop-in for the requests module that routes calls through the shared session"""
+
+    def __init__(self, requests_module):
+        self._requests = requests_module
+
+    def get(self, url, **kwargs):
+        return get_http_session().get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return get_http_session().post(url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._requests, name)
+
+
+def use_shared_session(module):
+    """
+    Point a backend module's module-level requests.get/post at the shared session.
+    deep_translator calls requests.get() directly and offers no session hook
+    """
+    requests_module = getattr(module, 'requests', None)
+    if requests_module is None or isinstance(requests_module, _SessionRequests):
+        return
+    module.requests = _SessionRequests(requests_module)
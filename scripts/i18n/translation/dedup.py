@@ -0,0 +1,134 @@
+"""
+SOURCE STRING DEDUPLICATION
+en.json repeats labels like "Active" or "Pending" dozens of times, so each
+unique source string is translated once and fanned back out to every key path.
+Strings whose translation failed are never replaced with the English source:
+the key keeps its existing locale value, or is left out when there is none
+"""
+
+from .batching import make_batches
+from .keyspace import FlatMessages, flatten_messages
+from .retry import TranslationFailed
+
+
+def collect_unique_strings(obj):
+    """Collect unique translatable strings (list items included) in first-seen order"""
+    return flatten_messages(obj).unique_strings()
+
+
+def apply_translations(obj, translations, existing=None):
+    """Rebuild an object with every string replaced by its translation (or existing value)"""
+    source = flatten_messages(obj)
+    current = source.keyspace.flatten(existing if isinstance(existing, dict) else {}, extend=False)
+    result = FlatMessages(source.keyspace)
+    for slot, _, value in source.items():
+        if isinstance(value, str):
+            translated = translations.get(value)
+            if translated is None:
+                translated = current.value_at(slot)
+                if not isinstance(translated, str):
+                    continue
+            value = translated
+        result.set_slot(slot, value)
+    return result.to_tree()
+
+
+def translate_strings(
+    unique_strings,
+    translate_fn,
+    progress_callback=None,
+    engine=None,
+    batch_fn=None,
+    failed=None,
+    journal=None,
+    tiers=None,
+    on_tier=None,
+):
+    """
+    Translate a list of unique strings, returning a source -> translation map.
+    With batch_fn, short strings are grouped and sent through batch_fn(texts),
+    which returns None for any string it could not translate. Failed sources
+    are left out of the map and added to the `failed` set when one is given.
+    With a checkpoint journal, strings it already holds are skipped and every
+    new translation is recorded as soon as it completes.
+    With tiers (unique_strings split into priority groups, most important
+    first, see usage.prioritize_strings) each group finishes before the next
+    starts, and on_tier(translations so far) runs after every group but the last
+    """
+    if tiers is None:
+        tiers = [unique_strings]
+    translations = {}
+    for number, tier in enumerate(tiers, 1):
+        translations.update(
+            _translate_group(tier, translate_fn, progress_callback, engine, batch_fn, failed, journal)
+        )
+        if on_tier is not None and number < len(tiers):
+            on_tier(dict(translations))
+    return translations
+
+
+def _translate_group(unique_strings, translate_fn, progress_callback, engine, batch_fn, failed, journal):
+    translations = {}
+    if journal is not None:
+        for text in unique_strings:
+            if text in journal.completed:
+                translations[text] = journal.completed[text]
+        unique_strings = [text for text in unique_strings if text not in translations]
+
+    def on_result(text, translated):
+        if journal is not None and translated is not None:
+            journal.record(text, translated)
+
+    if batch_fn is None:
+        units = [[text] for text in unique_strings]
+    else:
+        units = make_batches(unique_strings)
+
+    def run_unit(texts):
+        if len(texts) == 1:
+            try:
+                return [translate_fn(texts[0])]
+            except TranslationFailed:
+                return [None]
+        return batch_fn(texts)
+
+    if engine is not None:
+        results = engine.translate_units(units, run_unit, progress_callback, on_result)
+    else:
+        results = {}
+        for unit in units:
+            for text, translated in zip(unit, run_unit(unit)):
+                results[text] = translated
+                on_result(text, translated)
+                if progress_callback:
+                    progress_callback()
+
+    for text, translated in results.items():
+        if translated is None:
+            if failed is not None:
+                failed.add(text)
+        else:
+            translations[text] = translated
+    return translations
+
+
+def translate_unique(
+    obj,
+    translate_fn,
+    progress_callback=None,
+    unique_strings=None,
+    engine=None,
+    batch_fn=None,
+    failed=None,
+    existing=None,
+    journal=None,
+    tiers=None,
+    on_tier=None,
+):
+    """Translate each unique string in an object once and fan results back out"""
+    if unique_strings is None:
+        unique_strings = collect_unique_strings(obj)
+    translations = translate_strings(
+        unique_strings, translate_fn, progress_callback, engine, batch_fn, failed, journal, tiers, on_tier
+    )
+    return apply_translations(obj, translations, existing)
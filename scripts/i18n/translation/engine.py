@@ -0,0 +1,130 @@
+"""
+CONCURRENT TRANSLATION ENGINE
+A shared thread pool runs translation calls for many strings and locales at
+once. Throughput is governed by a token bucket per backend instead of fixed
+sleeps, and results are keyed by source string so output matches a serial run
+
+Environment overrides:
+  TRANSLATION_CONCURRENCY=<n>            Max in-flight translation calls (default 8)
+  TRANSLATION_RATE_LIMIT_<BACKEND>=<n>   Requests per second for a backend, e.g.
+                                         TRANSLATION_RATE_LIMIT_GOOGLE=5
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .metrics import record_throttle
+
+DEFAULT_CONCURRENCY = 8
+
+# Sustained requests per second allowed for each backend
+DEFAULT_RATE_LIMITS = {
+    'google': 10.0,
+    'deepl': 5.0,
+    'libre': 2.0,
+    'fake': 1000.0,
+}
+FALLBACK_RATE_LIMIT = 5.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate, capacity=None, name=None):
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        started = None
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    break
+                wait = (tokens - self.tokens) / self.rate
+            started = started or now
+            time.sleep(wait)
+        if started and self.name:
+            record_throttle(self.name, 'rate_limit', time.monotonic() - started)
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(backend):
+    """Return the process-wide token bucket for a backend"""
+    with _rate_limiters_lock:
+        if backend not in _rate_limiters:
+            configured = os.environ.get(f'TRANSLATION_RATE_LIMIT_{backend.upper()}')
+            rate = float(configured) if configured else DEFAULT_RATE_LIMITS.get(backend, FALLBACK_RATE_LIMIT)
+            _rate_limiters[backend] = TokenBucket(rate, name=backend)
+        return _rate_limiters[backend]
+
+
+def set_rate_limiter(backend, limiter):
+    """Replace the process-wide token bucket for a backend"""
+    with _rate_limiters_lock:
+        _rate_limiters[backend] = limiter
+    return limiter
+
+
+def concurrency_from_args(argv):
+    """Read --concurrency=N from argv, then TRANSLATION_CONCURRENCY, then the default"""
+    for arg in argv:
+        if arg.startswith('--concurrency='):
+            return max(1, int(arg.split('=', 1)[1]))
+    configured = os.environ.get('TRANSLATION_CONCURRENCY')
+    return max(1, int(configured)) if configured else DEFAULT_CONCURRENCY
+
+
+class TranslationEngine:
+    """Shared worker pool for translating strings across many locales concurrently"""
+
+    def __init__(self, max_workers=DEFAULT_CONCURRENCY):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='translate')
+
+    def translate_strings(self, unique_strings, translate_fn, progress_callback=None):
+        """Translate unique strings on the pool, returning a source -> translation map"""
+        units = [[text] for text in unique_strings]
+        return self.translate_units(units, lambda texts: [translate_fn(texts[0])], progress_callback)
+
+    def translate_units(self, units, unit_fn, progress_callback=None, on_result=None):
+        """Run unit_fn(texts) for each group of strings on the pool, returning a source -> translation map"""
+        futures = {self._executor.submit(unit_fn, unit): unit for unit in units}
+        translations = {}
+        for future in as_completed(futures):
+            for text, translated in zip(futures[future], future.result()):
+                translations[text] = translated
+                if on_result:
+                    on_result(text, translated)
+                if progress_callback:
+                    progress_callback()
+        return translations
+
+    def map_locales(self, fn, items):
+        """Run fn over items (e.g. locales) concurrently, returning results in input order"""
+        items = list(items)
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(items), self.max_workers), thread_name_prefix='locale') as pool:
+            return list(pool.map(fn, items))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
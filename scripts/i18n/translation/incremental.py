@@ -0,0 +1,187 @@
+"""
+INCREMENTAL TRANSLATION
+Each locale keeps a manifest of the en.json source hash every key was
+translated from. Only added or changed keys are sent to the backend, removed
+keys are dropped and untouched keys keep their existing translation verbatim.
+Keys that fail to translate get no manifest hash, so the next run retries them.
+Saving a manifest also records its hashes in the committed lockfile (see
+lockfile.py). Manifests are local (.translation-cache), so on a fresh checkout
+a locale starts from the lockfile; with no record at all, keys the locale file
+already translates count as current instead of being re-translated (values
+that are still a copy of the English source do not, see is_translated)
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from .dedup import translate_strings
+from .keyspace import FlatMessages, flatten_messages
+from .masking import mask_text
+from .paths import CACHE_DIR, MESSAGES_DIR
+from .writer import write_json
+
+DEFAULT_MANIFEST_DIR = CACHE_DIR / 'manifests'
+LOCKFILE_NAME = 'translations.lock'
+DEFAULT_LOCKFILE_PATH = MESSAGES_DIR / LOCKFILE_NAME
+
+
+def hash_source(text):
+    """Short stable hash of an English source string"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def join_path(prefix, key):
+    return f"{prefix}.{key}" if prefix else key
+
+
+def iter_strings(obj, prefix=''):
+    """Yield (key path, string) for every translatable leaf, list items included, in tree order"""
+    for _, key, text in flatten_messages(obj).strings():
+        yield join_path(prefix, key), text
+
+
+def source_hashes(obj, prefix='', exclude=None):
+    """Map every string key path under prefix to the hash of its source, skipping excluded sources"""
+    exclude = exclude or ()
+    return {path: hash_source(text) for path, text in iter_strings(obj, prefix) if text not in exclude}
+
+
+def paths_for_sources(obj, sources, prefix=''):
+    """Key paths whose source string is in sources, e.g. the keys hit by failed translations"""
+    return [path for path, text in iter_strings(obj, prefix) if text in sources]
+
+
+def is_translated(value, source):
+    """
+    True when a locale value can count as a translation of source: it exists
+    and is not a verbatim copy of translatable English (an old fallback).
+    Strings that are only placeholders and protected terms stay as they are
+    """
+    if not isinstance(value, str):
+        return False
+    return value != source or mask_text(source).opaque
+
+
+def plan_changes(en_tree, locale_tree, hashes, prefix=''):
+    """
+    Return {key path: source} for keys that are new, changed or missing in the
+    locale. hashes=None means nothing was ever recorded for the locale: only
+    keys it has no translation of (missing, or an English copy) are planned
+    """
+    source = flatten_messages(en_tree)
+    current = source.keyspace.flatten(locale_tree, extend=False)
+    changed = {}
+    for slot, key, text in source.strings():
+        path = join_path(prefix, key)
+        value = current.value_at(slot)
+        if hashes is None:
+            if not is_translated(value, text):
+                changed[path] = text
+        elif hashes.get(path) != hash_source(text) or not isinstance(value, str):
+            changed[path] = text
+    return changed
+
+
+def translate_incremental(
+    en_tree,
+    locale_tree,
+    hashes,
+    translate_fn,
+    progress_callback=None,
+    prefix='',
+    changed=None,
+    engine=None,
+    batch_fn=None,
+    failed=None,
+    journal=None,
+    tiers=None,
+    on_tier=None,
+):
+    """Translate only changed keys and rebuild the locale tree in en.json order"""
+    if changed is None:
+        changed = plan_changes(en_tree, locale_tree, hashes, prefix)
+    if failed is None:
+        failed = set()
+    unique_strings = list(dict.fromkeys(changed.values()))
+    translations = translate_strings(
+        unique_strings, translate_fn, progress_callback, engine, batch_fn, failed, journal, tiers, on_tier
+    )
+    tree = merge_changes(en_tree, locale_tree, changed, translations, prefix)
+    return tree, change_stats(en_tree, locale_tree, changed, failed, prefix)
+
+
+def change_stats(en_tree, locale_tree, changed, failed=(), prefix=''):
+    """Counts of changed, unique, kept, removed and failed keys for an incremental update"""
+    en_paths = {path for path, _ in iter_strings(en_tree, prefix)}
+    old_paths = {path for path, _ in iter_strings(locale_tree, prefix)}
+    return {
+        'changed': len(changed),
+        'unique': len(set(changed.values())),
+        'kept': len(en_paths) - len(changed),
+        'removed': len(old_paths - en_paths),
+        'failed': sum(1 for text in changed.values() if text in failed),
+    }
+
+
+def merge_changes(en_tree, locale_tree, changed, translations, prefix=''):
+    """Rebuild a locale tree in en.json order: changed keys take their translation, the rest keep their value"""
+    source = flatten_messages(en_tree)
+    current = source.keyspace.flatten(locale_tree, extend=False)
+    result = FlatMessages(source.keyspace)
+    for slot, key, value in source.items():
+        if isinstance(value, str):
+            if join_path(prefix, key) in changed and value in translations:
+                value = translations[value]
+            else:
+                value = current.value_at(slot)
+                if not isinstance(value, str):
+                    continue
+        result.set_slot(slot, value)
+    return result.to_tree()
+
+
+class SourceManifest:
+    """Per-locale record of the source hash each translated key came from"""
+
+    def __init__(self, locale, directory=DEFAULT_MANIFEST_DIR, lockfile=DEFAULT_LOCKFILE_PATH):
+        self.locale = locale
+        self.path = Path(directory) / f'{locale}.json'
+        self.lockfile = lockfile
+        self.hashes = {}
+        # Namespaces rewritten since loading; save() records only these in the lockfile
+        self.scopes = set()
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.hashes = json.load(f)
+        elif lockfile is not None and Path(lockfile).exists():
+            from .lockfile import TranslationLock
+
+            self.hashes = TranslationLock(lockfile).locale_hashes(locale)
+        self.recorded = self.path.exists() or bool(self.hashes)
+
+    def scoped(self, prefix=''):
+        """Hashes for keys under prefix (all keys when prefix is empty); None when nothing is recorded"""
+        if not self.recorded:
+            return None
+        if not prefix:
+            return dict(self.hashes)
+        start = prefix + '.'
+        return {path: h for path, h in self.hashes.items() if path.startswith(start)}
+
+    def replace_scope(self, prefix, hashes):
+        """Replace every hash under prefix, leaving other namespaces alone"""
+        if prefix:
+            start = prefix + '.'
+            self.hashes = {path: h for path, h in self.hashes.items() if not path.startswith(start)}
+        else:
+            self.hashes = {}
+        self.hashes.update(hashes)
+        self.scopes.add(prefix)
+
+    def save(self):
+        from .lockfile import record_locale_hashes
+
+        write_json(self.path, self.hashes, ensure_ascii=False, indent=2, sort_keys=True)
+        if self.lockfile is not None and self.scopes:
+            record_locale_hashes(self.lockfile, self.locale, self.hashes, self.scopes)
@@ -0,0 +1,331 @@
+"""
+DURABLE JOB QUEUE
+Large refreshes are split into (locale, string range) tasks in a SQLite
+queue that any number of worker processes drain concurrently. A worker
+leases one task at a time and heartbeats while it works; a task whose lease
+expires (worker killed, host gone) is handed to the next worker. Results are
+stored per task and merged by source string, so the locale files come out
+identical whatever order or worker the tasks finished in.
+
+A run snapshots its source tree and the ordered unique strings, so workers
+need only the queue file, not the same checkout. Locally the file uses WAL
+mode. WAL needs shared memory between processes, which network filesystems do
+not provide, so a queue shared by several hosts must be opened in shared mode:
+a rollback journal with full syncs on a filesystem with working POSIX locks,
+waiting out other hosts' write locks instead of failing
+
+Environment overrides:
+  TRANSLATION_QUEUE_PATH=<file>    Location of the SQLite file
+  TRANSLATION_QUEUE_SHARED=1       Shared mode, for a file on NFS/SMB used by several hosts
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from .paths import CACHE_DIR
+
+DEFAULT_QUEUE_PATH = CACHE_DIR / 'queue.sqlite3'
+
+DEFAULT_CHUNK = 200
+DEFAULT_LEASE = 120.0
+
+# Seconds a connection waits for another process's write lock before giving up
+BUSY_TIMEOUT = 60
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    scope TEXT NOT NULL,
+    options TEXT NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS strings (
+    run TEXT NOT NULL,
+    locale TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    PRIMARY KEY (run, locale, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    run TEXT NOT NULL,
+    locale TEXT NOT NULL,
+    target TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (run, status, id);
+CREATE TABLE IF NOT EXISTS results (
+    run TEXT NOT NULL,
+    locale TEXT NOT NULL,
+    source TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    PRIMARY KEY (run, locale, source)
+) WITHOUT ROWID;
+'''
+
+
+def worker_name():
+    """host:pid plus a short random suffix, unique across hosts sharing a queue"""
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}'
+
+
+class Task:
+    """One leased (locale, string range) unit of work"""
+
+    __slots__ = ('id', 'run', 'locale', 'target', 'start', 'end', 'attempts', 'strings')
+
+    def __init__(self, id, run, locale, target, start, end, attempts, strings):
+        self.id = id
+        self.run = run
+        self.locale = locale
+        self.target = target
+        self.start = start
+        self.end = end
+        self.attempts = attempts
+        self.strings = strings
+
+    def __repr__(self):
+        return f'Task({self.id}, {self.locale}[{self.start}:{self.end}])'
+
+
+class JobQueue:
+    """SQLite-backed task queue with leases, heartbeats and per-task results"""
+
+    def __init__(self, path=None, shared=None):
+        self.path = Path(path or os.environ.get('TRANSLATION_QUEUE_PATH') or DEFAULT_QUEUE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if shared is None:
+            shared = os.environ.get('TRANSLATION_QUEUE_SHARED', '').lower() in ('1', 'true', 'yes', 'on')
+        self.shared = shared
+        self._lock = threading.Lock()
+        # Autocommit; claims and completions open their own IMMEDIATE transactions
+        self._conn = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        self._conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT * 1000}')
+        if shared:
+            self._conn.execute('PRAGMA journal_mode=DELETE')
+            self._conn.execute('PRAGMA synchronous=FULL')
+        else:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    def _transaction(self, fn):
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = fn(self._conn)
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+            return result
+
+    def submit(self, scope, source_tree, jobs, options=None, chunk=DEFAULT_CHUNK):
+        """
+        Create a run. jobs maps locale -> (backend target code, ordered unique
+        strings); each locale's strings are split into tasks of `chunk` strings.
+        Returns the run id
+        """
+        run = time.strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+        now = time.time()
+
+        def insert(conn):
+            conn.execute(
+                'INSERT INTO runs VALUES (?, ?, ?, ?, ?)',
+                (run, now, scope, json.dumps(options or {}), json.dumps(source_tree, ensure_ascii=False)),
+            )
+            for locale, (target, strings) in jobs.items():
+                conn.executemany(
+                    'INSERT INTO strings VALUES (?, ?, ?, ?)',
+                    ((run, locale, position, text) for position, text in enumerate(strings)),
+                )
+                conn.executemany(
+                    'INSERT INTO tasks (run, locale, target, start, end, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                    ((run, locale, target, start, min(start + chunk, len(strings)), now)
+                     for start in range(0, len(strings), chunk)),
+                )
+
+        self._transaction(insert)
+        return run
+
+    def latest_run(self):
+        with self._lock:
+            row = self._conn.execute('SELECT id FROM runs ORDER BY created_at DESC LIMIT 1').fetchone()
+        return row[0] if row else None
+
+    def run_info(self, run):
+        """(scope, options, source tree) of a run, or None"""
+        with self._lock:
+            row = self._conn.execute('SELECT scope, options, source FROM runs WHERE id = ?', (run,)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), json.loads(row[2])
+
+    def claim(self, run, worker, lease=DEFAULT_LEASE):
+        """Lease the next pending (or abandoned) task of a run, or return None"""
+        def lease_next(conn):
+            now = time.time()
+            row = conn.execute(
+                '''SELECT id, locale, target, start, end, attempts FROM tasks
+                   WHERE run = ? AND (status = 'pending' OR (status = 'leased' AND lease_until < ?))
+                   ORDER BY id LIMIT 1''',
+                (run, now),
+            ).fetchone()
+            if row is None:
+                return None
+            task_id, locale, target, start, end, attempts = row
+            conn.execute(
+                '''UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1,
+                   updated_at = ? WHERE id = ?''',
+                (worker, now + lease, now, task_id),
+            )
+            strings = [text for (text,) in conn.execute(
+                'SELECT source FROM strings WHERE run = ? AND locale = ? AND position >= ? AND position < ? ORDER BY position',
+                (run, locale, start, end),
+            )]
+            return Task(task_id, run, locale, target, start, end, attempts + 1, strings)
+
+        return self._transaction(lease_next)
+
+    def heartbeat(self, task, worker, lease=DEFAULT_LEASE):
+        """Extend a lease; False when the task was reclaimed by another worker"""
+        now = time.time()
+        with self._lock:
+            updated = self._conn.execute(
+                '''UPDATE tasks SET lease_until = ?, updated_at = ?
+                   WHERE id = ? AND worker = ? AND status = 'leased' ''',
+                (now + lease, now, task.id, worker),
+            ).rowcount
+        return updated == 1
+
+    def complete(self, task, worker, translations):
+        """
+        Store a task's results ({source: translation}; missing sources failed)
+        and mark it done. False when the lease was lost and another worker owns it
+        """
+        def finish(conn):
+            owner = conn.execute('SELECT worker, status FROM tasks WHERE id = ?', (task.id,)).fetchone()
+            if owner is None or owner[0] != worker or owner[1] != 'leased':
+                return False
+            conn.executemany(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                ((task.run, task.locale, text, translations[text]) for text in task.strings if text in translations),
+            )
+            failed = sum(1 for text in task.strings if text not in translations)
+            conn.execute(
+                '''UPDATE tasks SET status = 'done', lease_until = NULL, failed = ?, updated_at = ? WHERE id = ?''',
+                (failed, time.time(), task.id),
+            )
+            return True
+
+        return self._transaction(finish)
+
+    def release(self, task, worker):
+        """Give a leased task back to the queue (e.g. on Ctrl+C)"""
+        with self._lock:
+            self._conn.execute(
+                '''UPDATE tasks SET status = 'pending', worker = NULL, lease_until = NULL, updated_at = ?
+                   WHERE id = ? AND worker = ? AND status = 'leased' ''',
+                (time.time(), task.id, worker),
+            )
+
+    def status(self, run):
+        """{locale: {'pending': n, 'leased': n, 'done': n, 'failed_strings': n, 'strings': n}} (expired leases count as pending)"""
+        with self._lock:
+            rows = self._conn.execute(
+                '''SELECT locale,
+                          CASE WHEN status = 'leased' AND lease_until < ? THEN 'pending' ELSE status END AS state,
+                          COUNT(*), SUM(failed), SUM(end - start)
+                   FROM tasks WHERE run = ? GROUP BY locale, state ORDER BY MIN(id)''',
+                (time.time(), run),
+            ).fetchall()
+        report = {}
+        for locale, state, count, failed, strings in rows:
+            entry = report.setdefault(locale, {'pending': 0, 'leased': 0, 'done': 0, 'failed_strings': 0, 'strings': 0})
+            entry[state] += count
+            entry['failed_strings'] += failed or 0
+            entry['strings'] += strings or 0
+        return report
+
+    def is_drained(self, run):
+        """True when no task of the run is pending or leased"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE run = ? AND status != 'done'", (run,)
+            ).fetchone()
+        return row[0] == 0
+
+    def retry_failed(self, run):
+        """Put done tasks with failed strings back in the queue; returns how many"""
+        with self._lock:
+            return self._conn.execute(
+                '''UPDATE tasks SET status = 'pending', worker = NULL, updated_at = ?
+                   WHERE run = ? AND status = 'done' AND failed > 0''',
+                (time.time(), run),
+            ).rowcount
+
+    def results(self, run, locale):
+        """{source: translation} for a locale, independent of task completion order"""
+        with self._lock:
+            return dict(self._conn.execute(
+                'SELECT source, translation FROM results WHERE run = ? AND locale = ? ORDER BY source',
+                (run, locale),
+            ))
+
+    def strings(self, run, locale):
+        """Every source string queued for a locale, in queue order"""
+        with self._lock:
+            return [text for (text,) in self._conn.execute(
+                'SELECT source FROM strings WHERE run = ? AND locale = ? ORDER BY position', (run, locale)
+            )]
+
+    def locales(self, run):
+        with self._lock:
+            return [locale for (locale,) in self._conn.execute(
+                'SELECT locale FROM tasks WHERE run = ? GROUP BY locale ORDER BY MIN(id)', (run,)
+            )]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class Heartbeat:
+    """Background thread that keeps a task's lease alive while a worker translates it"""
+
+    def __init__(self, queue, task, worker, lease=DEFAULT_LEASE):
+        self.queue = queue
+        self.task = task
+        self.worker = worker
+        self.lease = lease
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f'heartbeat-{task.id}', daemon=True)
+
+    def _beat(self):
+        while not self._stop.wait(self.lease / 3):
+            if not self.queue.heartbeat(self.task, self.worker, self.lease):
+                self.lost = True
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
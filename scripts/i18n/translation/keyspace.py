@@ -0,0 +1,208 @@
+"""
+FLAT MESSAGE REPRESENTATION
+A KeySpace is the ordered set of leaf key paths of a message tree, including
+list indices (profile.endorsements.skill1-endorsers[0]). Paths are interned
+once and shared by every locale, so a locale is just a FlatMessages: one list
+of value slots indexed by the key space. Leaves are strings, other scalars and
+empty containers, which keeps flatten -> to_tree() lossless. Key order is en.json
+order, with keys that only exist in other locales appended in first-seen order
+"""
+
+import json
+import sys
+
+# Marks an empty value slot (key not present in this locale)
+MISSING = object()
+
+
+def format_path(path):
+    """('a', 'b', 0) -> 'a.b[0]'"""
+    key = ''
+    for part in path:
+        if isinstance(part, int):
+            key += f'[{part}]'
+        else:
+            key = f'{key}.{part}' if key else part
+    return key
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _walk(node, path, visit):
+    if isinstance(node, dict) and node:
+        for key, value in node.items():
+            _walk(value, path + (sys.intern(key),), visit)
+    elif isinstance(node, list) and node:
+        for index, value in enumerate(node):
+            _walk(value, path + (index,), visit)
+    elif path:
+        visit(path, node)
+
+
+class KeySpace:
+    """Ordered, interned leaf key paths shared across locales"""
+
+    def __init__(self):
+        self.paths = []
+        self.keys = []
+        self._slots = {}
+
+    @classmethod
+    def from_tree(cls, tree):
+        keyspace = cls()
+        keyspace.flatten(tree)
+        return keyspace
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def slot(self, key):
+        """Slot index of a dotted key, or None"""
+        return self._slots.get(key)
+
+    def add(self, path):
+        """Slot for a path tuple, appending it when new"""
+        key = sys.intern(format_path(path))
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self.keys)
+            self._slots[key] = slot
+            self.keys.append(key)
+            self.paths.append(path)
+        return slot
+
+    def flatten(self, tree, extend=True):
+        """
+        Flatten a nested tree into value slots of this key space. With
+        extend=False, leaves whose path is not already known are dropped
+        """
+        messages = FlatMessages(self)
+        values = messages.values
+
+        def visit(path, value):
+            if extend:
+                slot = self.add(path)
+            else:
+                slot = self._slots.get(format_path(path))
+                if slot is None:
+                    return
+            if slot >= len(values):
+                values.extend([MISSING] * (slot + 1 - len(values)))
+            values[slot] = _intern(value)
+
+        _walk(tree, (), visit)
+        return messages
+
+    def load(self, path, extend=True):
+        """Load a JSON message file straight into flat form (the nested tree is not kept)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return self.flatten(json.load(f), extend)
+
+
+class FlatMessages:
+    """One locale's values as an array of slots over a shared KeySpace"""
+
+    __slots__ = ('keyspace', 'values')
+
+    def __init__(self, keyspace, values=None):
+        self.keyspace = keyspace
+        self.values = values if values is not None else []
+
+    def value_at(self, slot):
+        if slot < len(self.values):
+            return self.values[slot]
+        return MISSING
+
+    def get(self, key, default=None):
+        slot = self.keyspace.slot(key)
+        value = MISSING if slot is None else self.value_at(slot)
+        return default if value is MISSING else value
+
+    def set_slot(self, slot, value):
+        if slot >= len(self.values):
+            self.values.extend([MISSING] * (slot + 1 - len(self.values)))
+        self.values[slot] = _intern(value)
+
+    def __contains__(self, key):
+        return self.get(key, MISSING) is not MISSING
+
+    def items(self):
+        """(slot, key, value) for every present slot in key space order"""
+        keys = self.keyspace.keys
+        for slot, value in enumerate(self.values):
+            if value is not MISSING:
+                yield slot, keys[slot], value
+
+    def strings(self):
+        """(slot, key, text) for every string leaf"""
+        for slot, key, value in self.items():
+            if isinstance(value, str):
+                yield slot, key, value
+
+    def count_strings(self):
+        return sum(1 for value in self.values if isinstance(value, str))
+
+    def unique_strings(self):
+        """Unique string values in first-seen order"""
+        return list(dict.fromkeys(value for value in self.values if isinstance(value, str)))
+
+    def to_tree(self):
+        """Rebuild the nested JSON structure from the present slots"""
+        root = {}
+        paths = self.keyspace.paths
+        for slot, value in enumerate(self.values):
+            if value is MISSING:
+                continue
+            path = paths[slot]
+            node = root
+            for part, following in zip(path, path[1:]):
+                node = _child(node, part, [] if isinstance(following, int) else {})
+            _assign(node, path[-1], _copy_leaf(value))
+        return root
+
+
+def _child(node, part, empty):
+    if isinstance(part, int):
+        while len(node) <= part:
+            node.append(None)
+        if not isinstance(node[part], type(empty)):
+            node[part] = empty
+        return node[part]
+    child = node.get(part)
+    if not isinstance(child, type(empty)):
+        child = node[part] = empty
+    return child
+
+
+def _assign(node, part, value):
+    if isinstance(part, int):
+        while len(node) <= part:
+            node.append(None)
+    node[part] = value
+
+
+def _copy_leaf(value):
+    # Empty containers are leaves; hand out fresh ones so rebuilt trees never share them
+    if isinstance(value, dict):
+        return {}
+    if isinstance(value, list):
+        return []
+    return value
+
+
+def flatten_messages(tree, keyspace=None):
+    """Flatten a tree into its own (or a shared, extended) key space"""
+    return (keyspace or KeySpace()).flatten(tree)
+
+
+def count_strings(tree):
+    """Number of string leaves in a message tree, list items included"""
+    return flatten_messages(tree).count_strings()
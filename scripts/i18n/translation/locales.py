@@ -0,0 +1,52 @@
+"""
+SUPPORTED LOCALES
+The locale list and English names are read from src/i18n/config.ts, the same
+source the app uses, so the translation scripts never drift from it. Backend
+language codes differ from app locale codes only where listed in BACKEND_CODES
+"""
+
+import re
+from functools import lru_cache
+
+from .paths import REPO_ROOT
+
+CONFIG_PATH = REPO_ROOT / 'src' / 'i18n' / 'config.ts'
+SOURCE_LOCALE = 'en'
+
+# App locale -> code sent to the translation backend
+BACKEND_CODES = {'zh': 'zh-CN'}
+
+_LOCALES_RE = re.compile(r'export const locales\s*=\s*\[(.*?)\]', re.S)
+_CODE_RE = re.compile(r"['\"]([a-zA-Z-]+)['\"]")
+_NAME_RE = re.compile(r"^\s*['\"]?([a-zA-Z-]+)['\"]?\s*:\s*\{[^}]*english:\s*['\"]([^'\"]+)['\"]", re.M)
+
+
+@lru_cache(maxsize=None)
+def read_locales(path=CONFIG_PATH):
+    """{locale: {'name': English name, 'code': backend code}} in config.ts order"""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    match = _LOCALES_RE.search(source)
+    if not match:
+        raise ValueError(f'No `export const locales = [...]` found in {path}')
+    # Drop line comments so commented-out locales are not picked up
+    listing = re.sub(r'//[^\n]*', '', match.group(1))
+    names = dict(_NAME_RE.findall(source))
+    return {
+        code: {'name': names.get(code, code), 'code': BACKEND_CODES.get(code, code)}
+        for code in _CODE_RE.findall(listing)
+    }
+
+
+def get_languages(codes=None, include_source=False):
+    """
+    Target languages in the LANGUAGES format the translate scripts use. With
+    codes, only those locales (in that order); unknown codes raise ValueError
+    """
+    available = read_locales()
+    if codes is None:
+        return {code: dict(info) for code, info in available.items() if include_source or code != SOURCE_LOCALE}
+    unknown = [code for code in codes if code not in available]
+    if unknown:
+        raise ValueError(f"Unknown locale(s): {', '.join(unknown)} (see src/i18n/config.ts)")
+    return {code: dict(available[code]) for code in codes}
@@ -0,0 +1,178 @@
+"""
+TRANSLATION LOCKFILE
+translations.lock is committed next to each source tree's locale files
+(src/i18n/messages, src/marketing/i18n/messages). For each locale and key
+path it records the hash of the English source the translation was produced
+from, so CI can tell stale or missing translations apart from current ones
+without a backend, the translation cache or the locale files themselves. It
+is updated whenever the pipeline saves a locale's manifest (see
+incremental.SourceManifest).
+
+Most locales are translated from the same English, so hashes are stored once
+as a baseline (per key, the hash most locales that have it share). Each locale
+lists only the keys whose hash differs from it, plus a base64 bitmap over the
+baseline order of the keys it has no translation of, so partly translated
+locales cost a few KB instead of one line per untranslated key
+"""
+
+import base64
+import json
+import threading
+from collections import Counter
+from pathlib import Path
+
+from .incremental import DEFAULT_LOCKFILE_PATH
+from .paths import CACHE_DIR
+from .writer import write_json
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are still atomic, merges just are not serialized
+    fcntl = None
+
+LOCKFILE_VERSION = 1
+
+# One lock for every lockfile; updates are rare and short
+UPDATE_LOCK_PATH = CACHE_DIR / 'lockfile.flock'
+
+_update_lock = threading.Lock()
+
+
+class TranslationLock:
+    """Per-locale, per-key source hashes, stored as a shared baseline plus per-locale differences"""
+
+    def __init__(self, path=DEFAULT_LOCKFILE_PATH):
+        self.path = Path(path)
+        self.baseline = {}
+        self.locales = {}
+        self.exists = self.path.exists()
+        if self.exists:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.baseline = data.get('baseline', {})
+            paths = list(self.baseline)
+            for locale, entry in data.get('locales', {}).items():
+                differences = dict(entry.get('differs', {}))
+                for index in _decode_bitmap(entry.get('absent', '')):
+                    differences[paths[index]] = None
+                self.locales[locale] = differences
+
+    def recorded(self, locale, path):
+        """Source hash a locale's key was translated from, or None when it has none"""
+        differences = self.locales.get(locale)
+        if differences is None:
+            return None
+        if path in differences:
+            return differences[path]
+        return self.baseline.get(path)
+
+    def locale_hashes(self, locale):
+        """{path: hash} for every key a locale has a translation of"""
+        if locale not in self.locales:
+            return {}
+        differences = self.locales[locale]
+        hashes = {path: h for path, h in self.baseline.items() if path not in differences}
+        hashes.update((path, h) for path, h in differences.items() if h is not None)
+        return hashes
+
+    def set_locale(self, locale, hashes):
+        """Replace a locale's hashes and re-derive the baseline"""
+        self.set_locales({locale: hashes})
+
+    def set_locales(self, locale_hashes):
+        """Replace the hashes of several locales ({locale: {path: hash}}) at once"""
+        recorded = {name: self.locale_hashes(name) for name in self.locales if name not in locale_hashes}
+        recorded.update((name, dict(hashes)) for name, hashes in locale_hashes.items())
+
+        votes = {}
+        for hashes in recorded.values():
+            for path, h in hashes.items():
+                votes.setdefault(path, Counter())[h] += 1
+        # Every recorded key is in the baseline, so locales missing it only cost a bit
+        self.baseline = {path: votes[path].most_common(1)[0][0] for path in sorted(votes)}
+
+        self.locales = {}
+        for name in sorted(recorded):
+            hashes = recorded[name]
+            differences = {path: h for path, h in hashes.items() if self.baseline.get(path) != h}
+            differences.update((path, None) for path in self.baseline if path not in hashes)
+            self.locales[name] = dict(sorted(differences.items()))
+
+    def save(self):
+        positions = {path: index for index, path in enumerate(self.baseline)}
+        locales = {}
+        for locale, differences in self.locales.items():
+            entry = {}
+            absent = [positions[path] for path, h in differences.items() if h is None and path in positions]
+            if absent:
+                entry['absent'] = _encode_bitmap(absent, len(positions))
+            entry['differs'] = {path: h for path, h in differences.items() if h is not None}
+            locales[locale] = entry
+        write_json(
+            self.path,
+            {'version': LOCKFILE_VERSION, 'baseline': self.baseline, 'locales': locales},
+            ensure_ascii=False,
+            indent=1,
+        )
+        self.exists = True
+
+    def check(self, source_hashes, locales):
+        """
+        Compare current English hashes ({path: hash}, en.json order) with what
+        each locale was translated from; returns {locale: {'stale': [paths],
+        'missing': [paths]}} in one pass over the source
+        """
+        report = {locale: {'stale': [], 'missing': []} for locale in locales}
+        entries = [(locale, self.locales.get(locale), report[locale]) for locale in locales]
+        baseline = self.baseline
+        for path, h in source_hashes.items():
+            base = baseline.get(path)
+            for _, differences, result in entries:
+                if differences is None:
+                    result['missing'].append(path)
+                    continue
+                recorded = differences[path] if path in differences else base
+                if recorded is None:
+                    result['missing'].append(path)
+                elif recorded != h:
+                    result['stale'].append(path)
+        return report
+
+
+def _encode_bitmap(indexes, size):
+    bits = bytearray((size + 7) // 8)
+    for index in indexes:
+        bits[index >> 3] |= 1 << (index & 7)
+    return base64.b64encode(bytes(bits)).decode('ascii')
+
+
+def _decode_bitmap(encoded):
+    indexes = []
+    for offset, byte in enumerate(base64.b64decode(encoded)):
+        for bit in range(8):
+            if byte & (1 << bit):
+                indexes.append(offset * 8 + bit)
+    return indexes
+
+
+def in_scopes(path, scopes):
+    """True when a key path lies under one of the namespace prefixes ('' covers every key)"""
+    return any(not scope or path == scope or path.startswith((scope + '.', scope + '[')) for scope in scopes)
+
+
+def record_locale_hashes(path, locale, hashes, scopes=('',)):
+    """
+    Merge one locale's hashes for the translated scopes into a lockfile; keys
+    outside them keep what the lockfile recorded. Safe across threads and processes
+    """
+    path = Path(path)
+    with _update_lock:
+        UPDATE_LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(UPDATE_LOCK_PATH, 'w') as flock:
+            if fcntl is not None:
+                fcntl.flock(flock, fcntl.LOCK_EX)
+            lock = TranslationLock(path)
+            recorded = {key: h for key, h in lock.locale_hashes(locale).items() if not in_scopes(key, scopes)}
+            recorded.update((key, h) for key, h in hashes.items() if in_scopes(key, scopes))
+            lock.set_locale(locale, recorded)
+            lock.save()
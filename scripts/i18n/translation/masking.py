@@ -0,0 +1,328 @@
+"""
+PLACEHOLDER AND GLOSSARY MASKING
+Machine translation mangles ICU arguments ({count} -> {cuenta}), rich text
+tags and product names (ATLVS, Slack, QuickBooks). Before a string reaches a
+backend, one left-to-right pass swaps each of them for a numbered sentinel
+(⟦0⟧, ⟦1⟧, ...) that translators pass through untouched. In plural and
+select arguments only the structure is protected (argument name, keyword,
+selectors, braces and plural #); the branch messages stay exposed, so they
+are translated like any other text. Glossary terms are
+found by an Aho-Corasick automaton built once over the whole term list, so
+the pass stays linear in the string however many terms there are.
+
+After translation the sentinels are put back and the result is verified:
+every sentinel exactly once, the same ICU structure and tags as the source
+and every protected term still present. backends.py re-requests only the
+strings that fail, on their own, instead of the whole batch or file
+
+The term list is scripts/i18n/glossary.json ("doNotTranslate"); matches are
+case-sensitive and whole-word
+
+Environment overrides:
+  TRANSLATION_GLOSSARY_PATH=<file>   Alternative term list
+  TRANSLATION_MASKING=off            Send strings to the backend unmasked
+"""
+
+import json
+import os
+import re
+import threading
+from collections import Counter, deque
+
+from .paths import SCRIPTS_DIR
+
+DEFAULT_GLOSSARY_PATH = SCRIPTS_DIR / 'glossary.json'
+
+SENTINEL_OPEN = '⟦'
+SENTINEL_CLOSE = '⟧'
+
+# Translators sometimes pad sentinels with spaces (⟦ 0 ⟧); accept that on the way back
+SENTINEL_RE = re.compile(SENTINEL_OPEN + r'\s*(\d+)\s*' + SENTINEL_CLOSE)
+
+# next-intl rich text tags, matched at the position the scan reached
+TAG_RE = re.compile(r'<\s*/?\s*[A-Za-z][\w-]*\s*/?\s*>')
+
+# Start of {count, plural, ...} / {kind, select, ...} up to the first selector
+BRANCHING_RE = re.compile(r'\{\s*[A-Za-z_][\w.]*\s*,\s*(plural|selectordinal|select)\s*,\s*(?:offset\s*:\s*\d+\s*)?')
+
+# One selector (=0, one, other, female, ...) and the brace opening its message
+SELECTOR_RE = re.compile(r'\s*(?:=\s*\d+|[A-Za-z_][\w-]*)\s*\{')
+
+
+class TermMatcher:
+    """Aho-Corasick automaton over a fixed set of terms, stepped one character at a time"""
+
+    def __init__(self, terms):
+        self.terms = sorted({term for term in terms if term})
+        self._goto = [{}]
+        self._fail = [0]
+        # Lengths of the terms ending at each state, its fail chain included
+        self._out = [()]
+        for term in self.terms:
+            state = 0
+            for ch in term:
+                if ch not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][ch] = len(self._goto) - 1
+                state = self._goto[state][ch]
+            self._out[state] = (len(term),)
+
+        # Breadth-first so every fail target is complete before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __bool__(self):
+        return bool(self.terms)
+
+    def step(self, state, ch):
+        while state and ch not in self._goto[state]:
+            state = self._fail[state]
+        return self._goto[state].get(ch, 0)
+
+    def lengths(self, state):
+        """Lengths of the terms that end at the current character"""
+        return self._out[state]
+
+
+def _icu_end(text, start):
+    """End of the balanced {...} ICU argument starting at start, or None when the braces do not close"""
+    depth = 0
+    for index in range(start, len(text)):
+        if text[index] == '{':
+            depth += 1
+        elif text[index] == '}':
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    return None
+
+
+def _icu_branches(text, start, end):
+    """
+    (keyword, [(message start, message end), ...]) of the plural or select
+    argument text[start:end], or None for any other (or malformed) argument
+    """
+    header = BRANCHING_RE.match(text, start)
+    if header is None:
+        return None
+    messages = []
+    position = header.end()
+    while True:
+        selector = SELECTOR_RE.match(text, position, end - 1)
+        if selector is None:
+            break
+        close = _icu_end(text, selector.end() - 1)
+        if close is None or close > end - 1:
+            return None
+        messages.append((selector.end(), close - 1))
+        position = close
+    if not messages or text[position:end - 1].strip():
+        return None
+    return header.group(1), messages
+
+
+def _is_structure(token):
+    """ICU and tag tokens, as opposed to glossary terms (which are words)"""
+    return token[0] in '{}<#'
+
+
+def _is_word(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class MaskedText:
+    """A source string with its protected spans replaced by sentinels"""
+
+    __slots__ = ('source', 'text', 'tokens', 'masker')
+
+    def __init__(self, source, text, tokens, masker):
+        self.source = source
+        self.text = text
+        self.tokens = tokens
+        self.masker = masker
+
+    @property
+    def opaque(self):
+        """True when nothing but protected spans, spaces and punctuation is left to translate"""
+        return not any(ch.isalpha() for ch in SENTINEL_RE.sub('', self.text))
+
+    def verify(self, translation):
+        """True when a finished translation kept every ICU argument, tag and protected term"""
+        if not isinstance(translation, str) or not translation:
+            return False
+        if not self.tokens:
+            return True
+        if SENTINEL_OPEN in translation or SENTINEL_CLOSE in translation:
+            return False
+        # The translation must have the same ICU structure and tags as the source
+        if self.masker.structure(translation) != self.masker.structure(self.source):
+            return False
+        return all(translation.count(token) >= count for token, count in Counter(self.tokens).items() if not _is_structure(token))
+
+    def restore(self, translated):
+        """Put the protected spans back into a translation of .text; None when it does not verify"""
+        if not isinstance(translated, str) or not translated:
+            return None
+        if not self.tokens:
+            return translated
+        seen = []
+
+        def put_back(match):
+            index = int(match.group(1))
+            seen.append(index)
+            return self.tokens[index] if index < len(self.tokens) else match.group(0)
+
+        restored = SENTINEL_RE.sub(put_back, translated)
+        if sorted(seen) != list(range(len(self.tokens))):
+            return None
+        return restored if self.verify(restored) else None
+
+    def segments(self):
+        """Alternating (translatable text, protected span) pieces, for translating around the spans"""
+        pieces = []
+        position = 0
+        for match in SENTINEL_RE.finditer(self.text):
+            pieces.append((self.text[position:match.start()], self.tokens[int(match.group(1))]))
+            position = match.end()
+        pieces.append((self.text[position:], ''))
+        return pieces
+
+
+class Masker:
+    """Replaces ICU arguments, tags and glossary terms with sentinels in a single pass"""
+
+    def __init__(self, terms=()):
+        self.matcher = TermMatcher(terms)
+
+    def _scan(self, text, index, stop, spans, candidates, plural=False):
+        """Collect protected spans and term candidates of text[index:stop]; plural/select messages recurse"""
+        state = 0
+        length = len(text)
+        while index < stop:
+            ch = text[index]
+            end = None
+            if ch == '{':
+                end = _icu_end(text, index)
+                branches = _icu_branches(text, index, end) if end is not None else None
+                if branches is not None:
+                    keyword, messages = branches
+                    position = index
+                    for start, close in messages:
+                        spans.append((position, start))
+                        self._scan(text, start, close, spans, candidates, plural or keyword != 'select')
+                        position = close
+                    spans.append((position, end))
+                    state = 0
+                    index = end
+                    continue
+            elif ch == '<':
+                match = TAG_RE.match(text, index)
+                end = match.end() if match else None
+            elif ch == '#' and plural:
+                end = index + 1
+            if end is not None:
+                spans.append((index, end))
+                # A term cannot run through a placeholder
+                state = 0
+                index = end
+                continue
+            if self.matcher:
+                state = self.matcher.step(state, ch)
+                for size in self.matcher.lengths(state):
+                    start = index + 1 - size
+                    if (start == 0 or not _is_word(text[start - 1])) and (index + 1 == length or not _is_word(text[index + 1])):
+                        candidates.append((start, index + 1))
+            index += 1
+
+    def structure(self, text):
+        """Counter of the ICU pieces and tags of text, the part a translation must keep verbatim"""
+        spans = []
+        self._scan(text, 0, len(text), spans, [])
+        return Counter(text[start:end] for start, end in spans if start != end)
+
+    def _spans(self, text):
+        spans = []
+        candidates = []
+        self._scan(text, 0, len(text), spans, candidates)
+
+        if candidates:
+            # Leftmost, then longest, non-overlapping terms ("Google Drive" over "Google")
+            candidates.sort(key=lambda span: (span[0], -span[1]))
+            last_end = 0
+            for start, end in candidates:
+                if start >= last_end:
+                    spans.append((start, end))
+                    last_end = end
+            spans.sort()
+
+        # Adjacent ICU pieces (e.g. "} other {" then "#") become one token
+        merged = []
+        for start, end in spans:
+            if start == end:
+                continue
+            if merged and merged[-1][1] == start and _is_structure(text[start]) and _is_structure(text[merged[-1][0]]):
+                merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
+
+    def mask(self, text):
+        """MaskedText for text; strings with nothing to protect come back with no tokens"""
+        spans = self._spans(text)
+        if not spans:
+            return MaskedText(text, text, [], self)
+        pieces = []
+        tokens = []
+        position = 0
+        for start, end in spans:
+            pieces.append(text[position:start])
+            pieces.append(f'{SENTINEL_OPEN}{len(tokens)}{SENTINEL_CLOSE}')
+            tokens.append(text[start:end])
+            position = end
+        pieces.append(text[position:])
+        return MaskedText(text, ''.join(pieces), tokens, self)
+
+
+def load_glossary(path=None):
+    """Protected terms from the glossary file (missing file: none)"""
+    path = path or os.environ.get('TRANSLATION_GLOSSARY_PATH') or DEFAULT_GLOSSARY_PATH
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return []
+    return [term for term in data.get('doNotTranslate', []) if isinstance(term, str) and term.strip()]
+
+
+def masking_enabled():
+    return os.environ.get('TRANSLATION_MASKING', '').lower() not in ('off', '0', 'false', 'no')
+
+
+_masker = None
+_masker_lock = threading.Lock()
+
+
+def get_masker():
+    """Return the process-wide masker (glossary loaded once)"""
+    global _masker
+    with _masker_lock:
+        if _masker is None:
+            _masker = Masker(load_glossary() if masking_enabled() else ())
+        return _masker
+
+
+def mask_text(text):
+    """Mask one source string with the process-wide masker (identity when TRANSLATION_MASKING=off)"""
+    if not masking_enabled():
+        return MaskedText(text, text, [], Masker())
+    return get_masker().mask(text)
@@ -0,0 +1,241 @@
+"""
+PERSISTENT TRANSLATION MEMORY
+SQLite store of previous translations keyed by (source text, target, backend)
+Consulted before any network call so re-runs only pay for changed strings
+
+Environment overrides:
+  TRANSLATION_MEMORY=off                 Disable the store entirely
+  TRANSLATION_MEMORY_PATH=<file>         Location of the SQLite file
+  TRANSLATION_MEMORY_MAX_ENTRIES=<n>     Keep only the n most recently used entries
+  TRANSLATION_MEMORY_MAX_AGE_DAYS=<n>    Drop entries created more than n days ago
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .metrics import get_metrics
+from .paths import CACHE_DIR
+
+DEFAULT_MEMORY_PATH = CACHE_DIR / 'memory.sqlite3'
+
+# Writes are committed in groups to avoid one fsync per translated string
+COMMIT_EVERY = 100
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS translations (
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    PRIMARY KEY (source, target, backend)
+) WITHOUT ROWID
+'''
+
+
+class TranslationMemory:
+    """On-disk translation memory with size- and age-based eviction"""
+
+    def __init__(self, path=DEFAULT_MEMORY_PATH, max_entries=None, max_age_days=None):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+        self.evict()
+
+    def get(self, text, target, backend):
+        """Return the stored translation or None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT translation FROM translations WHERE source = ? AND target = ? AND backend = ?',
+                (text, target, backend),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._conn.execute(
+                    'UPDATE translations SET used_at = ? WHERE source = ? AND target = ? AND backend = ?',
+                    (time.time(), text, target, backend),
+                )
+                self._mark_dirty()
+        get_metrics().inc('translation_cache_lookups_total', backend=backend, result='miss' if row is None else 'hit')
+        return None if row is None else row[0]
+
+    def put(self, text, target, backend, translation):
+        """Store a translation produced by a backend"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)',
+                (text, target, backend, translation, now, now),
+            )
+            self._mark_dirty()
+
+    def evict(self):
+        """Apply the age and size limits, returning the number of entries removed"""
+        removed = 0
+        with self._lock:
+            if self.max_age_days is not None:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += self._conn.execute(
+                    'DELETE FROM translations WHERE created_at < ?', (cutoff,)
+                ).rowcount
+            if self.max_entries is not None:
+                removed += self._conn.execute(
+                    '''DELETE FROM translations WHERE (source, target, backend) IN (
+                        SELECT source, target, backend FROM translations
+                        ORDER BY used_at DESC LIMIT -1 OFFSET ?
+                    )''',
+                    (self.max_entries,),
+                ).rowcount
+            self._conn.commit()
+        return removed
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+
+    def flush(self):
+        """Commit any buffered writes"""
+        with self._lock:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def _mark_dirty(self):
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self._conn.commit()
+            self._pending = 0
+
+
+class NullMemory:
+    """Stand-in used when the translation memory is disabled"""
+
+    hits = 0
+    misses = 0
+
+    def get(self, text, target, backend):
+        return None
+
+    def put(self, text, target, backend, translation):
+        pass
+
+    def evict(self):
+        return 0
+
+    def __len__(self):
+        return 0
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class WarmMemory:
+    """
+    In-process cache in front of another memory, for long-running processes
+    (translate-watch.py). Translations found once are answered from RAM after
+    that; misses always go to the backing memory, since another run (or a
+    worker sharing the database) may have written the entry since. New
+    translations are written through so other runs still see them
+    """
+
+    def __init__(self, backing):
+        self.backing = backing
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, text, target, backend):
+        key = (text, target, backend)
+        with self._lock:
+            translation = self._entries.get(key)
+            if translation is not None:
+                self.hits += 1
+        if translation is not None:
+            get_metrics().inc('translation_cache_lookups_total', backend=backend, result='hit')
+            return translation
+        translation = self.backing.get(text, target, backend)
+        with self._lock:
+            # Only hits are kept; a miss is asked again next time
+            if translation is None:
+                self.misses += 1
+            else:
+                self._entries[key] = translation
+                self.hits += 1
+        return translation
+
+    def put(self, text, target, backend, translation):
+        with self._lock:
+            self._entries[(text, target, backend)] = translation
+        self.backing.put(text, target, backend, translation)
+
+    def evict(self):
+        return self.backing.evict()
+
+    def __len__(self):
+        return len(self.backing)
+
+    def flush(self):
+        self.backing.flush()
+
+    def close(self):
+        self.backing.close()
+
+
+def _env_number(name):
+    value = os.environ.get(name)
+    return float(value) if value else None
+
+
+_shared_memory = None
+_shared_memory_lock = threading.Lock()
+
+
+def get_memory():
+    """Return the process-wide translation memory configured from the environment"""
+    global _shared_memory
+    # Locales starting together must not each open their own connection
+    with _shared_memory_lock:
+        if _shared_memory is None:
+            if os.environ.get('TRANSLATION_MEMORY', '').lower() in ('0', 'off', 'false', 'no'):
+                _shared_memory = NullMemory()
+            else:
+                max_entries = _env_number('TRANSLATION_MEMORY_MAX_ENTRIES')
+                _shared_memory = TranslationMemory(
+                    os.environ.get('TRANSLATION_MEMORY_PATH') or DEFAULT_MEMORY_PATH,
+                    max_entries=int(max_entries) if max_entries is not None else None,
+                    max_age_days=_env_number('TRANSLATION_MEMORY_MAX_AGE_DAYS'),
+                )
+            atexit.register(_shared_memory.close)
+        return _shared_memory
+
+
+def set_memory(memory):
+    """Replace the process-wide translation memory (e.g. with a scratch store for benchmarks)"""
+    global _shared_memory
+    _shared_memory = memory
+    return memory
@@ -0,0 +1,226 @@
+"""
+RUN METRICS
+Counters and latency histograms for the translation hot path: backend
+requests (latency, strings, characters and bytes sent), retries, rate-limit
+and circuit-breaker waits, translation memory hits and per-locale throughput.
+Everything is kept in memory; with --metrics-dir=DIR (or TRANSLATION_METRICS_DIR)
+each event is also appended to DIR/events.jsonl and a Prometheus textfile is
+written to DIR/translation.prom after every locale and at exit
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# Upper bounds in seconds; sized for web translation APIs (tens of ms to tens of seconds)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+EVENTS_FILE = 'events.jsonl'
+PROMETHEUS_FILE = 'translation.prom'
+
+HELP = {
+    'translation_requests_total': ('counter', 'Backend requests by outcome'),
+    'translation_request_seconds': ('histogram', 'Backend request latency'),
+    'translation_strings_sent_total': ('counter', 'Source strings sent to the backend'),
+    'translation_characters_sent_total': ('counter', 'Source characters sent to the backend'),
+    'translation_bytes_sent_total': ('counter', 'UTF-8 payload bytes sent to the backend'),
+    'translation_retries_total': ('counter', 'Failed attempts that were retried'),
+    'translation_failures_total': ('counter', 'Calls that failed after every retry'),
+    'translation_throttle_seconds': ('histogram', 'Time spent waiting on the rate limiter, an open circuit or the character budget'),
+    'translation_circuit_trips_total': ('counter', 'Circuit breaker openings'),
+    'translation_cache_lookups_total': ('counter', 'Translation memory lookups by result'),
+    'translation_mask_rejections_total': ('counter', 'Translations that lost a placeholder or protected term and were re-requested'),
+    'translation_quota_characters': ('gauge', 'Characters charged against the backend budget in the current window'),
+    'translation_locale_keys': ('gauge', 'Keys translated in the last run of a locale'),
+    'translation_locale_failed_keys': ('gauge', 'Keys left untranslated in the last run of a locale'),
+    'translation_locale_seconds': ('gauge', 'Wall time of the last run of a locale'),
+    'translation_locale_keys_per_second': ('gauge', 'Throughput of the last run of a locale'),
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+def _labels(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in pairs) + '}'
+
+
+class Metrics:
+    """Thread-safe metric registry with an optional JSONL event stream"""
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.directory = None
+        self._events = None
+        self._lock = threading.Lock()
+
+    def configure(self, directory):
+        """Start writing events.jsonl and translation.prom into directory"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            if self._events is not None:
+                self._events.close()
+            self.directory = directory
+            self._events = open(directory / EVENTS_FILE, 'a', encoding='utf-8')
+
+    @property
+    def enabled(self):
+        return self.directory is not None
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self.gauges[(name, _labels(labels))] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def event(self, event_type, **fields):
+        """Append one event to the JSONL stream (no-op unless configured)"""
+        if self._events is None:
+            return
+        line = json.dumps({'ts': round(time.time(), 6), 'event': event_type, **fields}, ensure_ascii=False)
+        with self._lock:
+            if self._events is not None:
+                self._events.write(line + '\n')
+
+    def render(self):
+        """Prometheus text exposition format"""
+        with self._lock:
+            series = {}
+            for (name, labels), value in self.counters.items():
+                series.setdefault(name, []).append(f'{name}{_format_labels(labels)} {value}')
+            for (name, labels), value in self.gauges.items():
+                series.setdefault(name, []).append(f'{name}{_format_labels(labels)} {value}')
+            for (name, labels), histogram in self.histograms.items():
+                lines = series.setdefault(name, [])
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {cumulative}')
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {histogram.count}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {histogram.sum:.6f}')
+                lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+
+        output = []
+        for name in sorted(series):
+            kind, description = HELP.get(name, ('untyped', name))
+            output.append(f'# HELP {name} {description}')
+            output.append(f'# TYPE {name} {kind}')
+            output.extend(series[name])
+        return '\n'.join(output) + '\n'
+
+    def export(self):
+        """Flush the event stream and rewrite the Prometheus textfile atomically"""
+        if self.directory is None:
+            return
+        with self._lock:
+            if self._events is not None:
+                self._events.flush()
+        path = self.directory / PROMETHEUS_FILE
+        # node_exporter may read the file at any time, so never expose a half-written one
+        temp = path.with_suffix('.prom.tmp')
+        temp.write_text(self.render(), encoding='utf-8')
+        os.replace(temp, path)
+
+    def close(self):
+        self.export()
+        with self._lock:
+            if self._events is not None:
+                self._events.close()
+                self._events = None
+
+
+_metrics = Metrics()
+
+
+def get_metrics():
+    """Return the process-wide metric registry"""
+    return _metrics
+
+
+def metrics_from_args(argv):
+    """Enable file export from --metrics-dir=DIR or TRANSLATION_METRICS_DIR; returns the directory or None"""
+    directory = os.environ.get('TRANSLATION_METRICS_DIR')
+    for arg in argv:
+        if arg.startswith('--metrics-dir='):
+            directory = arg.split('=', 1)[1]
+    if not directory:
+        return None
+    if not _metrics.enabled:
+        atexit.register(_metrics.close)
+    _metrics.configure(directory)
+    return _metrics.directory
+
+
+def record_request(backend, target, kind, payload, strings, seconds, ok):
+    """One backend request (payload is the text sent, or a list for native batches): latency, size, outcome"""
+    texts = payload if isinstance(payload, list) else [payload]
+    characters = sum(len(text) for text in texts)
+    payload_bytes = sum(len(text.encode('utf-8')) for text in texts)
+    outcome = 'ok' if ok else 'error'
+    metrics = _metrics
+    metrics.inc('translation_requests_total', backend=backend, target=target, kind=kind, outcome=outcome)
+    metrics.observe('translation_request_seconds', seconds, backend=backend, kind=kind)
+    metrics.inc('translation_strings_sent_total', strings, backend=backend, target=target)
+    metrics.inc('translation_characters_sent_total', characters, backend=backend, target=target)
+    metrics.inc('translation_bytes_sent_total', payload_bytes, backend=backend, target=target)
+    metrics.event(
+        'request', backend=backend, target=target, kind=kind, strings=strings,
+        characters=characters, bytes=payload_bytes, seconds=round(seconds, 6), ok=ok,
+    )
+
+
+def record_throttle(backend, reason, seconds):
+    """Time a caller spent blocked by the rate limiter ('rate_limit'), an open circuit ('circuit') or a spent minute budget ('quota')"""
+    _metrics.observe('translation_throttle_seconds', seconds, backend=backend, reason=reason)
+    _metrics.event('throttle', backend=backend, reason=reason, seconds=round(seconds, 6))
+
+
+def record_locale(locale, keys, failed_keys, seconds):
+    """Per-locale throughput at the end of a locale run; also refreshes the Prometheus textfile"""
+    metrics = _metrics
+    rate = round(keys / seconds, 3) if seconds > 0 else 0
+    metrics.set('translation_locale_keys', keys, locale=locale)
+    metrics.set('translation_locale_failed_keys', failed_keys, locale=locale)
+    metrics.set('translation_locale_seconds', round(seconds, 3), locale=locale)
+    metrics.set('translation_locale_keys_per_second', rate, locale=locale)
+    metrics.event('locale', locale=locale, keys=keys, failed_keys=failed_keys, seconds=round(seconds, 3), keys_per_second=rate)
+    metrics.export()
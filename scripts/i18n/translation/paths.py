@@ -0,0 +1,15 @@
+"""
+REPOSITORY PATHS
+Locations shared by the translation tools, resolved from this package
+"""
+
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = SCRIPTS_DIR.parent.parent
+MESSAGES_DIR = REPO_ROOT / 'src' / 'i18n' / 'messages'
+EN_MESSAGES_PATH = MESSAGES_DIR / 'en.json'
+CACHE_DIR = SCRIPTS_DIR / '.translation-cache'
+SHARDS_DIR = MESSAGES_DIR / 'shards'
+BUNDLES_DIR = MESSAGES_DIR / 'bundles'
+MARKETING_MESSAGES_DIR = REPO_ROOT / 'src' / 'marketing' / 'i18n' / 'messages'
@@ -0,0 +1,321 @@
+"""
+RUN PROFILING
+Opt-in profiler for the translate scripts (--profile[=DIR] or
+TRANSLATION_PROFILE_DIR). A background thread samples the Python stack of
+every thread every few milliseconds, so backend requests, retry and rate-limit
+sleeps, JSON parsing and dumping and the recursive tree walks all show up,
+including on the engine's worker threads that a cProfile run (one thread per
+profiler) would miss. Each sample is charged to the phase its thread is in
+(load, flatten, translate, write; engine workers count as translate) and split
+into CPU and waiting with that thread's own CPU clock. tracemalloc records the
+peak traced memory seen during each phase.
+
+At exit the profile directory gets summary.json and summary.txt (also
+printed), plus wall.collapsed and cpu.collapsed: folded stacks in
+milliseconds for flamegraph.pl or speedscope. Sampling costs little, but
+tracemalloc makes every allocation several times slower, which inflates CPU
+time; TRANSLATION_PROFILE_MEMORY=off skips it (the summary then only has the
+process's peak RSS) when the timings themselves are under investigation
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from .paths import CACHE_DIR, REPO_ROOT
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS in the summary
+    resource = None
+
+DEFAULT_PROFILE_DIR = CACHE_DIR / 'profiles'
+
+SAMPLE_INTERVAL = 0.005
+
+PHASES = ('load', 'flatten', 'translate', 'write')
+
+# Threads outside any phase are charged by thread name prefix: the engine's
+# request workers (translate_0, translate_1, ...) only ever do translate work
+THREAD_PHASES = {'translate': 'translate'}
+
+TOP_FUNCTIONS = 8
+
+
+def _thread_clock(native_id):
+    """Linux CPU clock id of a thread (MAKE_THREAD_CPUCLOCK(tid, CPUCLOCK_SCHED)), or None elsewhere"""
+    if native_id is None or not sys.platform.startswith('linux'):
+        return None
+    return ((~native_id) << 3) | 6
+
+
+def _waiting_on_pool(frame):
+    """True for threads parked in concurrent.futures (idle workers, or waiting on other threads' results)"""
+    while frame is not None and frame.f_code.co_filename.endswith('threading.py'):
+        frame = frame.f_back
+    return frame is not None and 'concurrent' in Path(frame.f_code.co_filename).parts
+
+
+def _megabytes(size):
+    return round(size / (1024 * 1024), 1)
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class Profiler:
+    """Sampling profiler with per-thread phases, CPU/wait split and tracemalloc peaks"""
+
+    def __init__(self, directory, interval=SAMPLE_INTERVAL, memory=True):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.memory = memory
+        self.phases = {}
+        self.wall_stacks = Counter()
+        self.cpu_stacks = Counter()
+        self._stacks = {}
+        self._clocks = {}
+        self._cpu = {}
+        self._locations = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._started = None
+
+    def _phase_stats(self, name):
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = {
+                'blocks': 0, 'seconds': 0.0, 'samples': 0, 'wall': 0.0, 'cpu': 0.0, 'peak_memory': 0,
+            }
+        return stats
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._started = (time.perf_counter(), time.process_time())
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self._thread.start()
+
+    @contextmanager
+    def phase(self, name):
+        """Charge the calling thread's samples to phase name; phases nest, the innermost wins"""
+        ident = threading.get_ident()
+        with self._lock:
+            self._stacks.setdefault(ident, []).append(name)
+            self._note_memory([name])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._stacks[ident].pop()
+                stats = self._phase_stats(name)
+                stats['blocks'] += 1
+                stats['seconds'] += elapsed
+                self._note_memory([name])
+
+    def _note_memory(self, phases):
+        if not self.memory:
+            return
+        current = tracemalloc.get_traced_memory()[0]
+        for name in phases:
+            stats = self._phase_stats(name)
+            stats['peak_memory'] = max(stats['peak_memory'], current)
+
+    def _location(self, code):
+        location = self._locations.get(code)
+        if location is None:
+            path = Path(code.co_filename)
+            try:
+                path = path.relative_to(REPO_ROOT)
+            except ValueError:
+                path = Path(path.name)
+            location = self._locations[code] = (code.co_name, str(path))
+        return location
+
+    def _folded(self, frame):
+        """Folded stack of a frame, root first; the leaf keeps its line (e.g. which sleep)"""
+        name, path = self._location(frame.f_code)
+        labels = [f'{name} ({path}:{frame.f_lineno})']
+        frame = frame.f_back
+        while frame is not None:
+            labels.append('{} ({})'.format(*self._location(frame.f_code)))
+            frame = frame.f_back
+        return ';'.join(reversed(labels))
+
+    def _cpu_delta(self, thread, elapsed):
+        clock = self._clocks.get(thread.ident)
+        if clock is None:
+            clock = self._clocks[thread.ident] = _thread_clock(thread.native_id)
+        if clock is None:
+            return None
+        try:
+            value = time.clock_gettime(clock)
+        except OSError:
+            return None
+        previous = self._cpu.get(thread.ident, value)
+        self._cpu[thread.ident] = value
+        return min(max(value - previous, 0.0), elapsed)
+
+    def _sample(self, elapsed):
+        frames = sys._current_frames()
+        threads = {thread.ident: thread for thread in threading.enumerate()}
+        with self._lock:
+            current = {ident: stack[-1] for ident, stack in self._stacks.items() if stack}
+        active = set()
+        for ident, frame in frames.items():
+            thread = threads.get(ident)
+            if thread is None or thread is self._thread:
+                continue
+            cpu = self._cpu_delta(thread, elapsed)
+            if _waiting_on_pool(frame):
+                continue
+            phase = current.get(ident) or THREAD_PHASES.get(thread.name.split('_')[0], 'other')
+            active.add(phase)
+            stack = f'{phase};{self._folded(frame)}'
+            self.wall_stacks[stack] += elapsed
+            with self._lock:
+                stats = self._phase_stats(phase)
+                stats['samples'] += 1
+                stats['wall'] += elapsed
+                if cpu is not None:
+                    stats['cpu'] += cpu
+                    self.cpu_stacks[stack] += cpu
+        with self._lock:
+            self._note_memory(active)
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stopped.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def summary(self):
+        wall = time.perf_counter() - self._started[0]
+        cpu = time.process_time() - self._started[1]
+        # Without per-thread CPU clocks (not Linux) only the whole run is split
+        measured = any(clock is not None for clock in self._clocks.values())
+        order = [name for name in PHASES if name in self.phases] + sorted(set(self.phases) - set(PHASES))
+        phases = {}
+        for name in order:
+            stats = self.phases[name]
+            phases[name] = {
+                'blocks': stats['blocks'],
+                'seconds': round(stats['seconds'], 3),
+                'samples': stats['samples'],
+                'thread_seconds': round(stats['wall'], 3),
+                'cpu_seconds': round(stats['cpu'], 3) if measured else None,
+                'wait_seconds': round(stats['wall'] - stats['cpu'], 3) if measured else None,
+                'peak_memory_mb': _megabytes(stats['peak_memory']) if self.memory else None,
+            }
+        return {
+            'wall_seconds': round(wall, 3),
+            'cpu_seconds': round(cpu, 3),
+            'wait_seconds': round(max(wall - cpu, 0.0), 3),
+            'peak_memory_mb': _megabytes(tracemalloc.get_traced_memory()[1]) if self.memory else None,
+            'peak_rss_mb': _peak_rss_mb(),
+            'interval': self.interval,
+            'phases': phases,
+            'top_wall': self._top(self.wall_stacks),
+            'top_cpu': self._top(self.cpu_stacks),
+        }
+
+    def _top(self, stacks):
+        """Functions with the most self time (leaf frames), across phases"""
+        totals = Counter()
+        for stack, seconds in stacks.items():
+            totals[stack.rsplit(';', 1)[-1]] += seconds
+        return [[label, round(seconds, 3)] for label, seconds in totals.most_common(TOP_FUNCTIONS)]
+
+    def render(self, summary):
+        lines = [
+            f"⏱️  Profile: {summary['wall_seconds']:.2f}s wall, {summary['cpu_seconds']:.2f}s CPU, "
+            f"{summary['wait_seconds']:.2f}s waiting; peak traced memory {summary['peak_memory_mb'] or '-'} MB, "
+            f"peak RSS {summary['peak_rss_mb'] or '-'} MB",
+            f"   {'phase':<10} {'blocks':>6} {'in phase':>9} {'thread-s':>9} {'CPU':>8} {'wait':>8} {'peak MB':>8}",
+        ]
+        for name, stats in summary['phases'].items():
+            cpu = '-' if stats['cpu_seconds'] is None else f"{stats['cpu_seconds']:.2f}"
+            wait = '-' if stats['wait_seconds'] is None else f"{stats['wait_seconds']:.2f}"
+            lines.append(f"   {name:<10} {stats['blocks']:>6} {stats['seconds']:>9.2f} {stats['thread_seconds']:>9.2f} "
+                         f"{cpu:>8} {wait:>8} {stats['peak_memory_mb'] or '-':>8}")
+        for title, key in (('Most wall time', 'top_wall'), ('Most CPU time', 'top_cpu')):
+            if summary[key]:
+                lines.append(f'   {title}:')
+                lines.extend(f'      {seconds:>8.2f}s  {label}' for label, seconds in summary[key])
+        return '\n'.join(lines) + '\n'
+
+    def stop(self):
+        """Stop sampling and write the profile files; returns the summary"""
+        if self._thread is None:
+            return None
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+        summary = self.summary()
+        if self.memory:
+            tracemalloc.stop()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / 'summary.json', 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        text = self.render(summary)
+        (self.directory / 'summary.txt').write_text(text, encoding='utf-8')
+        for name, stacks in (('wall.collapsed', self.wall_stacks), ('cpu.collapsed', self.cpu_stacks)):
+            with open(self.directory / name, 'w', encoding='utf-8') as f:
+                for stack, seconds in sorted(stacks.items()):
+                    if round(seconds * 1000):
+                        f.write(f'{stack} {round(seconds * 1000)}\n')
+        print('\n' + text + f"   📁 {self.directory}/ (summary.json, wall.collapsed, cpu.collapsed)")
+        return summary
+
+
+_profiler = None
+
+
+def get_profiler():
+    """The active Profiler, or None when the run is not profiled"""
+    return _profiler
+
+
+def profile_phase(name):
+    """Context manager marking a phase of the calling thread; a no-op without --profile"""
+    profiler = _profiler
+    return nullcontext() if profiler is None else profiler.phase(name)
+
+
+def profile_from_args(argv):
+    """
+    Start profiling for --profile, --profile=DIR or TRANSLATION_PROFILE_DIR (memory
+    tracing unless TRANSLATION_PROFILE_MEMORY=off); files are written at exit.
+    Returns the profile directory or None
+    """
+    global _profiler
+    directory = os.environ.get('TRANSLATION_PROFILE_DIR')
+    for arg in argv:
+        if arg == '--profile':
+            directory = directory or DEFAULT_PROFILE_DIR / time.strftime('%Y%m%d-%H%M%S')
+        elif arg.startswith('--profile='):
+            directory = arg.split('=', 1)[1]
+    if not directory or _profiler is not None:
+        return None if _profiler is None else _profiler.directory
+    _profiler = Profiler(directory, memory=os.environ.get('TRANSLATION_PROFILE_MEMORY', '').lower() != 'off')
+    _profiler.start()
+    atexit.register(_profiler.stop)
+    return _profiler.directory
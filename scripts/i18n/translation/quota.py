@@ -0,0 +1,272 @@
+"""
+CHARACTER BUDGETS
+Translation APIs meter characters, not requests. Each backend gets a budget
+of characters per minute and per UTC day; a request over the minute budget
+waits for the next minute, and one over the day budget raises QuotaExhausted
+so the caller can fail over to another backend or leave the string for the
+next --incremental run. A failed attempt is refunded, so a request that is
+retried is charged once. Usage is persisted in .translation-cache/quota.json
+and shared by every process on the machine, so consecutive runs (and parallel
+workers) draw down the same daily allowance
+
+Environment overrides:
+  TRANSLATION_BUDGET_<BACKEND>=<per minute>/<per day>   e.g. TRANSLATION_BUDGET_GOOGLE=/2000000
+                                                         (empty or 0 means unlimited)
+  TRANSLATION_FAILOVER=<backend>,<backend>               backends to use once the active one is exhausted
+"""
+
+import atexit
+import datetime
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from .metrics import get_metrics, record_throttle
+from .paths import CACHE_DIR
+from .retry import QuotaExhausted
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are still atomic, merges just are not serialized
+    fcntl = None
+
+DEFAULT_QUOTA_PATH = CACHE_DIR / 'quota.json'
+
+# (characters per minute, characters per day); None is unlimited. Rough
+# ceilings for the free tiers - set TRANSLATION_BUDGET_<BACKEND> for paid plans.
+# The google backend (deep-translator's web endpoint) publishes no quota, and
+# one full run of every locale is about 1.9M characters, so it is only
+# budgeted when TRANSLATION_BUDGET_GOOGLE asks for it
+DEFAULT_BUDGETS = {
+    'google': (None, None),
+    'deepl': (None, 500_000),
+    'libre': (20_000, None),
+    'fake': (None, None),
+}
+
+SAVE_INTERVAL = 5.0
+
+
+def _parse_limit(value):
+    value = int(value.strip().replace('_', '') or 0)
+    return value if value > 0 else None
+
+
+def budget_for(backend):
+    """(per minute, per day) character budget for a backend"""
+    configured = os.environ.get(f'TRANSLATION_BUDGET_{backend.upper()}')
+    if configured is None:
+        return DEFAULT_BUDGETS.get(backend, (None, None))
+    per_minute, _, per_day = configured.partition('/')
+    return _parse_limit(per_minute), _parse_limit(per_day)
+
+
+def _windows(now):
+    return int(now // 60), datetime.datetime.fromtimestamp(now, datetime.timezone.utc).strftime('%Y-%m-%d')
+
+
+def _seconds_until_tomorrow(now):
+    moment = datetime.datetime.fromtimestamp(now, datetime.timezone.utc)
+    tomorrow = (moment + datetime.timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (tomorrow - moment).total_seconds()
+
+
+class QuotaLedger:
+    """Per-backend character usage in the current minute and UTC day, persisted between runs"""
+
+    def __init__(self, path=DEFAULT_QUOTA_PATH, save_interval=SAVE_INTERVAL):
+        self.path = Path(path)
+        self.save_interval = save_interval
+        self._unsaved = {}
+        self._exhausted_until = {}
+        self._last_save = time.monotonic()
+        self._lock = threading.Lock()
+        self.usage = self._read()
+        atexit.register(self.save)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _entry(self, usage, backend, now):
+        minute, day = _windows(now)
+        entry = usage.setdefault(backend, {'minute': minute, 'minute_chars': 0, 'day': day, 'day_chars': 0})
+        if entry.get('minute') != minute:
+            entry['minute'], entry['minute_chars'] = minute, 0
+        if entry.get('day') != day:
+            entry['day'], entry['day_chars'] = day, 0
+        return entry
+
+    def used_today(self, backend):
+        with self._lock:
+            return self._entry(self.usage, backend, time.time())['day_chars']
+
+    def remaining_today(self, backend):
+        """Characters left in today's budget, or None when unlimited"""
+        per_day = budget_for(backend)[1]
+        if per_day is None:
+            return None
+        return max(0, per_day - self.used_today(backend))
+
+    def is_exhausted(self, backend):
+        """True once a request did not fit today's budget (or nothing is left of it)"""
+        if self._exhausted_until.get(backend, 0) > time.time():
+            return True
+        remaining = self.remaining_today(backend)
+        return remaining is not None and remaining <= 0
+
+    def charge(self, backend, characters):
+        """
+        Reserve characters for one request, waiting out a full minute window;
+        raises QuotaExhausted when the day budget cannot cover the request
+        """
+        per_minute, per_day = budget_for(backend)
+        started = None
+        while True:
+            with self._lock:
+                now = time.time()
+                entry = self._entry(self.usage, backend, now)
+                if self._exhausted_until.get(backend, 0) > now:
+                    raise QuotaExhausted(backend, self._exhausted_until[backend])
+                if per_day is not None and entry['day_chars'] + characters > per_day:
+                    exhausted = True
+                    # Stop at the first request that does not fit so failover is decided once
+                    self._exhausted_until[backend] = now + _seconds_until_tomorrow(now)
+                else:
+                    exhausted = False
+                    # An oversized request still goes through on an idle minute
+                    if per_minute is None or entry['minute_chars'] == 0 or entry['minute_chars'] + characters <= per_minute:
+                        entry['minute_chars'] += characters
+                        entry['day_chars'] += characters
+                        self._unsaved[backend] = self._unsaved.get(backend, 0) + characters
+                        break
+                    wait = 60 - now % 60
+            if exhausted:
+                print(f"   ⏸️  {backend}: daily budget of {per_day:,} characters is spent "
+                      f"({entry['day_chars']:,} used); its remaining strings fail over or wait for the next run")
+                get_metrics().event('quota_exhausted', backend=backend, characters=characters, used=entry['day_chars'], budget=per_day)
+                raise QuotaExhausted(backend, self._exhausted_until[backend])
+            started = started or time.monotonic()
+            time.sleep(wait)
+        if started:
+            record_throttle(backend, 'quota', time.monotonic() - started)
+        get_metrics().set('translation_quota_characters', entry['day_chars'], backend=backend, window='day')
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def refund(self, backend, characters):
+        """Give back characters charged for an attempt that failed"""
+        with self._lock:
+            entry = self._entry(self.usage, backend, time.time())
+            entry['minute_chars'] = max(0, entry['minute_chars'] - characters)
+            entry['day_chars'] = max(0, entry['day_chars'] - characters)
+            self._unsaved[backend] = self._unsaved.get(backend, 0) - characters
+
+    @contextmanager
+    def charged(self, backend, characters):
+        """Charge characters for one request attempt, refunding them if the attempt raises"""
+        self.charge(backend, characters)
+        try:
+            yield
+        except BaseException:
+            self.refund(backend, characters)
+            raise
+
+    def save(self):
+        """Merge this process's usage into the shared file (atomic replace under a lock)"""
+        with self._lock:
+            self._last_save = time.monotonic()
+            if not self._unsaved:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path.with_suffix('.lock'), 'w') as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                now = time.time()
+                stored = self._read()
+                for backend, characters in self._unsaved.items():
+                    entry = self._entry(stored, backend, now)
+                    entry['minute_chars'] = max(0, entry['minute_chars'] + characters)
+                    entry['day_chars'] = max(0, entry['day_chars'] + characters)
+                temp = self.path.with_suffix('.json.tmp')
+                temp.write_text(json.dumps(stored, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+                os.replace(temp, self.path)
+            # Pick up what other processes spent since we last looked
+            self.usage = stored
+            self._unsaved = {}
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+_failover = None
+
+
+def get_quota():
+    """Return the process-wide quota ledger"""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = QuotaLedger()
+        return _ledger
+
+
+def set_quota(ledger):
+    """Replace the process-wide quota ledger (e.g. with a scratch ledger for benchmarks)"""
+    global _ledger
+    with _ledger_lock:
+        _ledger = ledger
+    return ledger
+
+
+def set_failover_backends(names):
+    """Backends to try, in order, once the active backend's day budget is spent"""
+    global _failover
+    _failover = [name for name in names if name]
+    return _failover
+
+
+def failover_backends():
+    if _failover is not None:
+        return list(_failover)
+    configured = os.environ.get('TRANSLATION_FAILOVER', '')
+    return [name.strip() for name in configured.split(',') if name.strip()]
+
+
+def failover_from_args(argv):
+    """Read --failover=a,b from argv (else TRANSLATION_FAILOVER) and make it the failover chain"""
+    for arg in argv:
+        if arg.startswith('--failover='):
+            return set_failover_backends([name.strip() for name in arg.split('=', 1)[1].split(',')])
+    return set_failover_backends(failover_backends())
+
+
+def estimate_characters(strings):
+    """Characters a list of source strings costs to translate (before translation memory hits)"""
+    return sum(len(text) for text in strings)
+
+
+def plan_budget(jobs, backend, failover=None, ledger=None):
+    """
+    Assign each job ({name: estimated characters}, in priority order) to the
+    first backend in [backend, *failover] whose remaining day budget covers
+    it. Jobs nothing can cover map to None and should be deferred
+    """
+    ledger = ledger or get_quota()
+    chain = [backend] + [name for name in (failover if failover is not None else failover_backends()) if name != backend]
+    remaining = {name: ledger.remaining_today(name) for name in chain}
+    plan = {}
+    for job, characters in jobs.items():
+        plan[job] = None
+        for name in chain:
+            if remaining[name] is None or remaining[name] >= characters:
+                if remaining[name] is not None:
+                    remaining[name] -= characters
+                plan[job] = name
+                break
+    return plan
@@ -0,0 +1,158 @@
+"""
+RETRY POLICY AND CIRCUIT BREAKER
+Failed calls are retried with exponential backoff and full jitter. Each
+backend has a circuit breaker that pauses all calls when the recent error
+rate spikes, so throttling slows the run down instead of burning retries.
+When retries run out TranslationFailed is raised; callers record the key as
+failed rather than writing the English source into the locale file
+"""
+
+import random
+import threading
+import time
+from collections import deque
+
+from .metrics import get_metrics, record_throttle
+
+
+class TranslationFailed(Exception):
+    """A string could not be translated after every retry"""
+
+
+class QuotaExhausted(TranslationFailed):
+    """A backend's character budget is spent until retry_at (epoch seconds); never retried"""
+
+    def __init__(self, backend, retry_at):
+        super().__init__(f'{backend}: character budget exhausted until {time.strftime("%Y-%m-%d %H:%M", time.localtime(retry_at))}')
+        self.backend = backend
+        self.retry_at = retry_at
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter"""
+
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=30.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        """Seconds to wait after the given (0-based) failed attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+class CircuitBreaker:
+    """
+    Opens when at least failure_rate of the last `window` calls failed and
+    blocks callers for `cooldown` seconds. A failure right after reopening
+    doubles the cooldown up to max_cooldown; a success closes the circuit
+    """
+
+    def __init__(self, window=20, min_calls=5, failure_rate=0.5, cooldown=15.0, max_cooldown=300.0, name=None):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.opened_until = 0.0
+        self.trips = 0
+        self._outcomes = deque(maxlen=window)
+        self._half_open = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return time.monotonic() < self.opened_until
+
+    def wait(self):
+        """Block while the circuit is open"""
+        started = None
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                remaining = self.opened_until - now
+            if remaining <= 0:
+                break
+            started = started or now
+            time.sleep(remaining)
+        if started and self.name:
+            record_throttle(self.name, 'circuit', time.monotonic() - started)
+
+    def record_success(self):
+        with self._lock:
+            self._outcomes.append(True)
+            if self._half_open:
+                self._half_open = False
+                self.cooldown = self.base_cooldown
+
+    def record_failure(self):
+        with self._lock:
+            self._outcomes.append(False)
+            if self._half_open:
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._trip()
+                return
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+                self._trip()
+
+    def _trip(self):
+        self.opened_until = time.monotonic() + self.cooldown
+        self.trips += 1
+        self._half_open = True
+        self._outcomes.clear()
+        if self.name:
+            get_metrics().inc('translation_circuit_trips_total', backend=self.name)
+            get_metrics().event('circuit_open', backend=self.name, cooldown=self.cooldown, trips=self.trips)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(backend):
+    """Return the process-wide circuit breaker for a backend"""
+    with _breakers_lock:
+        if backend not in _breakers:
+            _breakers[backend] = CircuitBreaker(name=backend)
+        return _breakers[backend]
+
+
+def set_circuit_breaker(backend, breaker):
+    """Replace the process-wide circuit breaker for a backend"""
+    with _breakers_lock:
+        _breakers[backend] = breaker
+    return breaker
+
+
+def call_with_retry(fn, backend, policy=DEFAULT_RETRY_POLICY):
+    """Call fn() under the backend's circuit breaker, retrying with backoff; raises TranslationFailed"""
+    breaker = get_circuit_breaker(backend)
+    metrics = get_metrics()
+    last_error = None
+    for attempt in range(policy.max_attempts):
+        breaker.wait()
+        try:
+            result = fn()
+        except QuotaExhausted:
+            # Not a backend error: waiting or retrying cannot help today
+            raise
+        except Exception as e:
+            last_error = e
+            breaker.record_failure()
+            if attempt < policy.max_attempts - 1:
+                delay = policy.delay(attempt)
+                metrics.inc('translation_retries_total', backend=backend)
+                metrics.event('retry', backend=backend, attempt=attempt + 1, delay=round(delay, 3), error=str(e))
+                time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+    metrics.inc('translation_failures_total', backend=backend)
+    metrics.event('failure', backend=backend, attempts=policy.max_attempts, error=str(last_error))
+    raise TranslationFailed(f'{backend}: {str(last_error)[:80]}') from last_error
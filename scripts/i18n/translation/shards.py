@@ -0,0 +1,64 @@
+"""
+NAMESPACE SHARDS
+Every top-level namespace of a locale is written to its own file,
+src/i18n/messages/shards/<locale>/<namespace>.json, wrapped in its namespace
+key like messages/en/business.json, so src/i18n/request.ts can import only the
+namespaces a route uses. A manifest.json per locale lists each shard with its
+key count, size and content hash. Shards are written atomically, unchanged
+ones are not rewritten and shards for namespaces that no longer exist are removed
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from .keyspace import count_strings
+from .paths import MESSAGES_DIR, SHARDS_DIR
+from .writer import dump_messages, write_atomic
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def write_shards(locale, tree, directory=SHARDS_DIR):
+    """Split a locale tree into per-namespace shard files plus a manifest; returns stats"""
+    locale_dir = Path(directory) / locale
+    locale_dir.mkdir(parents=True, exist_ok=True)
+
+    namespaces = {}
+    written = 0
+    for namespace, subtree in tree.items():
+        payload = dump_messages({namespace: subtree})
+        if write_atomic(locale_dir / f'{namespace}.json', payload):
+            written += 1
+        encoded = payload.encode('utf-8')
+        namespaces[namespace] = {
+            'file': f'{namespace}.json',
+            'keys': count_strings(subtree) if isinstance(subtree, (dict, list)) else 1,
+            'bytes': len(encoded),
+            'hash': hashlib.sha256(encoded).hexdigest()[:16],
+        }
+
+    removed = 0
+    for path in locale_dir.glob('*.json'):
+        if path.name != MANIFEST_NAME and path.stem not in namespaces:
+            path.unlink()
+            removed += 1
+
+    manifest = {'locale': locale, 'namespaces': namespaces}
+    write_atomic(locale_dir / MANIFEST_NAME, dump_messages(manifest))
+    return {'namespaces': len(namespaces), 'written': written, 'removed': removed}
+
+
+def shard_locale_file(locale, messages_dir=MESSAGES_DIR, directory=SHARDS_DIR):
+    """Re-shard messages/<locale>.json"""
+    with open(Path(messages_dir) / f'{locale}.json', 'r', encoding='utf-8') as f:
+        return write_shards(locale, json.load(f), directory)
+
+
+def load_shard_manifest(locale, directory=SHARDS_DIR):
+    """The manifest written by write_shards, or None when the locale has not been sharded"""
+    path = Path(directory) / locale / MANIFEST_NAME
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,77 @@
+"""
+SOURCE TREES
+The repo has more than one English message tree, each read by its own
+next-intl request config and laid out differently on disk:
+
+  app        src/i18n/messages/en.json             <locale>.json plus namespace shards (src/i18n/shards.ts)
+  marketing  src/marketing/i18n/messages/en.json   <locale>.json only (src/marketing/i18n/request.ts)
+
+translate.py --sources=app,marketing translates several trees in one run.
+Their strings are deduplicated together, so a phrase both trees use is sent
+(and stored in the translation memory) once per locale; each tree is then
+written back in its own layout and keeps its own manifests and lockfile
+"""
+
+import json
+
+from .incremental import DEFAULT_MANIFEST_DIR, LOCKFILE_NAME, SourceManifest
+from .paths import MARKETING_MESSAGES_DIR, MESSAGES_DIR
+from .writer import write_locale_file
+
+DEFAULT_SOURCES = ('app',)
+
+
+class SourceTree:
+    """One English message tree and where its locales live"""
+
+    def __init__(self, name, messages_dir, shards, manifest_dir):
+        self.name = name
+        self.messages_dir = messages_dir
+        self.shards = shards
+        self.manifest_dir = manifest_dir
+
+    def __repr__(self):
+        return f'SourceTree({self.name!r}, {str(self.messages_dir)!r})'
+
+    @property
+    def en_path(self):
+        return self.messages_dir / 'en.json'
+
+    @property
+    def lockfile(self):
+        return self.messages_dir / LOCKFILE_NAME
+
+    def load_source(self):
+        with open(self.en_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def read_locale(self, locale):
+        """A locale's current tree, or {} when it has no file yet"""
+        path = self.messages_dir / f'{locale}.json'
+        if not path.exists():
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def write_locale(self, locale, data):
+        """Atomically write a locale in this tree's layout; False when nothing changed"""
+        return write_locale_file(locale, data, self.messages_dir, shards=self.shards)['written']
+
+    def manifest(self, locale):
+        return SourceManifest(locale, self.manifest_dir, self.lockfile)
+
+
+SOURCE_TREES = {
+    # The app tree keeps the manifest location it always had
+    'app': SourceTree('app', MESSAGES_DIR, shards=True, manifest_dir=DEFAULT_MANIFEST_DIR),
+    'marketing': SourceTree('marketing', MARKETING_MESSAGES_DIR, shards=False, manifest_dir=DEFAULT_MANIFEST_DIR / 'marketing'),
+}
+
+
+def get_source_trees(names=None):
+    """SourceTrees for names (default: the app tree), in the order given"""
+    names = list(names or DEFAULT_SOURCES)
+    unknown = [name for name in names if name not in SOURCE_TREES]
+    if unknown:
+        raise ValueError(f"Unknown source tree(s): {', '.join(unknown)} (available: {', '.join(SOURCE_TREES)})")
+    return [SOURCE_TREES[name] for name in dict.fromkeys(names)]
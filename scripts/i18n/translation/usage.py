@@ -0,0 +1,268 @@
+"""
+USAGE-DRIVEN PRIORITY
+Scans src/ for useTranslations()/getTranslations() bindings and the t('key')
+calls made through them, counting references per namespace and per key path.
+Strings are then translated most-used first, in tiers that callers flush to
+disk as each one completes, so a new locale gets `common` and the other
+keys on screen everywhere long before rarely seen admin copy
+
+The same bindings, followed through each route's pages, layouts and their
+imports, give the namespaces a route can render; src/i18n/shards.ts loads
+only those shards for it (see route_namespaces)
+"""
+
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+from .keyspace import flatten_messages
+from .paths import REPO_ROOT
+
+SRC_DIR = REPO_ROOT / 'src'
+APP_LOCALE_DIR = SRC_DIR / 'app' / '[locale]'
+ROUTE_NAMESPACES_PATH = SRC_DIR / 'i18n' / 'route-namespaces.json'
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+SKIP_DIRS = {'node_modules', 'messages', '.next'}
+
+# Files Next.js renders around every page below their segment
+SEGMENT_FILES = ('layout', 'template', 'error', 'not-found', 'loading')
+
+# A direct t('key') reference outweighs one binding of its whole namespace
+KEY_WEIGHT = 10
+
+TIER_NAMES = ('referenced', 'namespace', 'unused')
+
+# const t = useTranslations('ns') / await getTranslations({ locale, namespace: 'ns' })
+_BINDING_RE = re.compile(
+    r"\b(?:const|let|var)\s+(\w+)\s*=\s*(?:await\s+)?(?:useTranslations|getTranslations)\(\s*"
+    r"(?:(['\"`])(.*?)\2|\{[^}]*?namespace:\s*(['\"`])(.*?)\4[^}]*\})?\s*\)"
+)
+# import ... from '@/x', import '@/x', import('./x'), require('./x'), export ... from './x'
+_IMPORT_RE = re.compile(r"""(?:\bfrom|\bimport|\brequire)\s*\(?\s*(['"])([.@][^'"\n]*)\1""")
+_QUOTED_CALL = r"\b{name}(?:\.(?:rich|markup|raw|has))?\(\s*(?:(['\"])([^'\"\n]+)\1|`([^`\n]*)`)"
+
+
+def _join(namespace, key):
+    return f'{namespace}.{key}' if namespace else key
+
+
+def _ancestors(path):
+    """'a.b[0].c' -> 'a', 'a.b', 'a.b[0]'"""
+    for index, char in enumerate(path):
+        if char in '.[' and index:
+            yield path[:index]
+
+
+class UsageIndex:
+    """Reference counts of namespaces (bindings) and key paths (t() calls) in the app source"""
+
+    def __init__(self, keys=None, namespaces=None, files=0):
+        self.keys = Counter(keys or {})
+        self.namespaces = Counter(namespaces or {})
+        self.files = files
+
+    def scan_source(self, source):
+        """Add the bindings and calls in one file's source text"""
+        bindings = []
+        for match in _BINDING_RE.finditer(source):
+            namespace = match.group(3) if match.group(2) else (match.group(5) or '')
+            if '${' in namespace:
+                # Namespace only known at runtime; its calls cannot be resolved
+                namespace = None
+            elif namespace:
+                self.namespaces[namespace] += 1
+            bindings.append((match.start(), match.group(1), namespace))
+
+        for name in {name for _, name, _ in bindings}:
+            scopes = [(start, namespace) for start, bound, namespace in bindings if bound == name]
+            for call in re.finditer(_QUOTED_CALL.format(name=re.escape(name)), source):
+                # Calls belong to the closest binding above them (the first one for hoisted helpers)
+                namespace = scopes[0][1]
+                for start, candidate in scopes:
+                    if start > call.start():
+                        break
+                    namespace = candidate
+                if namespace is None:
+                    continue
+                if call.group(2):
+                    self.keys[_join(namespace, call.group(2))] += 1
+                    continue
+                # t(`status.${value}`) may reach any key under the static prefix
+                prefix = call.group(3).split('${', 1)[0].rstrip('.')
+                if prefix and prefix != call.group(3):
+                    self.namespaces[_join(namespace, prefix)] += 1
+                elif prefix:
+                    self.keys[_join(namespace, prefix)] += 1
+        self.files += 1
+
+    def scan(self, directory=SRC_DIR):
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for filename in files:
+                if filename.endswith(SOURCE_EXTENSIONS):
+                    with open(os.path.join(root, filename), 'r', encoding='utf-8', errors='replace') as f:
+                        source = f.read()
+                    if 'Translations(' in source:
+                        self.scan_source(source)
+        return self
+
+    def score(self, path):
+        """Weighted references to a key: direct calls plus bindings of every enclosing namespace"""
+        score = self.keys.get(path, 0) * KEY_WEIGHT
+        for ancestor in _ancestors(path):
+            # t.raw('list') or t('section') on a parent counts like a binding of it
+            score += self.namespaces.get(ancestor, 0) + self.keys.get(ancestor, 0)
+        return score
+
+    def tier(self, path):
+        """0 when the key is referenced directly, 1 when only its namespace is, otherwise 2"""
+        if self.keys.get(path):
+            return 0
+        for ancestor in _ancestors(path):
+            if self.keys.get(ancestor):
+                return 0
+        return 1 if self.score(path) else 2
+
+    def top_namespaces(self, limit=None):
+        return self.namespaces.most_common(limit)
+
+    def top_keys(self, limit=None):
+        return self.keys.most_common(limit)
+
+
+@lru_cache(maxsize=None)
+def load_usage_index(directory=SRC_DIR):
+    """Scan the app source once per process"""
+    return UsageIndex().scan(directory)
+
+
+def prioritize_strings(tree, strings, index=None, prefix=''):
+    """
+    Split unique source strings into tiers (referenced keys, keys under a used
+    namespace, the rest), most valuable first. A string takes the best tier of
+    any key using it and is ranked by the summed score of those keys; ties keep
+    the input order. Empty tiers are dropped. tree may also be a list of
+    trees (see sources.py); their keys are scored against the same index
+    """
+    if index is None:
+        index = load_usage_index()
+    wanted = set(strings)
+    best = {}
+    scores = Counter()
+    for source_tree in tree if isinstance(tree, list) else [tree]:
+        for _, key, text in flatten_messages(source_tree).strings():
+            if text not in wanted:
+                continue
+            path = _join(prefix, key)
+            tier = index.tier(path)
+            best[text] = min(best.get(text, tier), tier)
+            scores[text] += index.score(path)
+
+    tiers = [[] for _ in TIER_NAMES]
+    for text in strings:
+        tiers[best.get(text, len(TIER_NAMES) - 1)].append(text)
+    return [sorted(tier, key=lambda text: -scores[text]) for tier in tiers if tier]
+
+
+def _binding_namespaces(source):
+    """Top-level namespaces bound in a file, or None when one is the whole tree or only known at runtime"""
+    namespaces = set()
+    for match in _BINDING_RE.finditer(source):
+        namespace = match.group(3) if match.group(2) else (match.group(5) or '')
+        if not namespace or '${' in namespace:
+            return None
+        namespaces.add(namespace.split('.', 1)[0])
+    return namespaces
+
+
+def _resolve_import(spec, importer):
+    """Source file an '@/...' or relative import points at, or None (packages, assets)"""
+    if spec.startswith('@/'):
+        base = SRC_DIR / spec[2:]
+    elif spec.startswith('.'):
+        base = importer.parent / spec
+    else:
+        return None
+    for candidate in [base, *(base.with_name(base.name + ext) for ext in SOURCE_EXTENSIONS),
+                      *(base / f'index{ext}' for ext in SOURCE_EXTENSIONS)]:
+        if candidate.suffix in SOURCE_EXTENSIONS and candidate.is_file():
+            return candidate.resolve()
+    return None
+
+
+class _ImportGraph:
+    """Translation namespaces reachable from source files through their imports, cached per file"""
+
+    def __init__(self):
+        self._files = {}
+
+    def _file(self, path):
+        entry = self._files.get(path)
+        if entry is None:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                source = f.read()
+            imports = {_resolve_import(match.group(2), path) for match in _IMPORT_RE.finditer(source)}
+            entry = self._files[path] = (_binding_namespaces(source), imports - {None})
+        return entry
+
+    def namespaces(self, entries):
+        """Union of the namespaces bound in entries and everything they import, or None"""
+        result = set()
+        seen = set()
+        stack = [path.resolve() for path in entries]
+        while stack:
+            path = stack.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            namespaces, imports = self._file(path)
+            if namespaces is None:
+                return None
+            result |= namespaces
+            stack.extend(imports - seen)
+        return result
+
+
+def _source_files(directory):
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for filename in sorted(files):
+            if filename.endswith(SOURCE_EXTENSIONS):
+                yield Path(root) / filename
+
+
+def _segment_files(directory):
+    return [directory / f'{name}{ext}' for name in SEGMENT_FILES for ext in SOURCE_EXTENSIONS
+            if (directory / f'{name}{ext}').is_file()]
+
+
+def route_namespaces(app_dir=APP_LOCALE_DIR):
+    """
+    {first path segment after the locale: sorted top-level namespaces} for the
+    routes under app/[locale], from the translation bindings in every page below
+    the segment, the layouts around it and all their imports. Route groups
+    ((marketing), (auth)) are transparent; '' is the locale's home page. A
+    route reaching useTranslations() without a static namespace maps to None
+    (it may use any namespace)
+    """
+    app_dir = Path(app_dir)
+    graph = _ImportGraph()
+    sections = {}
+    groups = [app_dir] + sorted(path for path in app_dir.iterdir() if path.is_dir() and path.name.startswith('('))
+    for group in groups:
+        chrome = _segment_files(app_dir) + (_segment_files(group) if group != app_dir else [])
+        pages = [path for path in group.iterdir() if path.is_file() and path.stem == 'page' and path.suffix in SOURCE_EXTENSIONS]
+        if pages:
+            sections.setdefault('', []).extend(chrome + pages)
+        for directory in sorted(group.iterdir()):
+            # Dynamic segments ([slug]) match any pathname and groups are walked above
+            if directory.is_dir() and not directory.name.startswith(('(', '[', '_', '@')):
+                sections.setdefault(directory.name, []).extend(chrome + list(_source_files(directory)))
+
+    routes = {}
+    for section, entries in sorted(sections.items()):
+        namespaces = graph.namespaces(entries)
+        routes[section] = sorted(namespaces) if namespaces is not None else None
+    return routes
@@ -0,0 +1,157 @@
+"""
+LOCALE VALIDATION
+en.json is flattened once into a shared KeySpace (list items included) with
+each source string's placeholder signature. Every locale is then checked in a
+single walk for missing keys, unexpected keys, type mismatches, ICU
+placeholder / rich text tag mismatches and strings left in English. Locales
+are checked in parallel worker processes that receive the index once at
+start-up and load each locale file straight into flat value slots
+"""
+
+import json
+import re
+from pathlib import Path
+
+from .keyspace import MISSING, flatten_messages, format_path
+
+# ICU arguments ({count}, {count, plural, ...}) and next-intl rich text tags (<b>, </b>, <br/>)
+PLACEHOLDER_RE = re.compile(r'\{\s*([A-Za-z_][\w.]*)\s*[,}]|<\s*/?\s*([A-Za-z][\w-]*)\s*/?\s*>')
+
+# A source needs a real word left after removing placeholders to count as "untranslated"
+WORD_RE = re.compile(r'[A-Za-z]{3,}')
+
+
+def placeholder_signature(text):
+    """Sorted tuple of ICU argument names and tag names used by a string"""
+    found = []
+    for argument, tag in PLACEHOLDER_RE.findall(text):
+        found.append(argument or f'<{tag}>')
+    return tuple(sorted(found))
+
+
+def build_source_index(en_tree):
+    """
+    Flatten en.json into a shared KeySpace plus, per source slot, a
+    (source, placeholder signature, translatable) entry (None for non-strings)
+    """
+    source = flatten_messages(en_tree)
+    entries = []
+    for value in source.values:
+        if isinstance(value, str):
+            translatable = bool(WORD_RE.search(PLACEHOLDER_RE.sub('', value)))
+            entries.append((value, placeholder_signature(value), translatable))
+        else:
+            entries.append(None)
+    return source.keyspace, entries
+
+
+def validate_locale_tree(locale, tree, index):
+    """Compare one locale tree against the source index"""
+    keyspace, _ = index
+    return validate_flat_locale(locale, keyspace.flatten(tree), index)
+
+
+def validate_flat_locale(locale, messages, index):
+    """Compare one flattened locale (on the index's key space) against the source entries"""
+    keyspace, entries = index
+    source_keys = len(entries)
+    missing = []
+    type_mismatches = []
+    placeholder_mismatches = []
+    untranslated = []
+    extra = []
+
+    # Keys only this locale has; those nested under a source leaf are type mismatches of that leaf
+    shadowed = set()
+    for slot, key, _ in messages.items():
+        if slot < source_keys:
+            continue
+        path = keyspace.paths[slot]
+        for depth in range(len(path) - 1, 0, -1):
+            parent = keyspace.slot(format_path(path[:depth]))
+            if parent is not None and parent < source_keys:
+                shadowed.add(parent)
+                break
+        else:
+            extra.append(key)
+
+    for slot, entry in enumerate(entries):
+        if entry is None:
+            continue
+        key = keyspace.keys[slot]
+        source, signature, translatable = entry
+        value = messages.value_at(slot)
+        if slot in shadowed or (value is not MISSING and not isinstance(value, str)):
+            type_mismatches.append(key)
+        elif value is MISSING:
+            missing.append(key)
+        else:
+            if signature or '{' in value or '<' in value:
+                found = placeholder_signature(value)
+                if found != signature:
+                    placeholder_mismatches.append({'key': key, 'expected': list(signature), 'found': list(found)})
+            if translatable and value == source:
+                untranslated.append(key)
+
+    total = sum(1 for entry in entries if entry is not None)
+    present = total - len(missing)
+    return {
+        'locale': locale,
+        'keys': messages.count_strings(),
+        'coverage': round(present / total, 4) if total else 1.0,
+        'errors': len(missing) + len(type_mismatches) + len(placeholder_mismatches),
+        'warnings': len(untranslated) + len(extra),
+        'missing': missing,
+        'type_mismatches': type_mismatches,
+        'placeholder_mismatches': placeholder_mismatches,
+        'untranslated': untranslated,
+        'extra': extra,
+    }
+
+
+_worker_index = None
+
+
+def _init_worker(index):
+    global _worker_index
+    _worker_index = index
+
+
+def _validate_file(args):
+    locale, path = args
+    keyspace, _ = _worker_index
+    try:
+        messages = keyspace.load(path)
+    except (OSError, ValueError) as e:
+        return {'locale': locale, 'errors': 1, 'warnings': 0, 'load_error': str(e)}
+    return validate_flat_locale(locale, messages, _worker_index)
+
+
+def validate_locales(messages_dir, locales=None, workers=None, source_locale='en'):
+    """Validate every <locale>.json in messages_dir against <source_locale>.json in one pass"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    messages_dir = Path(messages_dir)
+    with open(messages_dir / f'{source_locale}.json', 'r', encoding='utf-8') as f:
+        index = build_source_index(json.load(f))
+
+    if locales is None:
+        locales = sorted(path.stem for path in messages_dir.glob('*.json') if path.stem != source_locale)
+    jobs = [(locale, str(messages_dir / f'{locale}.json')) for locale in locales]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(index,)) as pool:
+        results = list(pool.map(_validate_file, jobs))
+
+    return {
+        'source': {
+            'locale': source_locale,
+            'keys': sum(1 for entry in index[1] if entry is not None),
+            'with_placeholders': sum(1 for entry in index[1] if entry is not None and entry[1]),
+        },
+        'summary': {
+            'locales': len(results),
+            'errors': sum(result['errors'] for result in results),
+            'warnings': sum(result['warnings'] for result in results),
+        },
+        'locales': {result['locale']: result for result in results},
+    }
@@ -0,0 +1,136 @@
+"""
+SOURCE FILE WATCHER
+Blocks until a file (en.json) changes. On Linux its directory is watched with
+inotify through libc, so no extra package is needed, and editors that save by
+writing a temp file and renaming it over the original are caught too.
+Elsewhere, or when inotify is unavailable, the file's (mtime, size, inode) is
+polled. The bursts of events a single save produces are coalesced: a change
+is reported once the file has been quiet for `settle` seconds
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+DEFAULT_INTERVAL = 0.5
+DEFAULT_SETTLE = 0.2
+
+# <sys/inotify.h>
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT = struct.Struct('iIII')
+
+
+def _open_inotify(directory):
+    """inotify fd watching directory, or None when the platform or libc does not offer it"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(str(directory)), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class SourceWatcher:
+    """Waits for changes to one file with inotify, falling back to polling"""
+
+    def __init__(self, path, interval=DEFAULT_INTERVAL, settle=DEFAULT_SETTLE, polling=False):
+        self.path = Path(path)
+        self.interval = interval
+        self.settle = settle
+        self._fd = None if polling else _open_inotify(self.path.parent)
+        self._name = os.fsencode(self.path.name)
+        self._last = _signature(self.path)
+
+    @property
+    def mode(self):
+        return 'polling' if self._fd is None else 'inotify'
+
+    def _touches_file(self):
+        """Drain queued inotify events; True when any of them is about the watched file"""
+        touched = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return touched
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+                touched = touched or name == self._name
+                offset += _EVENT.size + length
+
+    def _wait_inotify(self, deadline):
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+            if not ready:
+                return False
+            if not self._touches_file():
+                continue
+            # Let the rest of the save land before reporting it
+            while select.select([self._fd], [], [], self.settle)[0]:
+                self._touches_file()
+            return True
+
+    def _wait_polling(self, deadline):
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(self.interval)
+            if _signature(self.path) != self._last:
+                while True:
+                    seen = _signature(self.path)
+                    time.sleep(self.settle)
+                    if _signature(self.path) == seen:
+                        return True
+        return False
+
+    def wait(self, timeout=None):
+        """Block until the file changed (True) or timeout seconds passed (False)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self._wait_inotify(deadline) if self._fd is not None else self._wait_polling(deadline)
+            if not changed:
+                return False
+            signature = _signature(self.path)
+            # Ignore events that left the file as it was (e.g. a save without edits)
+            if signature != self._last:
+                self._last = signature
+                return True
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
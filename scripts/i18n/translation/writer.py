@@ -0,0 +1,113 @@
+"""
+ATOMIC LOCALE WRITER
+Locale files are imported by src/i18n/request.ts, so a half-written file
+breaks the app. Every write goes to a temp file in the same directory, is
+fsynced and then renamed over the target, so readers see the old file or the
+new one and never a truncated mix. Files whose bytes would not change are not
+touched at all (no mtime churn, no rebuilds). Serialization is the repo's
+canonical form (2-space indent, UTF-8, trailing newline) and keeps key order,
+so a run that changes a few keys produces a diff of a few lines
+"""
+
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .paths import MESSAGES_DIR
+
+# Concurrent writers of the same file take turns; different files never wait
+_path_locks = {}
+_path_locks_lock = threading.Lock()
+
+
+def dump_messages(data):
+    """Canonical JSON text of a message tree"""
+    return json.dumps(data, ensure_ascii=False, indent=2) + '\n'
+
+
+def _lock_for(path):
+    key = os.path.abspath(path)
+    with _path_locks_lock:
+        if key not in _path_locks:
+            _path_locks[key] = threading.Lock()
+        return _path_locks[key]
+
+
+def _fsync_directory(directory):
+    # Makes the rename itself durable; not supported on Windows
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path, payload):
+    """Atomically replace path with payload (str or bytes) unless it already holds it; True when written"""
+    path = Path(path)
+    data = payload.encode('utf-8') if isinstance(payload, str) else payload
+    with _lock_for(path):
+        try:
+            if path.stat().st_size == len(data) and path.read_bytes() == data:
+                return False
+        except FileNotFoundError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if path.exists():
+                os.chmod(temp, path.stat().st_mode & 0o777)
+            else:
+                # mkstemp creates 0600 files; match what open() would have produced
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(temp, 0o666 & ~umask)
+            os.replace(temp, path)
+        except BaseException:
+            try:
+                os.unlink(temp)
+            except FileNotFoundError:
+                pass
+            raise
+        _fsync_directory(path.parent)
+    return True
+
+
+def write_json(path, data, **dump_options):
+    """Atomically write data as JSON (canonical message form by default); True when written"""
+    if dump_options:
+        return write_atomic(path, json.dumps(data, **dump_options) + '\n')
+    return write_atomic(path, dump_messages(data))
+
+
+def write_locale_file(locale, data, messages_dir=MESSAGES_DIR, shards=True):
+    """
+    Write messages/<locale>.json and, unless shards=False, its namespace
+    shards. Returns {'written': bool, 'shards': write_shards stats or None}
+    """
+    from .shards import write_shards
+
+    messages_dir = Path(messages_dir)
+    written = write_json(messages_dir / f'{locale}.json', data)
+    shard_stats = write_shards(locale, data, messages_dir / 'shards') if shards else None
+    return {'written': written, 'shards': shard_stats}
+
+
+def write_locales(locales, messages_dir=MESSAGES_DIR, shards=True, workers=None):
+    """Write many {locale: tree} files concurrently; returns {locale: write_locale_file result}"""
+    locales = dict(locales)
+    if not locales:
+        return {}
+    workers = workers or min(len(locales), os.cpu_count() or 4)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='write') as pool:
+        results = pool.map(lambda item: write_locale_file(item[0], item[1], messages_dir, shards), locales.items())
+        return dict(zip(locales, results))
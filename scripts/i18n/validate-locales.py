@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+LOCALE VALIDATOR
+Checks every src/i18n/messages/<locale>.json against en.json in one pass:
+missing keys, type mismatches, ICU placeholder / rich text tag mismatches
+({count}, {name}, {last4}, <b>...), strings left in English and unexpected keys.
+Locales are checked in parallel worker processes; the result is one JSON report.
+
+Usage:
+  python3 scripts/i18n/validate-locales.py [--locales=es,fr] [--workers=N] [--output=report.json]
+      [--fail-on=errors|warnings|never]
+
+Exit code is 1 when the --fail-on threshold is hit (default: errors)
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from translation import MESSAGES_DIR, validate_locales
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Validate all locale files against en.json')
+    parser.add_argument('--locales', help='Comma-separated locales (default: every <locale>.json except en)')
+    parser.add_argument('--messages-dir', default=str(MESSAGES_DIR), help='Directory containing <locale>.json files')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    parser.add_argument('--fail-on', choices=['errors', 'warnings', 'never'], default='errors')
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    locales = [code.strip() for code in args.locales.split(',') if code.strip()] if args.locales else None
+
+    start = time.perf_counter()
+    report = validate_locales(args.messages_dir, locales, workers=args.workers)
+    report['seconds'] = round(time.perf_counter() - start, 3)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2) + '\n'
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        sys.stdout.write(output)
+
+    # Human summary on stderr so stdout stays machine-readable
+    print(f"\n🔍 Validated {report['summary']['locales']} locales against {report['source']['keys']} keys "
+          f"in {report['seconds']:.2f}s", file=sys.stderr)
+    for locale, result in report['locales'].items():
+        if 'load_error' in result:
+            print(f"   ❌ {locale}: cannot load ({result['load_error']})", file=sys.stderr)
+            continue
+        status = '✅' if not result['errors'] else '❌'
+        print(f"   {status} {locale}: {result['coverage']:.0%} coverage, {len(result['missing'])} missing, "
+              f"{len(result['placeholder_mismatches'])} placeholder mismatches, "
+              f"{len(result['untranslated'])} untranslated, {len(result['extra'])} extra", file=sys.stderr)
+    if args.output:
+        print(f"\n📊 Report written to {args.output}", file=sys.stderr)
+
+    summary = report['summary']
+    if args.fail_on == 'errors' and summary['errors']:
+        sys.exit(1)
+    if args.fail_on == 'warnings' and (summary['errors'] or summary['warnings']):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
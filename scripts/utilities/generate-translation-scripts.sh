@@ -1,6 +1,7 @@
 #!/bin/bash
 
-# Generate individual translation scripts for each language
+# Generate per-language shortcuts for the unified translate CLI (scripts/i18n/translate.py)
+# Prefer one call with several locales: en.json is then parsed once and locales run concurrently
 
 LANGUAGES=("es" "fr" "zh" "hi" "ar" "ko" "vi" "pt" "de" "ja" "ru" "id" "ur" "bn" "ta" "te" "mr" "tr" "sw")
 NAMES=("Spanish" "French" "Chinese" "Hindi" "Arabic" "Korean" "Vietnamese" "Portuguese" "German" "Japanese" "Russian" "Indonesian" "Urdu" "Bengali" "Tamil" "Telugu" "Marathi" "Turkish" "Swahili")
@@ -10,17 +11,18 @@ echo "🔧 Generating individual translation scripts..."
 for i in "${!LANGUAGES[@]}"; do
     LANG="${LANGUAGES[$i]}"
     NAME="${NAMES[$i]}"
-    
-    cat > "scripts/translate-${LANG}.sh" << EOF
+
+    cat > "scripts/i18n/translate-${LANG}.sh" << EOF
 #!/bin/bash
 # Translate marketing content to ${NAME} (${LANG})
-# Usage: ./scripts/translate-${LANG}.sh
+# Usage: ./scripts/i18n/translate-${LANG}.sh [--incremental] [--resume] [--concurrency=N] [--backend=NAME]
+# Shortcut for: python3 scripts/i18n/translate.py --locales=${LANG} --namespaces=marketing
 
 echo "🌍 Translating ${NAME} (${LANG})..."
-python3 scripts/translate-language.py ${LANG}
+exec python3 scripts/i18n/translate.py --locales=${LANG} --namespaces=marketing "\$@"
 EOF
-    
-    chmod +x "scripts/translate-${LANG}.sh"
+
+    chmod +x "scripts/i18n/translate-${LANG}.sh"
     echo "   ✅ Created translate-${LANG}.sh (${NAME})"
 done
 
@@ -28,9 +30,9 @@ echo ""
 echo "✅ Generated ${#LANGUAGES[@]} translation scripts!"
 echo ""
 echo "📝 Usage examples:"
-echo "   ./scripts/translate-es.sh  # Translate Spanish"
-echo "   ./scripts/translate-fr.sh  # Translate French"
-echo "   ./scripts/translate-zh.sh  # Translate Chinese"
+echo "   ./scripts/i18n/translate-es.sh  # Translate Spanish"
+echo "   ./scripts/i18n/translate-fr.sh  # Translate French"
+echo "   ./scripts/i18n/translate-zh.sh  # Translate Chinese"
 echo ""
-echo "💡 Or use the master script:"
-echo "   python3 scripts/translate-language.py es"
+echo "💡 Or translate several languages in one process:"
+echo "   python3 scripts/i18n/translate.py --locales=es,fr,zh --namespaces=marketing"
@@ -70,3 +70,7 @@ export const rtlLocales: Locale[] = ['ar', 'ur']
 export function isRTL(locale: string): boolean {
   return rtlLocales.includes(locale as Locale)
 }
+
+// Request header the middleware sets to the pathname, read by the sharded
+// message loader in request.ts (kept here so the middleware bundle stays free of message imports)
+export const PATHNAME_HEADER = 'x-i18n-pathname'
@@ -0,0 +1,36 @@
+import { NextResponse } from 'next/server'
+
+// Next.js hands modified request headers to the page (headers() in server
+// components and getRequestConfig) only through these response headers, which
+// NextResponse.next({ request: { headers } }) sets
+const OVERRIDE_HEADER = 'x-middleware-override-headers'
+const REQUEST_HEADER_PREFIX = 'x-middleware-request-'
+
+function headerList(value: string | null): string[] {
+  return value ? value.split(',').map((name) => name.trim()).filter(Boolean) : []
+}
+
+/**
+ * Forward extra request headers through a response produced by another
+ * middleware (next-intl's rewrite or next), as NextResponse.next({ request: { headers } })
+ * would. Headers that middleware already forwards itself are kept
+ */
+export function forwardRequestHeaders<T extends Response>(response: T, extra: Record<string, string>, request: Request): T {
+  const headers = new Headers(request.headers)
+  for (const [name, value] of Object.entries(extra)) {
+    headers.set(name, value)
+  }
+  const forwarded = NextResponse.next({ request: { headers } })
+
+  forwarded.headers.forEach((value, name) => {
+    if (name.startsWith(REQUEST_HEADER_PREFIX) && !response.headers.has(name)) {
+      response.headers.set(name, value)
+    }
+  })
+  const overridden = new Set([
+    ...headerList(response.headers.get(OVERRIDE_HEADER)),
+    ...headerList(forwarded.headers.get(OVERRIDE_HEADER)),
+  ])
+  response.headers.set(OVERRIDE_HEADER, [...overridden].join(','))
+  return response
+}
@@ -1,17 +1,22 @@
+import { headers } from 'next/headers'
 import { getRequestConfig } from 'next-intl/server'
-import { locales } from './config'
+import { locales, PATHNAME_HEADER } from './config'
+import { loadMessages, messagesMode } from './shards'
 
 export default getRequestConfig(async ({ locale }) => {
+  // Only the sharded loader needs to know which route is rendering
+  const pathname = messagesMode === 'sharded' ? (await headers()).get(PATHNAME_HEADER) : null
+
   // Validate that the incoming `locale` parameter is valid
   if (!locale || !locales.includes(locale as any)) {
     return {
       locale: 'en',
-      messages: (await import(`./messages/en.json`)).default,
+      messages: await loadMessages('en', pathname),
     }
   }
 
   return {
     locale,
-    messages: (await import(`./messages/${locale}.json`)).default,
+    messages: await loadMessages(locale, pathname),
   }
 })
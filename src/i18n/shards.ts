@@ -0,0 +1,94 @@
+import type { AbstractIntlMessages } from 'next-intl'
+import routeNamespaces from './route-namespaces.json'
+
+// 'full' imports messages/<locale>.json; 'sharded' imports only the namespace
+// shards (messages/shards/<locale>/<namespace>.json) the current route needs;
+// 'bundled' imports the minified, content-hashed messages/bundles/<locale>.<hash>.json.
+// Shards are written by the Python translation pipeline and
+// scripts/i18n/build-message-shards.py, bundles by scripts/i18n/build-message-bundles.py
+export type MessagesMode = 'full' | 'sharded' | 'bundled'
+
+const configuredMode = process.env.I18N_MESSAGES_MODE
+export const messagesMode: MessagesMode =
+  configuredMode === 'sharded' || configuredMode === 'bundled' ? configuredMode : 'full'
+
+// Namespaces each route (first segment after the locale) can render, from the
+// bindings in its pages, layouts and their imports; null routes may use any
+// namespace. Generated by `scripts/i18n/index-translation-usage.py --routes`
+const routes: Record<string, string[] | null> = routeNamespaces.routes
+
+/**
+ * Namespaces needed to render a locale-prefixed pathname, or null when the
+ * route may use any namespace (the app and dashboard) or is not indexed, and
+ * the full file is loaded
+ */
+export function namespacesForPathname(pathname: string | null | undefined): string[] | null {
+  if (!pathname) return null
+  // '/en/pricing/enterprise' -> 'pricing'
+  const section = pathname.split('/').filter(Boolean)[1] ?? ''
+  return Object.prototype.hasOwnProperty.call(routes, section) ? routes[section] : null
+}
+
+interface ShardManifest {
+  locale: string
+  namespaces: Record<string, { file: string; keys: number; bytes: number; hash: string }>
+}
+
+export async function loadFullMessages(locale: string): Promise<AbstractIntlMessages> {
+  return (await import(`./messages/${locale}.json`)).default
+}
+
+/**
+ * Load and merge only the requested namespace shards. Namespaces the locale
+ * has no shard for are skipped; without shards (never built) the full file is used
+ */
+export async function loadMessageShards(locale: string, namespaces: string[]): Promise<AbstractIntlMessages> {
+  let manifest: ShardManifest
+  try {
+    manifest = (await import(`./messages/shards/${locale}/manifest.json`)).default
+  } catch {
+    return loadFullMessages(locale)
+  }
+
+  const available = namespaces.filter((namespace) => namespace in manifest.namespaces)
+  const shards = await Promise.all(
+    available.map(async (namespace) => (await import(`./messages/shards/${locale}/${namespace}.json`)).default)
+  )
+  return Object.assign({}, ...shards)
+}
+
+// Imported through templates so builds without bundles still type-check, and
+// ending in .json so the bundler leaves the .gz/.br variants beside them alone
+const bundleManifestName = 'manifest'
+
+interface BundleManifest {
+  bundles: Record<string, { file: string; hash: string; bytes: number; gzip: number; brotli?: number }>
+}
+
+/**
+ * Load a locale's hashed bundle through the bundle manifest; locales without
+ * a bundle (or no bundles built at all) fall back to the full file
+ */
+export async function loadMessageBundle(locale: string): Promise<AbstractIntlMessages> {
+  let manifest: BundleManifest
+  try {
+    manifest = (await import(`./messages/bundles/${bundleManifestName}.json`)).default
+  } catch {
+    return loadFullMessages(locale)
+  }
+
+  const entry = manifest.bundles[locale]
+  if (!entry) return loadFullMessages(locale)
+  return (await import(`./messages/bundles/${locale}.${entry.hash}.json`)).default
+}
+
+export async function loadMessages(locale: string, pathname?: string | null): Promise<AbstractIntlMessages> {
+  if (messagesMode === 'bundled') {
+    return loadMessageBundle(locale)
+  }
+  if (messagesMode === 'sharded') {
+    const namespaces = namespacesForPathname(pathname)
+    if (namespaces) return loadMessageShards(locale, namespaces)
+  }
+  return loadFullMessages(locale)
+}
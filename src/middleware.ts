@@ -2,7 +2,8 @@ import { type NextRequest, NextResponse } from 'next/server'
 import { updateSession } from '@/lib/supabase/middleware'
 import createIntlMiddleware from 'next-intl/middleware'
 import { routing } from '@/i18n/navigation'
-import { defaultLocale } from '@/i18n/config'
+import { defaultLocale, PATHNAME_HEADER } from '@/i18n/config'
+import { forwardRequestHeaders } from '@/i18n/forward-headers'
 
 // Create the i18n middleware with locale detection from cookies
 const intlMiddleware = createIntlMiddleware({
@@ -32,6 +33,11 @@ export async function middleware(request: NextRequest) {
   if (intlResponse && intlResponse.status === 307) {
     return intlResponse
   }
+
+  // Expose the route to src/i18n/request.ts (the sharded loader picks namespaces by route)
+  if (intlResponse) {
+    forwardRequestHeaders(intlResponse, { [PATHNAME_HEADER]: pathname }, request)
+  }
   
   // Then handle Supabase session
   const supabaseResponse = await updateSession(request)